@@ -0,0 +1,154 @@
+# Batch decompression of many gzip files
+# Teoria da Informacao, LEI
+#
+# The files are given as paths, glob patterns, folders (every .gz file in them, and in their subfolders with -r)
+# or in a list file, one path per line. A pool of worker processes decompresses them, one file per task, to the
+# output folder (by default, next to each file), so that a single interpreter serves the whole batch.
+# A status line is printed for each file and a summary at the end. A file that fails to decompress, whatever
+# the error, is reported, its partial output removed, and the batch goes on; the exit status is 1 if any file
+# failed. Files that would be written to the same output (same name, from different folders, with -o) are
+# rejected before decompression starts.
+#
+# usage: python batchgzip.py [-o folder] [-j workers] [-r] [-l list] file|folder|pattern ...
+#        python inflate.py file|folder|pattern ...   (several files, a folder or a pattern)
+
+import os
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from inflate import GZIP
+
+
+def findFiles(args, listFile=None, recursive=False):
+	''' list of (path, output name) of the files to decompress: the output name is the path relative to the
+		folder given for the files found in folders, the file name otherwise, without '.gz' '''
+
+	names = list(args)
+	if listFile is not None:
+		with (sys.stdin if listFile == '-' else open(listFile)) as f:
+			names += [line.strip() for line in f if line.strip()]
+
+	files = []
+	for name in names:
+		if os.path.isdir(name):
+			pattern = os.path.join(name, '**', '*.gz') if recursive else os.path.join(name, '*.gz')
+			files += [(path, os.path.relpath(path, name)) for path in sorted(glob.glob(pattern, recursive=recursive))]
+		elif glob.has_magic(name):
+			files += [(path, os.path.basename(path)) for path in sorted(glob.glob(name))]
+		else:
+			files.append((name, os.path.basename(name)))
+
+	# without repetitions, and without the .gz extension in the output names
+	seen = set()
+	unique = []
+	for path, out in files:
+		key = os.path.abspath(path)
+		if key not in seen:
+			seen.add(key)
+			unique.append((path, out[:-3] if out.endswith('.gz') else out + '.out'))
+	return unique
+
+
+def decompressFile(path, outPath):
+	''' decompresses a file, run by the workers. Returns (input bytes, output bytes, members, seconds, error):
+		error is None if the file was decompressed, the message of the exception otherwise: any exception, so that
+		one bad file does not stop the others '''
+
+	t = time.perf_counter()
+	try:
+		folder = os.path.dirname(outPath)
+		if folder:
+			os.makedirs(folder, exist_ok=True)
+		members = GZIP(path, verbose=False).decompress(outPath)
+		return os.path.getsize(path), sum(m.outputBytes for m in members), len(members), time.perf_counter() - t, None
+	except Exception as e:
+		try:
+			if os.path.exists(outPath):
+				os.remove(outPath)
+			size = os.path.getsize(path) if os.path.isfile(path) else 0
+		except OSError:
+			size = 0
+		return size, 0, 0, time.perf_counter() - t, '%s: %s' % (type(e).__name__, e)
+
+
+def outputPaths(files, outDir=None):
+	''' output path of each (path, output name) of files: in outDir or, if it is None, next to each file.
+		Raises ValueError if two files would be written to the same path '''
+
+	outs = [os.path.join(outDir, out) if outDir is not None else os.path.join(os.path.dirname(path), out)
+	        for path, out in files]
+	seen = {}
+	collisions = []
+	for (path, out), outPath in zip(files, outs):
+		key = os.path.normcase(os.path.abspath(outPath))
+		if key in seen:
+			collisions.append('%s and %s -> %s' % (seen[key], path, outPath))
+		else:
+			seen[key] = path
+	if collisions:
+		raise ValueError('files with the same output: ' + '; '.join(collisions))
+	return outs
+
+
+def decompressBatch(files, outDir=None, workers=None, verbose=True):
+	''' decompresses the (path, output name) pairs of files, to outDir or, if it is None, next to each file.
+		Returns the list of (path, results of decompressFile), in the order of files.
+		Raises ValueError, before decompressing anything, if two files would be written to the same path '''
+
+	workers = workers or os.cpu_count()
+	paths = [path for path, out in files]
+	outs = outputPaths(files, outDir)
+
+	t = time.perf_counter()
+	results = []
+	with ProcessPoolExecutor(workers) as pool:
+		# small files: several per task, so that the pool overhead does not dominate
+		chunkSize = max(1, min(64, len(files) // (4 * workers)))
+		for path, result in zip(paths, pool.map(decompressFile, paths, outs, chunksize=chunkSize)):
+			results.append((path, result))
+			if verbose:
+				inBytes, outBytes, members, seconds, error = result
+				if error is None:
+					print('ok      %s: %d -> %d bytes, %d member(s), %.3f s' % (path, inBytes, outBytes, members, seconds))
+				else:
+					print('FAILED  %s: %s' % (path, error))
+	t = time.perf_counter() - t
+
+	if verbose:
+		failed = sum(1 for path, result in results if result[4] is not None)
+		inBytes = sum(result[0] for path, result in results)
+		outBytes = sum(result[1] for path, result in results)
+		print('%d file(s) decompressed, %d failed: %d -> %d bytes in %.3f s (%.2f MB/s of output, %.1f files/s, %d workers)' % (
+			len(results) - failed, failed, inBytes, outBytes, t, outBytes / (1 << 20) / t if t else 0,
+			len(results) / t if t else 0, workers))
+		for path, result in results:
+			if result[4] is not None:
+				print('  failed: %s (%s)' % (path, result[4]))
+	return results
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='batch gzip decompression')
+	parser.add_argument('files', nargs='*', help='gzip files, folders or glob patterns')
+	parser.add_argument('-o', '--output', help='output folder (default: next to each file)')
+	parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: number of CPUs)')
+	parser.add_argument('-r', '--recursive', action='store_true', help='also look for .gz files in the subfolders of the folders')
+	parser.add_argument('-l', '--list', help="file with one path per line ('-': standard input)")
+	args = parser.parse_args(argv)
+
+	files = findFiles(args.files, args.list, args.recursive)
+	if not files:
+		parser.error('no files to decompress')
+	try:
+		results = decompressBatch(files, args.output, args.workers)
+	except ValueError as e:
+		parser.error(str(e))
+	return 1 if any(result[4] is not None for path, result in results) else 0
+
+
+
+if __name__ == '__main__':
+	sys.exit(main())
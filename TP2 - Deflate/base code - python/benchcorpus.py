@@ -0,0 +1,208 @@
+# Decompression benchmark over a synthetic corpus
+# Teoria da Informacao, LEI
+#
+# The corpus is generated with zlib (the compressor behind the standard library's gzip module), at several
+# sizes and compression levels: text (words of FAQ.txt), random and highly repetitive data, multi-member files
+# and files made of stored or fixed Huffman blocks. It is kept in a folder and only the missing files are
+# generated. Each file is decompressed with GZIP in a new process, to measure its peak RSS, and the throughput,
+# peak RSS and time per phase are written to a JSON file, to compare runs across commits.
+#
+# usage: python benchcorpus.py [-s 1,16,128,1024] [-l 1,6,9] [-k text,random] [-o results.json]
+#        python benchcorpus.py --compare before.json after.json
+
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import platform
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+	import resource
+except ImportError:
+	resource = None
+
+from inflate import GZIP, DecodeStats
+from benchmark import gerarTexto, MB
+
+
+PIECE = MB  # the data is generated and compressed a piece at a time, whatever the size of the file
+MEMBER = 4 * MB  # size of each member of the multi-member files
+
+# kind: (levels, zlib strategy, one member per MEMBER bytes). None: the levels given in the command line
+KINDS = {
+	'text': (None, zlib.Z_DEFAULT_STRATEGY, False),
+	'random': (None, zlib.Z_DEFAULT_STRATEGY, False),
+	'repetitive': (None, zlib.Z_DEFAULT_STRATEGY, False),
+	'members': (None, zlib.Z_DEFAULT_STRATEGY, True),
+	'stored': ([0], zlib.Z_DEFAULT_STRATEGY, False),
+	'fixed': ([6], zlib.Z_FIXED, False),
+}
+
+
+
+#--- corpus
+
+def gerarPecas(kind, size, seed=0):
+	''' generator of the data of a file of the corpus, in pieces of up to PIECE bytes '''
+
+	rnd = random.Random(seed)
+	done = 0
+	while done < size:
+		n = min(PIECE, size - done)
+		if kind == 'random':
+			piece = rnd.randbytes(n)
+		elif kind == 'repetitive':
+			# runs and short patterns (distances of 1 to 64), repeated for hundreds of bytes
+			piece = bytearray()
+			while len(piece) < n:
+				pattern = rnd.randbytes(rnd.choice((1, 1, 2, 3, 4, 8, 16, 64)))
+				piece += pattern * (rnd.randint(100, 5000) // len(pattern))
+			piece = bytes(piece[:n])
+		else:
+			piece = gerarTexto(n, rnd.randrange(1 << 30))
+		yield piece
+		done += n
+
+
+def gerarFicheiro(path, kind, size, level):
+	''' writes a file of the corpus: size bytes of data of the given kind, compressed at level '''
+
+	levels, strategy, members = KINDS[kind]
+	tmp = path + '.tmp'
+	with open(tmp, 'wb') as f:
+		comp = None
+		inMember = 0
+		for piece in gerarPecas('text' if kind in ('members', 'stored', 'fixed') else kind, size):
+			if comp is None:
+				comp = zlib.compressobj(level, zlib.DEFLATED, 31, 8, strategy)
+			f.write(comp.compress(piece))
+			inMember += len(piece)
+			if members and inMember >= MEMBER:
+				f.write(comp.flush())
+				comp = None
+				inMember = 0
+		if comp is None:
+			comp = zlib.compressobj(level, zlib.DEFLATED, 31, 8, strategy)
+		f.write(comp.flush())
+	os.replace(tmp, path)
+
+
+def corpus(folder, sizes, levels, kinds):
+	''' list of (path, kind, size, level) of the corpus files, generating the ones missing in folder '''
+
+	os.makedirs(folder, exist_ok=True)
+	files = []
+	for kind in kinds:
+		for size in sizes:
+			for level in KINDS[kind][0] or levels:
+				path = os.path.join(folder, '%s-%dMB-%d.gz' % (kind, size // MB, level))
+				if not os.path.exists(path):
+					print('generating %s' % path)
+					gerarFicheiro(path, kind, size, level)
+				files.append((path, kind, size, level))
+	return files
+
+
+
+#--- measures
+
+def medir(path, kernel=True):
+	''' decompresses path, discarding the output. Runs in a new process: returns (seconds, peak RSS in bytes,
+		time per phase, number of members, number of blocks) '''
+
+	stats = DecodeStats()
+	gz = GZIP(path, verbose=False, stats=stats)
+	if not kernel:
+		gz.kernel = None
+	with open(os.devnull, 'wb') as out:
+		t = time.perf_counter()
+		members = gz.decompress(out)
+		seconds = time.perf_counter() - t
+
+	peak = None
+	if resource is not None:
+		peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		peak *= 1 if sys.platform == 'darwin' else 1024  # bytes on macOS, KiB on Linux
+	return seconds, peak, stats.phases, len(members), sum(m.blocks for m in members)
+
+
+def commit():
+	''' current git commit, if the code is in a repository '''
+
+	try:
+		return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+		                      check=True).stdout.strip()
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+
+def benchmark(files, repeat=1, kernel=True):
+	''' best of repeat runs of each file. Returns the results, as written to the JSON file '''
+
+	results = []
+	for path, kind, size, level in files:
+		best = None
+		for _ in range(repeat):
+			with ProcessPoolExecutor(1) as pool:
+				run = pool.submit(medir, path, kernel).result()
+			if best is None or run[0] < best[0]:
+				best = run
+		seconds, peak, phases, members, blocks = best
+		results.append({'file': os.path.basename(path), 'kind': kind, 'size': size, 'level': level,
+		                'compressed': os.path.getsize(path), 'members': members, 'blocks': blocks,
+		                'seconds': seconds, 'MBps': size / MB / seconds, 'peakRSS': peak, 'phases': phases})
+		print('  %-24s %8.3f s  %8.2f MB/s  %8s MiB RSS  ' % (results[-1]['file'], seconds, size / MB / seconds,
+		      '%.1f' % (peak / MB) if peak else '-') + '  '.join('%s %.0f%%' % (phase, 100 * t / seconds)
+		      for phase, t in phases.items()))
+	return results
+
+
+def comparar(before, after):
+	''' prints the speedup of each file present in both result files '''
+
+	with open(before) as f:
+		old = {r['file']: r for r in json.load(f)['results']}
+	with open(after) as f:
+		new = json.load(f)['results']
+	for r in new:
+		if r['file'] in old:
+			o = old[r['file']]
+			print('  %-24s %8.2f -> %8.2f MB/s  %6.2f x' % (r['file'], o['MBps'], r['MBps'], r['MBps'] / o['MBps']))
+
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='decompression benchmark over a synthetic corpus')
+	parser.add_argument('-s', '--sizes', default='1,16', help='sizes of the files, in MiB (e.g. 1,16,128,1024)')
+	parser.add_argument('-l', '--levels', default='1,6,9', help='compression levels')
+	parser.add_argument('-k', '--kinds', default=','.join(KINDS), help='kinds of data: ' + ', '.join(KINDS))
+	parser.add_argument('-d', '--corpus', default=os.path.join(tempfile.gettempdir(), 'gzipcorpus'), help='corpus folder')
+	parser.add_argument('-r', '--repeat', type=int, default=1, help='runs of each file (the best one counts)')
+	parser.add_argument('-o', '--output', default='results.json', help='JSON file with the results')
+	parser.add_argument('--python', action='store_true', help='do not use the compiled kernel')
+	parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='compares two result files')
+	args = parser.parse_args()
+
+	if args.compare:
+		comparar(*args.compare)
+		sys.exit()
+
+	kinds = args.kinds.split(',')
+	for kind in kinds:
+		if kind not in KINDS:
+			parser.error('unknown kind %r' % kind)
+	files = corpus(args.corpus, [int(s) * MB for s in args.sizes.split(',')], [int(l) for l in args.levels.split(',')], kinds)
+
+	kernel = not args.python and GZIP.kernel is not None
+	print('%d file(s), %s' % (len(files), 'compiled kernel' if kernel else 'Python decoder'))
+	results = benchmark(files, args.repeat, kernel)
+	with open(args.output, 'w') as f:
+		json.dump({'commit': commit(), 'python': platform.python_version(), 'kernel': kernel,
+		           'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'results': results}, f, indent=1)
+	print('results written to %s' % args.output)
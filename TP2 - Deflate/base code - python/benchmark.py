@@ -0,0 +1,419 @@
+# Benchmarks for the deflate decoder
+# Teoria da Informacao, LEI
+#
+# usage: python benchmark.py [name ...]   (runs every benchmark if no name is given)
+
+import sys
+import os
+import io
+import time
+import zlib
+import random
+import shutil
+import tempfile
+import tracemalloc
+import contextlib
+
+from inflate import GZIP, BitReader, crc32Slice8
+from huffmantree import HuffmanTree, ArrayHuffmanTree
+from parallelgzip import decompressParallel
+from deflate import compress, huffmanLengths
+
+
+MB = 1024 * 1024
+
+
+def gerarTexto(size, seed=0):
+	''' generates size bytes of text-like data, using the words of FAQ.txt '''
+
+	with open('FAQ.txt', 'rb') as f:
+		words = f.read().split()
+	rnd = random.Random(seed)
+	out = bytearray()
+	while len(out) < size:
+		line = b' '.join(rnd.choice(words) for _ in range(rnd.randint(4, 14)))
+		out += line + b'\n'
+	return bytes(out[:size])
+
+
+def gerarGz(path, data, level=6):
+	''' writes data to path as a single gzip member (wbits=31 makes zlib emit the gzip wrapper) '''
+
+	comp = zlib.compressobj(level, zlib.DEFLATED, 31)
+	with open(path, 'wb') as f:
+		f.write(comp.compress(data) + comp.flush())
+	return path
+
+
+def timeDecompress(gzFile, repeat=1, **attrs):
+	''' best time of repeat runs of GZIP(gzFile).decompress(), with the given GZIP attributes overridden '''
+
+	best = None
+	for _ in range(repeat):
+		gz = GZIP(gzFile)
+		for name, value in attrs.items():
+			setattr(gz, name, value)
+		with contextlib.redirect_stdout(io.StringIO()):
+			t = time.perf_counter()
+			gz.decompress()
+			t = time.perf_counter() - t
+		best = t if best is None else min(best, t)
+	return best
+
+
+def report(name, size, seconds):
+	print('  %-28s %8.3f s  %8.3f MB/s' % (name, seconds, size / MB / seconds))
+
+
+
+#--- Huffman symbol decoding: lookup tables vs tree walk
+
+class TreeDecoder:
+	''' HuffmanTable replacement walking a HuffmanTree one bit at a time (the original decoder) '''
+
+	def __init__(self, codeTable):
+		self.tree = HuffmanTree()
+		for i, (numBits, codeBits) in enumerate(codeTable):
+			if numBits == 0:
+				continue
+			code = ''
+			for j in range(numBits):
+				code += str((codeBits >> (numBits - j - 1)) & 1)
+			self.tree.addNode(code, i)
+
+	def decode(self, readBits):
+		tree = self.tree
+		tree.resetCurNode()
+		while tree.curNode.index == -1:
+			tree.nextNode(str(readBits(1)))
+		return tree.curNode.index
+
+
+def benchHuffman(tmp):
+	print('Huffman decoding: HuffmanTable vs HuffmanTree walk')
+
+	inputs = [(shutil.copy('FAQ.txt.gz', tmp), os.path.getsize('FAQ.txt'))]
+	for size in (MB // 4, MB):
+		path = gerarGz(os.path.join(tmp, 'text%d.txt.gz' % size), gerarTexto(size))
+		inputs.append((path, size))
+
+	for path, size in inputs:
+		print(' %s (%d bytes)' % (os.path.basename(path), size))
+		report('tree walk', size, timeDecompress(path, huffmanDecoder=TreeDecoder))
+		# HuffmanTable.decode one symbol at a time, as the tree walk: without the fast path and the compiled kernel
+		report('lookup tables', size, timeDecompress(path, repeat=3, fastPath=False, kernel=None))
+		report('decodeBlockFast', size, timeDecompress(path, repeat=3, kernel=None))
+		if GZIP.kernel is not None:
+			report('compiled kernel', size, timeDecompress(path, repeat=3))
+
+
+
+#--- block decoding: inlined fast path vs one symbol at a time
+
+def benchFastPath(tmp):
+	print('Block decoding: decodeBlockFast vs decodeBlockSymbols')
+
+	texto = gerarTexto(2 * MB)
+	inputs = [('text', texto),
+	          ('text, level 1', texto),
+	          ('short periods', b''.join(texto[i:i+p] * (MB // 16 // p) for i, p in enumerate(range(1, 17)))),
+	          ('runs', b'a' * MB + b'b' * MB)]
+	for (name, data), level in zip(inputs, (6, 1, 6, 6)):
+		path = gerarGz(os.path.join(tmp, 'fastpath.gz'), data, level)
+		print(' %s (%d bytes)' % (name, len(data)))
+		slow = timeDecompress(path, fastPath=False)
+		fast = timeDecompress(path, repeat=3, kernel=None)
+		report('one symbol at a time', len(data), slow)
+		report('decodeBlockFast', len(data), fast)
+		print('  %-28s %8.2f x' % ('speedup', slow / fast))
+
+
+
+#--- compiled kernel: the decoding paths next to zlib
+
+def benchKernel(tmp):
+	print('Block decoding: decodeBlockSymbols, decodeBlockFast, inflatekernel and zlib')
+	if GZIP.kernel is None:
+		print('  inflatekernel not built (python setup.py build_ext --inplace)')
+
+	inputs = [('text', gerarTexto(4 * MB)), ('random', random.Random(0).randbytes(MB))]
+	for name, data in inputs:
+		path = gerarGz(os.path.join(tmp, 'kernel.gz'), data)
+		print(' %s (%d bytes)' % (name, len(data)))
+		report('decodeBlockSymbols', len(data), timeDecompress(path, fastPath=False))
+		report('decodeBlockFast', len(data), timeDecompress(path, kernel=None))
+		if GZIP.kernel is not None:
+			report('inflatekernel', len(data), timeDecompress(path, repeat=3))
+		with open(path, 'rb') as f:
+			comp = f.read()
+		t = time.perf_counter()
+		zlib.decompress(comp, 31)
+		report('zlib.decompress', len(data), time.perf_counter() - t)
+
+
+
+#--- output to memory: file object vs caller buffer
+
+def benchOutput(tmp):
+	print('Output to memory: decompress to BytesIO, decompressToBytes, decompressInto')
+
+	size = 16 * MB
+	path = gerarGz(os.path.join(tmp, 'output.gz'), gerarTexto(MB) * 16)
+	buf = bytearray(size)
+
+	def toBytesIO(gz):
+		out = io.BytesIO()
+		gz.decompress(out)
+		return out.getvalue()
+
+	ways = [('decompress + getvalue', toBytesIO),
+	        ('decompressToBytes', GZIP.decompressToBytes),
+	        ('decompressInto', lambda gz: gz.decompressInto(buf))]
+	for name, way in ways:
+		best = None
+		for _ in range(3):
+			gz = GZIP(path, verbose=False)
+			t = time.perf_counter()
+			way(gz)
+			t = time.perf_counter() - t
+			best = t if best is None else min(best, t)
+
+		tracemalloc.start()
+		way(GZIP(path, verbose=False))
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+		print('  %-28s %8.3f s  %8.3f MB/s  %8.1f MiB allocated' % (name, best, size / MB / best, peak / MB))
+
+
+
+#--- input: buffered file vs memory map, with the file in the page cache or not
+
+def dropCache(path):
+	''' evicts the file from the page cache (Linux), so that the next read comes from the disk '''
+	with open(path, 'rb') as f:
+		os.fsync(f.fileno())
+		os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def benchMmap(tmp):
+	print('Input: buffered file vs mapped file, cold and warm page cache')
+
+	cold = hasattr(os, 'posix_fadvise')
+	if not cold:
+		print('  (no posix_fadvise: warm cache only)')
+	size = 64 * MB
+	inputs = [('stored', 0), ('text', 6)]
+	for name, level in inputs:
+		path = gerarGz(os.path.join(tmp, 'input.gz'), gerarTexto(MB) * (size // MB), level)
+		print(' %s, level %d (%d bytes compressed)' % (name, level, os.path.getsize(path)))
+		for cache in (('cold', 'warm') if cold else ('warm',)):
+			for mapped in (False, True):
+				best = None
+				for _ in range(3):
+					if cache == 'cold':
+						dropCache(path)
+					gz = GZIP(path, verbose=False, mapped=mapped)
+					t = time.perf_counter()
+					with open(os.devnull, 'wb') as out:
+						gz.decompress(out)
+					t = time.perf_counter() - t
+					best = t if best is None else min(best, t)
+				report('%s, %s' % (cache, 'mapped' if mapped else 'buffered'), size, best)
+
+
+
+#--- Huffman tree construction: HFNode objects vs flat arrays
+
+def benchTree(tmp):
+	print('Huffman tree construction: HuffmanTree vs ArrayHuffmanTree (288 symbols)')
+
+	data = gerarTexto(MB // 4)
+	freqs = [0] * 288
+	for b in data:
+		freqs[b] += 1
+	alphabets = [('fixed code', [8]*144 + [9]*112 + [7]*24 + [8]*8),
+	             ('text frequencies', huffmanLengths([f or 1 for f in freqs], 15))]
+
+	builders = [('HuffmanTree + strings', lambda lengths: TreeDecoder(GZIP.alphaParaHuffman(lengths)).tree),
+	            ('ArrayHuffmanTree + strings', lambda lengths: arrayTreeFromStrings(GZIP.alphaParaHuffman(lengths))),
+	            ('ArrayHuffmanTree.fromLengths', ArrayHuffmanTree.fromLengths)]
+	repeat = 200
+
+	for name, lengths in alphabets:
+		print(' %s' % name)
+		for builder, build in builders:
+			t = time.perf_counter()
+			for _ in range(repeat):
+				build(lengths)
+			t = (time.perf_counter() - t) / repeat
+
+			tracemalloc.start()
+			tree = build(lengths)
+			memory = tracemalloc.get_traced_memory()[0]
+			tracemalloc.stop()
+			del tree
+			print('  %-30s %8.1f us  %8.1f KiB' % (builder, t * 1e6, memory / 1024))
+
+
+def arrayTreeFromStrings(codeTable):
+	tree = ArrayHuffmanTree()
+	for i, (numBits, codeBits) in enumerate(codeTable):
+		if numBits:
+			tree.addNode(format(codeBits, '0%db' % numBits), i)
+	return tree
+
+
+
+#--- bit reader: BitReader vs one f.read(1) per byte
+
+class ByteBitReader:
+	''' the original GZIP.readBits, reading the file one byte at a time '''
+
+	def __init__(self, f):
+		self.f = f
+		self.bits_buffer = 0
+		self.available_bits = 0
+
+	def readBits(self, n, keep=False):
+		while n > self.available_bits:
+			self.bits_buffer = self.f.read(1)[0] << self.available_bits | self.bits_buffer
+			self.available_bits += 8
+		mask = (2**n)-1
+		value = self.bits_buffer & mask
+		if not keep:
+			self.bits_buffer >>= n
+			self.available_bits -= n
+		return value
+
+
+def benchBits(tmp):
+	print('Bit reader: BitReader vs byte by byte reads')
+
+	size = MB
+	path = os.path.join(tmp, 'random.bin')
+	with open(path, 'wb') as f:
+		f.write(random.Random(0).randbytes(size))
+
+	# widths as used by the decoder: peek 9 bits, consume a code length, read some extra bits
+	widths = [(9, True), (7, False), (3, False), (9, True), (9, False), (2, False), (15, True), (12, False)]
+	total = sum(n for n, keep in widths if not keep)
+	rounds = (size * 8 - 64) // total
+
+	for name, reader in (('f.read(1) per byte', ByteBitReader), ('BitReader', BitReader)):
+		with open(path, 'rb') as f:
+			readBits = reader(f).readBits
+			t = time.perf_counter()
+			for _ in range(rounds):
+				for n, keep in widths:
+					readBits(n, keep)
+			t = time.perf_counter() - t
+		print('  %-28s %8.3f s  %8.2f Mbit/s' % (name, t, rounds * total / 1e6 / t))
+
+
+
+#--- trailer verification: cost of the CRC-32 of the output
+
+def benchCRC(tmp):
+	print('CRC-32 verification')
+
+	size = 4 * MB
+	data = gerarTexto(size)
+	for name, crc in (('zlib.crc32', zlib.crc32), ('slice-by-8', crc32Slice8)):
+		t = time.perf_counter()
+		crc(data)
+		t = time.perf_counter() - t
+		report(name, size, t)
+
+	# the overhead that counts: the CRC of each chunk flushed by the window, with the decoder GZIP uses (the compiled
+	# kernel, if it is built). The difference is small: 8 times the data, to /dev/null, runs with and without the
+	# check alternated, best of 7 of each
+	path = gerarGz(os.path.join(tmp, 'text8.txt.gz'), data * 8)
+	times = {False: [], True: []}
+	with open(os.devnull, 'wb') as out:
+		for _ in range(7):
+			for verify in (False, True):
+				t = time.perf_counter()
+				GZIP(path, verify=verify, verbose=False).decompress(out)
+				times[verify].append(time.perf_counter() - t)
+	semCRC, comCRC = min(times[False]), min(times[True])
+	decoder = 'compiled kernel' if GZIP.kernel is not None else 'Python decoder'
+	report('%s, verify=False' % decoder, 8 * size, semCRC)
+	report('%s, verify=True' % decoder, 8 * size, comCRC)
+	print('  %-28s %8.1f %%' % ('  CRC-32 overhead', 100 * (comCRC - semCRC) / semCRC))
+
+
+
+#--- parallel decompression: scaling with the number of workers
+
+def benchParallel(tmp):
+	print('Parallel decompression: 1 to N workers (%d CPUs)' % os.cpu_count())
+
+	size = 8 * MB
+	data = gerarTexto(size)
+	parts = [data[i:i+MB//2] for i in range(0, size, MB//2)]
+
+	# 16 members
+	membros = os.path.join(tmp, 'members.txt.gz')
+	with open(membros, 'wb') as f:
+		for part in parts:
+			comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+			f.write(comp.compress(part) + comp.flush())
+
+	# one member, with a full flush every 512 KiB
+	flush = os.path.join(tmp, 'flush.txt.gz')
+	comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+	with open(flush, 'wb') as f:
+		for part in parts:
+			f.write(comp.compress(part) + comp.flush(zlib.Z_FULL_FLUSH))
+		f.write(comp.flush())
+
+	counts = sorted({n for n in (1, 2, 4, 8, 16, 32) if n <= max(os.cpu_count(), 2)} | {os.cpu_count()})
+	for path in (membros, flush):
+		print(' %s (%d bytes)' % (os.path.basename(path), size))
+		report('GZIP.decompress', size, timeDecompress(path))
+		for n in counts:
+			t = time.perf_counter()
+			decompressParallel(path, workers=n, chunkSize=os.path.getsize(path) // len(parts))
+			report('%d worker(s)' % n, size, time.perf_counter() - t)
+
+
+
+#--- compression: throughput and ratio of each level, next to zlib
+
+def benchCompress(tmp):
+	print('Compression: deflate.compress vs zlib, for each level')
+
+	inputs = [('text', gerarTexto(MB)), ('random', random.Random(0).randbytes(MB // 4))]
+	for name, data in inputs:
+		print(' %s (%d bytes)' % (name, len(data)))
+		for level in range(10):
+			t = time.perf_counter()
+			comp = compress(data, level)
+			t = time.perf_counter() - t
+			assert zlib.decompress(comp, 31) == data
+			ref = zlib.compressobj(level, zlib.DEFLATED, 31)
+			ref = len(ref.compress(data) + ref.flush())
+			print('  level %d %8.3f s  %8.3f MB/s  ratio %6.2f%%  (zlib %6.2f%%)' % (level, t, len(data) / MB / t, 100 * len(comp) / len(data), 100 * ref / len(data)))
+
+
+
+BENCHMARKS = {
+	'huffman': benchHuffman,
+	'fastpath': benchFastPath,
+	'kernel': benchKernel,
+	'output': benchOutput,
+	'mmap': benchMmap,
+	'tree': benchTree,
+	'bits': benchBits,
+	'crc': benchCRC,
+	'parallel': benchParallel,
+	'compress': benchCompress,
+}
+
+
+if __name__ == '__main__':
+	names = sys.argv[1:] or list(BENCHMARKS)
+	with tempfile.TemporaryDirectory() as tmp:
+		for name in names:
+			BENCHMARKS[name](tmp)
+			print()
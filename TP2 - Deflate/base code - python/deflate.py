@@ -0,0 +1,534 @@
+# DEFLATE compressor: writes gzip members that GZIP (and gunzip) can decompress
+# Teoria da Informacao, LEI
+#
+# LZ77 with hash chains over a 32 KiB window finds the matches; the literals, lengths and distances of each block
+# are then coded with Huffman codes built from their frequencies (dynamic block, BTYPE=2), unless the fixed codes
+# or a stored block are smaller. Code lengths are limited to 15 bits (7 for the code length alphabet).
+# The level (0-9) sets how hard the match search tries, as in zlib: 0 only stores, 1-3 take the first good
+# match (greedy), 4-9 also try the next position before accepting a match (lazy matching) and follow longer chains.
+#
+# usage: python deflate.py file [level]   (writes file.gz)
+
+import io
+import os
+import sys
+import heapq
+import struct
+
+from inflate import GZIP, OutputWindow, lenCodes, distCodes, ordem, crc32
+
+
+WSIZE = OutputWindow.WSIZE
+WMASK = WSIZE - 1
+HASHBITS = 15  # hash of 3 bytes, as zlib's: each byte shifted by HASHSHIFT, so that only the last 3 bytes count
+HASHSHIFT = 5
+HASHMASK = (1 << HASHBITS) - 1
+MINMATCH = 3
+MAXMATCH = OutputWindow.MAXMATCH
+
+# level: (maximum hash chain length, nice match length, maximum match length for lazy matching - 0 = greedy)
+LEVELS = {1: (4, 8, 0), 2: (8, 16, 0), 3: (32, 32, 0),
+          4: (16, 16, 4), 5: (32, 32, 16), 6: (128, 128, 16),
+          7: (256, 128, 32), 8: (1024, 258, 128), 9: (4096, 258, 258)}
+
+BLOCKSYMBOLS = 1 << 14  # symbols per block
+SEGMENT = 1 << 22  # input compressed at a time by GzipWriter.write
+MAXSTORED = 0xFFFF  # maximum size of a stored block
+
+END_OF_BLOCK = 256
+
+
+def codeTables():
+	''' (length symbol, extra bits, extra value) for each match length, and (distance symbol, extra bits, extra value)
+		for each distance, built from lenCodes and distCodes '''
+
+	lengths = [None] * (MAXMATCH + 1)
+	for sym in sorted(lenCodes, reverse=True):
+		bits, base = lenCodes[sym]
+		for length in range(base, min(base + (1 << bits), MAXMATCH + 1)):
+			if lengths[length] is None:  # 258 is coded by 285, not by 284 with extra 31
+				lengths[length] = (sym, bits, length - base)
+
+	dists = [None] * (WSIZE + 1)
+	for sym, (bits, base) in distCodes.items():
+		for dist in range(base, base + (1 << bits)):
+			dists[dist] = (sym, bits, dist - base)
+	return lengths, dists
+
+LENGTHS, DISTS = codeTables()
+
+# extra bits of the code length alphabet symbols 16, 17 and 18
+CLEXTRA = {16: 2, 17: 3, 18: 7}
+
+FIXED_LL = [8]*144 + [9]*112 + [7]*24 + [8]*8
+FIXED_DIST = [5]*30
+
+
+
+def huffmanLengths(freqs, maxBits):
+	''' code lengths of a Huffman code for the symbol frequencies freqs, none longer than maxBits.
+		Symbols with frequency 0 get length 0, but at least two symbols get a code, so that the code is complete.
+		When the optimal code is too deep, the frequencies are flattened (halved, keeping them non zero)
+		and the code is built again '''
+
+	used = sum(1 for f in freqs if f)
+	if used < 2:
+		freqs = list(freqs)
+		for i in range(len(freqs)):
+			if not freqs[i] and used < 2:
+				freqs[i] = 1
+				used += 1
+
+	while True:
+		lengths = [0] * len(freqs)
+		heap = [(f, i, [i]) for i, f in enumerate(freqs) if f]
+		heapq.heapify(heap)
+		n = len(freqs)
+		while len(heap) > 1:
+			f1, _, s1 = heapq.heappop(heap)
+			f2, _, s2 = heapq.heappop(heap)
+			for s in s1:
+				lengths[s] += 1
+			for s in s2:
+				lengths[s] += 1
+			heapq.heappush(heap, (f1 + f2, n, s1 + s2))
+			n += 1
+		if max(lengths) <= maxBits:
+			return lengths
+		freqs = [(f >> 1) | 1 if f else 0 for f in freqs]
+
+
+def reversedCodes(lengths):
+	''' (code, length) of each symbol, with the bits of the code reversed: the Huffman codes are written
+		starting with their most significant bit, but the bit writer fills bytes from the least significant bit '''
+
+	codes = []
+	for length, code in GZIP.alphaParaHuffman(lengths):
+		rev = 0
+		for _ in range(length):
+			rev = rev << 1 | code & 1
+			code >>= 1
+		codes.append((rev, length))
+	return codes
+
+
+FIXED_CODES = (reversedCodes(FIXED_LL), reversedCodes(FIXED_DIST))
+
+
+def runLengths(lengths):
+	''' code length alphabet symbols for a sequence of code lengths: a list of (symbol, extra value) '''
+
+	out = []
+	i, n = 0, len(lengths)
+	while i < n:
+		length = lengths[i]
+		run = 1
+		while i + run < n and lengths[i + run] == length:
+			run += 1
+		i += run
+		if length == 0:
+			while run >= 11:
+				r = min(run, 138)
+				out.append((18, r - 11))
+				run -= r
+			if run >= 3:
+				out.append((17, run - 3))
+				run = 0
+		else:
+			out.append((length, 0))
+			run -= 1
+			while run >= 3:
+				r = min(run, 6)
+				out.append((16, r - 3))
+				run -= r
+		out.extend([(length, 0)] * run)
+	return out
+
+
+
+class BitWriter:
+	''' writes values of up to 32 bits, least significant bit first, as the deflate format packs them '''
+
+	def __init__(self):
+		self.out = bytearray()
+		self.acc = 0
+		self.bits = 0
+
+
+	def write(self, value, n):
+		self.acc |= value << self.bits
+		self.bits += n
+		if self.bits >= 32:
+			self.out += (self.acc & 0xFFFFFFFF).to_bytes(4, 'little')
+			self.acc >>= 32
+			self.bits -= 32
+
+
+	def alignToByte(self):
+		''' pads with zeros up to the next byte boundary '''
+
+		self.bits += -self.bits & 7
+		n = self.bits >> 3
+		self.out += self.acc.to_bytes(n, 'little')
+		self.acc = self.bits = 0
+
+
+	def take(self):
+		''' returns the complete bytes written so far, keeping the bits of an incomplete byte '''
+
+		n = self.bits >> 3
+		self.out += (self.acc & ((1 << (n * 8)) - 1)).to_bytes(n, 'little')
+		self.acc >>= n * 8
+		self.bits -= n * 8
+		data = bytes(self.out)
+		self.out = bytearray()
+		return data
+
+
+
+class Deflater:
+	''' compresses a deflate stream: compress(data) can be called any number of times, finish() ends the stream '''
+
+	def __init__(self, level=6):
+		if not 0 <= level <= 9:
+			raise ValueError('invalid compression level %d' % level)
+		self.level = level
+		self.writer = BitWriter()
+		self.history = b''  # last WSIZE bytes of input, the window of the next segment
+		self.resetBlock()
+		self.blocks = 0
+
+
+	def resetBlock(self):
+		self.symbols = []  # literals (0-255) and matches (-(length << 16 | distance))
+		self.llFreq = [0] * 286
+		self.distFreq = [0] * 30
+		self.raw = []  # input covered by the symbols, for a stored block
+
+
+	def compress(self, data):
+		''' compresses data, returning the compressed bytes complete so far '''
+
+		if self.level == 0:
+			self.raw.append(bytes(data))
+			if sum(map(len, self.raw)) >= MAXSTORED:
+				self.storedBlocks(b''.join(self.raw), False)
+				self.resetBlock()
+		elif data:
+			self.lz77(bytes(data))
+		return self.writer.take()
+
+
+	def finish(self):
+		''' writes the last block and returns the rest of the compressed stream '''
+
+		self.writeBlock(True)
+		self.writer.alignToByte()
+		return self.writer.take()
+
+
+	def lz77(self, data):
+		''' finds the literals and matches of data, with the previous WSIZE bytes of input as history.
+			Each position is inserted in a hash chain, as in zlib: head maps the hash of 3 bytes to the last position
+			where it was seen, prev maps a position (modulo WSIZE) to the previous one with the same hash.
+			Both are arrays of fixed size, whatever the input '''
+
+		maxChain, niceLength, maxLazy = LEVELS[self.level]
+		buf = self.history + data
+		end = len(buf)
+		head = [-1] * (HASHMASK + 1)
+		prev = [-1] * WSIZE
+
+		def insert(i):
+			h = ((buf[i] << 2 * HASHSHIFT) ^ (buf[i+1] << HASHSHIFT) ^ buf[i+2]) & HASHMASK
+			prev[i & WMASK] = head[h]
+			head[h] = i
+
+		for i in range(len(self.history) - MINMATCH + 1):
+			insert(i)
+
+		def longestMatch(i, best):
+			''' longest match for position i (already inserted), if longer than best: (length, distance) '''
+
+			maxLen = min(MAXMATCH, end - i)
+			if maxLen <= best:
+				return 0, 0
+			limit = max(i - WSIZE, -1)  # prev has -1 where the chain ends
+			cur = prev[i & WMASK]
+			chain = maxChain if best < niceLength else maxChain >> 2
+			bestDist = 0
+			while cur > limit and chain:
+				chain -= 1
+				# check the byte that would make it better first, then the 3 bytes (different ones can have the same hash)
+				if buf[cur+best] == buf[i+best] and buf[cur:cur+MINMATCH] == buf[i:i+MINMATCH]:
+					if buf[cur:cur+maxLen] == buf[i:i+maxLen]:
+						length = maxLen
+					else:
+						lo, hi = MINMATCH, maxLen - 1  # buf[cur:cur+lo] matches, buf[cur:cur+hi+1] does not
+						while lo < hi:
+							mid = (lo + hi + 1) >> 1
+							if buf[cur:cur+mid] == buf[i:i+mid]:
+								lo = mid
+							else:
+								hi = mid - 1
+						length = lo
+					if length > best:
+						best, bestDist = length, i - cur
+						if length >= niceLength or length == maxLen:
+							break
+				cur = prev[cur & WMASK]
+			return (best, bestDist) if bestDist else (0, 0)
+
+		symbols = self.symbols
+		llFreq, distFreq = self.llFreq, self.distFreq
+		blockStart = i = len(self.history)
+		lastInsert = end - MINMATCH  # last position with 3 bytes to hash
+
+		def literal(pos):
+			b = buf[pos]
+			symbols.append(b)
+			llFreq[b] += 1
+
+		def match(length, dist):
+			symbols.append(-(length << 16 | dist))
+			llFreq[LENGTHS[length][0]] += 1
+			distFreq[DISTS[dist][0]] += 1
+
+		def endBlock(pos):
+			nonlocal blockStart
+			if len(symbols) >= BLOCKSYMBOLS:
+				self.raw.append(buf[blockStart:pos])
+				blockStart = pos
+				self.writeBlock(False)
+				return True
+			return False
+
+		if not maxLazy:
+			# greedy: take the longest match at each position
+			while i < end:
+				if i <= lastInsert:
+					insert(i)
+					length, dist = longestMatch(i, MINMATCH - 1)
+				else:
+					length = 0
+				if length:
+					match(length, dist)
+					if length <= niceLength:
+						for j in range(i + 1, min(i + length, lastInsert + 1)):
+							insert(j)
+					i += length
+				else:
+					literal(i)
+					i += 1
+				if endBlock(i):
+					symbols, llFreq, distFreq = self.symbols, self.llFreq, self.distFreq
+		else:
+			# lazy: a match found at i is only taken if the match at i+1 is not longer
+			prevLength = prevDist = 0
+			pending = False  # the byte at i-1 is not coded yet
+			while i < end:
+				length = dist = 0
+				if i <= lastInsert:
+					insert(i)
+					if prevLength < maxLazy:
+						length, dist = longestMatch(i, max(prevLength, MINMATCH - 1))
+				if prevLength >= MINMATCH and length <= prevLength:
+					match(prevLength, prevDist)
+					stop = i - 1 + prevLength
+					for j in range(i + 1, min(stop, lastInsert + 1)):
+						insert(j)
+					i = stop
+					prevLength = 0
+					pending = False
+				else:
+					if pending:
+						literal(i - 1)
+						# without matches nothing else ends a block: the byte at i, still pending, goes to the next one
+						if endBlock(i):
+							symbols, llFreq, distFreq = self.symbols, self.llFreq, self.distFreq
+					prevLength, prevDist = length, dist
+					pending = True
+					i += 1
+				if not pending and endBlock(i):
+					symbols, llFreq, distFreq = self.symbols, self.llFreq, self.distFreq
+			if pending:
+				if prevLength >= MINMATCH:
+					match(prevLength, prevDist)
+				else:
+					literal(end - 1)
+
+		self.raw.append(buf[blockStart:end])
+		self.history = buf[-WSIZE:]
+
+
+	def writeBlock(self, final):
+		''' writes the pending symbols as the smallest of a dynamic, fixed or stored block, and starts a new block '''
+
+		raw = b''.join(self.raw)
+		if self.level == 0:
+			self.storedBlocks(raw, final)
+			self.resetBlock()
+			return
+
+		llFreq, distFreq = self.llFreq, self.distFreq
+		llFreq[END_OF_BLOCK] = 1
+
+		# extra bits of the lengths and distances, the same for both Huffman block types
+		extra = sum(llFreq[s] * lenCodes[s][0] for s in range(257, 286)) + sum(distFreq[s] * distCodes[s][0] for s in range(30))
+
+		llLen = huffmanLengths(llFreq, 15)
+		distLen = huffmanLengths(distFreq, 15)
+		HLIT = max(i for i in range(256, 286) if llLen[i]) - 256
+		HDIST = max(i for i in range(30) if distLen[i])
+		rle = runLengths(llLen[:HLIT + 257] + distLen[:HDIST + 1])
+		clFreq = [0] * 19
+		for sym, _ in rle:
+			clFreq[sym] += 1
+		clLen = huffmanLengths(clFreq, 7)
+		HCLEN = max(i for i in range(3, 19) if clLen[ordem[i]] or i == 3) + 1 - 4
+
+		dynamicBits = 17 + (HCLEN + 4) * 3 + sum(clLen[sym] + CLEXTRA.get(sym, 0) for sym, _ in rle)
+		dynamicBits += sum(f * l for f, l in zip(llFreq, llLen)) + sum(f * l for f, l in zip(distFreq, distLen)) + extra
+		fixedBits = 3 + sum(f * l for f, l in zip(llFreq, FIXED_LL)) + 5 * sum(distFreq) + extra
+		storedBits = 3 + 7 + (len(raw) // MAXSTORED + 1) * 32 + 8 * len(raw)
+
+		w = self.writer
+		if storedBits <= min(dynamicBits, fixedBits):
+			self.storedBlocks(raw, final)
+		elif fixedBits <= dynamicBits:
+			w.write(final | 1 << 1, 3)
+			self.writeSymbols(*FIXED_CODES)
+		else:
+			w.write(final | 2 << 1, 3)
+			w.write(HLIT, 5)
+			w.write(HDIST, 5)
+			w.write(HCLEN, 4)
+			for i in range(HCLEN + 4):
+				w.write(clLen[ordem[i]], 3)
+			clCodes = reversedCodes(clLen)
+			for sym, value in rle:
+				w.write(*clCodes[sym])
+				if sym in CLEXTRA:
+					w.write(value, CLEXTRA[sym])
+			self.writeSymbols(reversedCodes(llLen), reversedCodes(distLen))
+
+		self.blocks += 1
+		self.resetBlock()
+
+
+	def writeSymbols(self, llCodes, distCodes):
+		''' writes the pending symbols and the end of block code with the given (reversed code, length) tables '''
+
+		write = self.writer.write
+		for s in self.symbols:
+			if s >= 0:
+				write(*llCodes[s])
+			else:
+				s = -s
+				sym, bits, value = LENGTHS[s >> 16]
+				code, n = llCodes[sym]
+				write(code | value << n, n + bits)
+				sym, bits, value = DISTS[s & 0xFFFF]
+				code, n = distCodes[sym]
+				write(code | value << n, n + bits)
+		write(*llCodes[END_OF_BLOCK])
+
+
+	def storedBlocks(self, raw, final):
+		''' writes raw as stored blocks (BTYPE=0) of at most MAXSTORED bytes '''
+
+		w = self.writer
+		pos = 0
+		while True:
+			chunk = raw[pos:pos + MAXSTORED]
+			pos += len(chunk)
+			last = final and pos >= len(raw)
+			w.write(last, 3)
+			w.alignToByte()
+			w.out += struct.pack('<HH', len(chunk), len(chunk) ^ 0xFFFF)
+			w.out += chunk
+			self.blocks += 1
+			if pos >= len(raw):
+				break
+
+
+
+class GzipWriter:
+	''' writes one gzip member to a binary file object: header, deflate stream of everything passed
+		to write(), and the CRC-32 / ISIZE trailer when closed '''
+
+	def __init__(self, fileobj, level=6, name=None, mtime=0):
+		self.f = fileobj
+		self.deflater = Deflater(level)
+		self.crc = self.size = 0
+		self.pending = []
+		self.pendingSize = 0
+
+		FLG = 0x08 if name else 0  # FNAME
+		XFL = 2 if level == 9 else 4 if level == 1 else 0
+		header = struct.pack('<BBBBIBB', 0x1f, 0x8b, 8, FLG, int(mtime), XFL, 255)
+		if name:
+			header += name.encode('latin-1', 'replace') + b'\0'
+		self.f.write(header)
+
+
+	def write(self, data):
+		self.crc = crc32(data, self.crc)
+		self.size += len(data)
+		self.pending.append(bytes(data))
+		self.pendingSize += len(data)
+		if self.pendingSize >= SEGMENT:
+			self.f.write(self.deflater.compress(b''.join(self.pending)))
+			self.pending = []
+			self.pendingSize = 0
+		return len(data)
+
+
+	def close(self):
+		self.f.write(self.deflater.compress(b''.join(self.pending)))
+		self.f.write(self.deflater.finish())
+		self.f.write(struct.pack('<II', self.crc, self.size & 0xFFFFFFFF))
+		self.pending = []
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *args):
+		self.close()
+
+
+
+def compress(data, level=6):
+	''' data compressed as a gzip member '''
+
+	out = io.BytesIO()
+	with GzipWriter(out, level) as writer:
+		writer.write(data)
+	return out.getvalue()
+
+
+def compressFile(filename, outFile=None, level=6):
+	''' compresses filename to outFile (by default, filename + '.gz'), keeping the name and modification time
+		in the header. Returns the compressed size '''
+
+	if outFile is None:
+		outFile = filename + '.gz'
+	with open(filename, 'rb') as f, open(outFile, 'wb') as out:
+		with GzipWriter(out, level, os.path.basename(filename), os.stat(f.fileno()).st_mtime) as writer:
+			while True:
+				data = f.read(SEGMENT)
+				if not data:
+					break
+				writer.write(data)
+		return out.tell()
+
+
+
+if __name__ == '__main__':
+	fileName = sys.argv[1]
+	level = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+	size = compressFile(fileName, level=level)
+	print('%s.gz: %d bytes (%.1f%% of %d)' % (fileName, size, 100 * size / max(os.path.getsize(fileName), 1), os.path.getsize(fileName)))
@@ -0,0 +1,158 @@
+# Random access to gzip files (as in zlib's zran.c)
+# Teoria da Informacao, LEI
+#
+# While a file is decompressed, a checkpoint is recorded at the start of a block every span bytes of output:
+# the position of the block in the compressed file (in bits), the position in the decompressed data and the
+# last 32 KiB decompressed (the window the block may refer to). Decompression can then resume at any
+# checkpoint, so reading from an offset costs O(span) instead of O(offset).
+#
+# usage: python gzipindex.py file.gz [offset [n]]   (builds/updates file.gz.gzidx, shows n bytes at offset)
+
+import os
+import sys
+import zlib
+import struct
+import bisect
+
+from inflate import GZIP, GzipReader
+
+
+class Checkpoint:
+	''' a point where decompression can resume '''
+
+	def __init__(self, bitOffset, outOffset, window):
+		self.bitOffset = bitOffset  # position of the block in the compressed file, in bits
+		self.outOffset = outOffset  # position in the decompressed data
+		self.window = window  # last 32 KiB decompressed, compressed with zlib
+
+
+	def getWindow(self):
+		return zlib.decompress(self.window)
+
+
+
+class GzipIndex:
+	''' checkpoints of a gzip file, saved in a sidecar file (by default, the gzip file name + '.gzidx') '''
+
+	SPAN = 4 << 20  # minimum distance between checkpoints, in decompressed bytes
+	MAGIC = b'GZIDX1'
+	HEADER = struct.Struct('<QQdQI')  # span, gzip file size, gzip file mtime, decompressed size, checkpoints
+	ENTRY = struct.Struct('<QQI')  # bit offset, decompressed offset, size of the compressed window
+
+
+	def __init__(self, span=SPAN):
+		self.span = span
+		self.checkpoints = []
+		self.outOffsets = []  # outOffset of each checkpoint, for bisect
+		self.size = 0  # size of the decompressed data
+		self.gzSize = self.gzMtime = 0  # to detect that the gzip file changed
+		self.membersOut = (0, 0)  # number of members decompressed and their size (while building)
+
+
+	def addCheckpoint(self, gz):
+		''' GZIP.blockCallback: records a checkpoint at the start of a block, if span bytes were decompressed
+			since the previous one '''
+
+		# data decompressed so far: complete members + current member (flushed and pending)
+		if self.membersOut[0] != len(gz.members):
+			self.membersOut = (len(gz.members), sum(m.outputBytes for m in gz.members))
+		window = gz.window
+		outOffset = self.membersOut[1] + window.size + window.pos - window.start
+
+		last = self.outOffsets[-1] if self.outOffsets else 0
+		if outOffset - last < self.span:
+			return
+
+		history = window.buf[max(0, window.pos - window.WSIZE):window.pos]
+		self.checkpoints.append(Checkpoint(gz.bitReader.tellBits(), outOffset, zlib.compress(history, 9)))
+		self.outOffsets.append(outOffset)
+
+
+	def find(self, offset):
+		''' the last checkpoint at or before offset of the decompressed data, None if there is none '''
+
+		i = bisect.bisect_right(self.outOffsets, offset)
+		return self.checkpoints[i-1] if i > 0 else None
+
+
+	def save(self, path):
+		with open(path, 'wb') as f:
+			f.write(self.MAGIC)
+			f.write(self.HEADER.pack(self.span, self.gzSize, self.gzMtime, self.size, len(self.checkpoints)))
+			for cp in self.checkpoints:
+				f.write(self.ENTRY.pack(cp.bitOffset, cp.outOffset, len(cp.window)))
+				f.write(cp.window)
+
+
+	@classmethod
+	def load(cls, path):
+		with open(path, 'rb') as f:
+			if f.read(len(cls.MAGIC)) != cls.MAGIC:
+				raise ValueError('%s is not a gzip index' % path)
+			span, gzSize, gzMtime, size, count = cls.HEADER.unpack(f.read(cls.HEADER.size))
+			index = cls(span)
+			index.gzSize, index.gzMtime, index.size = gzSize, gzMtime, size
+			for _ in range(count):
+				bitOffset, outOffset, length = cls.ENTRY.unpack(f.read(cls.ENTRY.size))
+				index.checkpoints.append(Checkpoint(bitOffset, outOffset, f.read(length)))
+				index.outOffsets.append(outOffset)
+		return index
+
+
+	def matches(self, filename):
+		''' True if the index was built for the current version of filename '''
+
+		st = os.stat(filename)
+		return (self.gzSize, self.gzMtime) == (st.st_size, st.st_mtime)
+
+
+
+def buildIndex(filename, span=GzipIndex.SPAN, outFile=None):
+	''' decompresses filename once, recording checkpoints every span bytes. The decompressed data is written to
+		outFile (a writable binary file object) if given, discarded otherwise. Returns the GzipIndex '''
+
+	index = GzipIndex(span)
+	st = os.stat(filename)
+	index.gzSize, index.gzMtime = st.st_size, st.st_mtime
+
+	gz = GZIP(filename, verbose=False)
+	gz.blockCallback = index.addCheckpoint
+	try:
+		for chunk in gz.chunks():
+			if outFile is not None:
+				outFile.write(chunk)
+	finally:
+		gz.f.close()
+	index.size = sum(m.outputBytes for m in gz.members)
+	return index
+
+
+def openIndexed(filename, span=GzipIndex.SPAN, indexFile=None):
+	''' opens filename for random access: a GzipReader using the index in indexFile (by default, filename + '.gzidx'),
+		built and saved first if it does not exist or is older than the gzip file '''
+
+	if indexFile is None:
+		indexFile = filename + '.gzidx'
+
+	index = None
+	if os.path.exists(indexFile):
+		index = GzipIndex.load(indexFile)
+		if not index.matches(filename):
+			index = None
+	if index is None:
+		index = buildIndex(filename, span)
+		index.save(indexFile)
+
+	return GzipReader(filename, index=index)
+
+
+
+if __name__ == '__main__':
+	fileName = sys.argv[1]
+	offset = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+	n = int(sys.argv[3]) if len(sys.argv) > 3 else 256
+
+	with openIndexed(fileName) as reader:
+		print('%d checkpoint(s), %d bytes decompressed' % (len(reader.index.checkpoints), reader.index.size))
+		reader.seek(offset)
+		sys.stdout.buffer.write(reader.read(n))
@@ -1,209 +1,438 @@
-# Author: Marco Simões
-# Adapted from Java's implementation of Rui Pedro Paiva
-# Teoria da Informacao, LEI, 2022
-
-
-class HFNode:
-	'''class for representation of a Huffman node '''
-
-	index = -1  # if leaf, saves the position in alphabet; otherwise, -1;
-	level = 0 # level of the node in the tree
-	left, right = None, None  # left and right child nodes. If leaf, both are None
-	
-	
-	def __init__(self, i, lv, l=None, r=None):
-		self.index = i
-		self.level = lv
-		self.left = l
-		self.right = r
-	
-	
-	# check if node is leaf
-	def isLeaf(self):
-		return self.left == None and self.right == None
-			
-
-class HuffmanTree:
-	'''class for creating, managing and accessing Huffman trees'''
-	
-	root = curNode = None  
-		
-
-	def __init__(self, root=None, curNode=None):
-		if not root:
-			root = HFNode(-1, 0)
-			curNode = root
-		self.root = root
-		self.curNode = curNode
-		
-	
-
-	def resetCurNode(self):
-		''' position curNode pointer on the root of the tree '''
-		self.curNode = self.root
-	
-	
-	
-	def addNode(self, s, ind, verbose=False):
-		''' Adds a new node to the tree. Gets the code as a string s of zeros and ones and the index of the alphabet.
-			returns: 
-				 0: success
-				-1: node already exists
-				-2: code is not longer prefix code'''
-	
-		tmp = self.root
-		lv = 0 
-		l = len(s)
-
-		found = False
-		pos = -3
-					
-		while lv < l and not found:
-			# trying to create son of leaf --> error, not prefix code
-			if tmp.index != -1:
-				pos = -2
-				found = True
-			else:
-				direction = s[lv]
-				
-				if direction == '0': # LEFT
-
-					if lv != l-1 and tmp.left != None:  # keep on going down
-						tmp = tmp.left
-
-					elif tmp.left != None: # already inserted
-						pos = -1
-						found = True
-					
-					
-					else: # create node in the left
-						if lv == l-1:  # leaf						
-							index = ind
-						else:
-							index = -1
-
-						hf = HFNode(index, lv+1)
-						tmp.left = hf
-						tmp = tmp.left
-				
-				
-				elif direction == '1': # RIGHT
-				
-					if lv != l -1 and tmp.right != None: # keep on going down
-						tmp = tmp.right
-
-					elif tmp.right != None: # already inserted
-						pos = -1
-						found = True
-					
-					else: # create node in the right
-						if lv == l-1:  # leaf
-							index = ind
-						else:
-							index = -1
-
-						hf = HFNode(index, lv+1)
-						tmp.right = hf
-						tmp = tmp.right
-							
-			lv += 1	
-				
-		if not found:
-			pos = tmp.index
-			
-		if verbose:
-			if pos == -1:
-				print("Code '" + s + "' already inserted!!!")
-			elif pos == -2:
-				print("Code '" + s + "' trying to extend leaf - no prefix code!!!")
-			else:
-				print("Code '" + s + "' successfully inserted!!!")
-		
-		return pos	
-		
-	
-	def findNode(self, s, cur=None, verbose=False):
-		''' finds node from cur node following a string of '0's and '1's for traversing left or right, respectfully.
-			returns:
-			-1 if not found
-			-2 if it is prefix of an existing code
-			indice of the alphabet if found '''
-		
-		if cur == None:
-			cur = self.root
-			
-		tmp = cur
-		lv = 0
-		l = len(s)
-		found = True
-		
-		
-		while lv < l and found:
-		
-			direction = s[lv]
-			
-			if direction == '0':
-				if tmp.left != None:
-					tmp = tmp.left
-				else:
-					found = False
-			
-			elif direction == '1':
-				if tmp.right != None:
-					tmp = tmp.right
-				else:
-					found = False
-			
-			
-			lv += 1
-		
-				
-		if not found:
-			pos = -1
-		elif tmp.index == -1:
-			pos = -2
-		else:
-			pos = tmp.index
-			
-		if verbose:
-			if pos == -1:
-				print("Code '" + s + "' not found!!!")
-			elif pos == -2:
-				print("Code '" + s + "': not found but prefix!!!")
-			else:
-				print("Code '" + s + "' found, alphabet position: " + str(pos) )
-						
-		return pos
-
-	
-
-	
-	def nextNode(self, dir):
-		''' updates curNode based on the direction dir to descend the tree '''
-		
-		if self.curNode.isLeaf():
-			return -1
-		
-		if dir == '0':
-			if self.curNode.left != None:
-				self.curNode = self.curNode.left
-				if self.curNode.isLeaf():
-					pos = self.curNode.index
-				else:
-					pos = -2
-			else:
-				pos = -1
-
-		elif dir == '1':
-			if self.curNode.right != None:
-				self.curNode = self.curNode.right
-				if self.curNode.isLeaf():
-					pos = self.curNode.index
-				else:
-					pos = -2
-			
-			else:
-				pos = -1								
-		
-		return pos
-
+# Author: Marco Simões
+# Adapted from Java's implementation of Rui Pedro Paiva
+# Teoria da Informacao, LEI, 2022
+
+from array import array
+
+
+class HFNode:
+	'''class for representation of a Huffman node '''
+
+	index = -1  # if leaf, saves the position in alphabet; otherwise, -1;
+	level = 0 # level of the node in the tree
+	left, right = None, None  # left and right child nodes. If leaf, both are None
+	
+	
+	def __init__(self, i, lv, l=None, r=None):
+		self.index = i
+		self.level = lv
+		self.left = l
+		self.right = r
+	
+	
+	# check if node is leaf
+	def isLeaf(self):
+		return self.left == None and self.right == None
+			
+
+class HuffmanTree:
+	'''class for creating, managing and accessing Huffman trees'''
+	
+	root = curNode = None  
+		
+
+	def __init__(self, root=None, curNode=None):
+		if not root:
+			root = HFNode(-1, 0)
+			curNode = root
+		self.root = root
+		self.curNode = curNode
+		
+	
+
+	def resetCurNode(self):
+		''' position curNode pointer on the root of the tree '''
+		self.curNode = self.root
+	
+	
+	
+	def addNode(self, s, ind, verbose=False):
+		''' Adds a new node to the tree. Gets the code as a string s of zeros and ones and the index of the alphabet.
+			returns: 
+				 0: success
+				-1: node already exists
+				-2: code is not longer prefix code'''
+	
+		tmp = self.root
+		lv = 0 
+		l = len(s)
+
+		found = False
+		pos = -3
+					
+		while lv < l and not found:
+			# trying to create son of leaf --> error, not prefix code
+			if tmp.index != -1:
+				pos = -2
+				found = True
+			else:
+				direction = s[lv]
+				
+				if direction == '0': # LEFT
+
+					if lv != l-1 and tmp.left != None:  # keep on going down
+						tmp = tmp.left
+
+					elif tmp.left != None: # already inserted
+						pos = -1
+						found = True
+					
+					
+					else: # create node in the left
+						if lv == l-1:  # leaf						
+							index = ind
+						else:
+							index = -1
+
+						hf = HFNode(index, lv+1)
+						tmp.left = hf
+						tmp = tmp.left
+				
+				
+				elif direction == '1': # RIGHT
+				
+					if lv != l -1 and tmp.right != None: # keep on going down
+						tmp = tmp.right
+
+					elif tmp.right != None: # already inserted
+						pos = -1
+						found = True
+					
+					else: # create node in the right
+						if lv == l-1:  # leaf
+							index = ind
+						else:
+							index = -1
+
+						hf = HFNode(index, lv+1)
+						tmp.right = hf
+						tmp = tmp.right
+							
+			lv += 1	
+				
+		if not found:
+			pos = tmp.index
+			
+		if verbose:
+			if pos == -1:
+				print("Code '" + s + "' already inserted!!!")
+			elif pos == -2:
+				print("Code '" + s + "' trying to extend leaf - no prefix code!!!")
+			else:
+				print("Code '" + s + "' successfully inserted!!!")
+		
+		return pos	
+		
+	
+	def findNode(self, s, cur=None, verbose=False):
+		''' finds node from cur node following a string of '0's and '1's for traversing left or right, respectfully.
+			returns:
+			-1 if not found
+			-2 if it is prefix of an existing code
+			indice of the alphabet if found '''
+		
+		if cur == None:
+			cur = self.root
+			
+		tmp = cur
+		lv = 0
+		l = len(s)
+		found = True
+		
+		
+		while lv < l and found:
+		
+			direction = s[lv]
+			
+			if direction == '0':
+				if tmp.left != None:
+					tmp = tmp.left
+				else:
+					found = False
+			
+			elif direction == '1':
+				if tmp.right != None:
+					tmp = tmp.right
+				else:
+					found = False
+			
+			
+			lv += 1
+		
+				
+		if not found:
+			pos = -1
+		elif tmp.index == -1:
+			pos = -2
+		else:
+			pos = tmp.index
+			
+		if verbose:
+			if pos == -1:
+				print("Code '" + s + "' not found!!!")
+			elif pos == -2:
+				print("Code '" + s + "': not found but prefix!!!")
+			else:
+				print("Code '" + s + "' found, alphabet position: " + str(pos) )
+						
+		return pos
+
+	
+
+	
+	def nextNode(self, dir):
+		''' updates curNode based on the direction dir to descend the tree '''
+		
+		if self.curNode.isLeaf():
+			return -1
+		
+		if dir == '0':
+			if self.curNode.left != None:
+				self.curNode = self.curNode.left
+				if self.curNode.isLeaf():
+					pos = self.curNode.index
+				else:
+					pos = -2
+			else:
+				pos = -1
+
+		elif dir == '1':
+			if self.curNode.right != None:
+				self.curNode = self.curNode.right
+				if self.curNode.isLeaf():
+					pos = self.curNode.index
+				else:
+					pos = -2
+			
+			else:
+				pos = -1								
+		
+		return pos
+
+
+
+
+class ArrayHuffmanTree:
+	'''HuffmanTree with the nodes stored in flat arrays instead of HFNode objects: node k has children
+	left[k] and right[k] (0 if it has none, as the root, node 0, is never a child) and alphabet position index[k]
+	(-1 if it is not a leaf). addNode, findNode and nextNode return the same values as in HuffmanTree;
+	nodes are ints, so curNode and the cur argument of findNode are node numbers'''
+	
+	
+	def __init__(self):
+		self.left = array('h', [0])
+		self.right = array('h', [0])
+		self.index = array('h', [-1])
+		self.root = self.curNode = 0
+	
+	
+	@classmethod
+	def fromLengths(cls, lengths):
+		''' builds the tree of the canonical Huffman code with the given code lengths, indexed by alphabet
+			position (0 if the symbol is not used), as deflate assigns the codes. No strings are built:
+			each code is inserted following its bits, most significant first '''
+		
+		maxBits = max(lengths, default=0)
+		count = [0] * (maxBits + 1)
+		for length in lengths:
+			count[length] += 1
+		count[0] = 0
+		nextCode = [0] * (maxBits + 1)
+		code = 0
+		for bits in range(1, maxBits + 1):
+			code = (code + count[bits-1]) << 1
+			nextCode[bits] = code
+		
+		tree = cls()
+		left, right, index = tree.left, tree.right, tree.index
+		for symbol, length in enumerate(lengths):
+			if length == 0:
+				continue
+			code = nextCode[length]
+			nextCode[length] += 1
+			
+			node = 0
+			for bit in range(length - 1, -1, -1):
+				children = right if (code >> bit) & 1 else left
+				child = children[node]
+				if child == 0:
+					child = tree.newNode(symbol if bit == 0 else -1)
+					children[node] = child
+				elif bit == 0 or index[child] != -1:
+					raise ValueError('code lengths do not form a prefix code')
+				node = child
+		return tree
+	
+	
+	def newNode(self, index):
+		self.left.append(0)
+		self.right.append(0)
+		self.index.append(index)
+		return len(self.index) - 1
+	
+	
+	def isLeaf(self, node):
+		return self.left[node] == 0 and self.right[node] == 0
+	
+	
+	def resetCurNode(self):
+		''' position curNode pointer on the root of the tree '''
+		self.curNode = self.root
+	
+	
+	def addNode(self, s, ind, verbose=False):
+		''' Adds a new node to the tree, as HuffmanTree.addNode. Returns 0 (or the index) if successful,
+			-1 if the node already exists, -2 if the code is not a prefix code '''
+		
+		tmp = self.root
+		lv = 0
+		l = len(s)
+		found = False
+		pos = -3
+		
+		while lv < l and not found:
+			# trying to create son of leaf --> error, not prefix code
+			if self.index[tmp] != -1:
+				pos = -2
+				found = True
+			elif s[lv] in '01':
+				children = self.left if s[lv] == '0' else self.right
+				child = children[tmp]
+				
+				if lv != l-1 and child != 0:  # keep on going down
+					tmp = child
+				elif child != 0:  # already inserted
+					pos = -1
+					found = True
+				else:  # create node, a leaf if it is the last bit
+					child = self.newNode(ind if lv == l-1 else -1)
+					children[tmp] = child
+					tmp = child
+			lv += 1
+		
+		if not found:
+			pos = self.index[tmp]
+		
+		if verbose:
+			if pos == -1:
+				print("Code '" + s + "' already inserted!!!")
+			elif pos == -2:
+				print("Code '" + s + "' trying to extend leaf - no prefix code!!!")
+			else:
+				print("Code '" + s + "' successfully inserted!!!")
+		
+		return pos
+	
+	
+	def findNode(self, s, cur=None, verbose=False):
+		''' finds node from cur node following a string of '0's and '1's, as HuffmanTree.findNode.
+			returns -1 if not found, -2 if it is prefix of an existing code, the index of the alphabet if found '''
+		
+		tmp = self.root if cur is None else cur
+		found = True
+		for direction in s:
+			if direction == '0':
+				tmp = self.left[tmp]
+			elif direction == '1':
+				tmp = self.right[tmp]
+			if tmp == 0:
+				found = False
+				break
+		
+		if not found:
+			pos = -1
+		else:
+			pos = self.index[tmp]
+			if pos == -1:
+				pos = -2
+		
+		if verbose:
+			if pos == -1:
+				print("Code '" + s + "' not found!!!")
+			elif pos == -2:
+				print("Code '" + s + "': not found but prefix!!!")
+			else:
+				print("Code '" + s + "' found, alphabet position: " + str(pos) )
+		
+		return pos
+	
+	
+	def nextNode(self, dir):
+		''' updates curNode based on the direction dir to descend the tree '''
+		
+		if self.isLeaf(self.curNode):
+			return -1
+		
+		if dir == '0':
+			child = self.left[self.curNode]
+		elif dir == '1':
+			child = self.right[self.curNode]
+		else:
+			return None
+		
+		if child == 0:
+			return -1
+		self.curNode = child
+		return self.index[child] if self.isLeaf(child) else -2
+
+
+
+
+class HuffmanTable:
+	'''class for decoding Huffman codes with lookup tables instead of walking the tree bit by bit'''
+
+	ROOT_BITS = 9  # number of bits indexing the primary table
+	
+	
+	def __init__(self, codeTable):
+		''' builds the tables from a list of (length, code) pairs, indexed by alphabet position,
+			as returned by GZIP.alphaParaHuffman. Codes with more than ROOT_BITS bits are
+			resolved through a second level table. '''
+	
+		self.maxBits = max([length for length, code in codeTable] + [0])
+		self.rootBits = min(self.maxBits, self.ROOT_BITS)
+		
+		# entries: symbol << 4 | length if resolved, ~k if second level table k is needed,
+		# 0 if the bits do not form a valid code
+		self.table = [0] * (1 << self.rootBits)
+		self.sub = []
+		
+		subBits = self.maxBits - self.rootBits
+		rootMask = (1 << self.rootBits) - 1
+		
+		for symbol, (length, code) in enumerate(codeTable):
+			if length == 0:
+				continue
+			
+			# codes are stored MSB first but the deflate stream is read LSB first
+			rev = 0
+			for i in range(length):
+				rev = (rev << 1) | ((code >> i) & 1)
+			entry = (symbol << 4) | length
+			
+			if length <= self.rootBits:
+				for i in range(rev, len(self.table), 1 << length):
+					self.table[i] = entry
+			else:
+				low = rev & rootMask
+				if self.table[low] == 0:
+					self.sub.append([0] * (1 << subBits))
+					self.table[low] = ~(len(self.sub) - 1)
+				sub = self.sub[~self.table[low]]
+				for i in range(rev >> self.rootBits, len(sub), 1 << (length - self.rootBits)):
+					sub[i] = entry
+	
+	
+	
+	def decode(self, readBits):
+		''' decodes the next symbol, peeking bits with readBits(n, keep=True) and consuming only the code length '''
+		
+		entry = self.table[readBits(self.rootBits, True)]
+		if entry <= 0:
+			if entry < 0:
+				entry = self.sub[~entry][readBits(self.maxBits, True) >> self.rootBits]
+			if entry == 0:
+				raise ValueError('invalid Huffman code')
+		
+		readBits(entry & 15)
+		return entry >> 4
@@ -0,0 +1,1440 @@
+# Author: Marco Simoes
+# Adapted from Java's implementation of Rui Pedro Paiva
+# Teoria da Informacao, LEI, 2022
+
+import io
+import os
+import sys
+import mmap
+import time
+import struct
+from collections import OrderedDict
+from huffmantree import HuffmanTable
+
+try:
+    from zlib import crc32
+except ImportError:
+    crc32 = None
+
+# compiled decode kernel, built with 'python setup.py build_ext --inplace' (see inflatekernel.c)
+try:
+    import inflatekernel
+except ImportError:
+    inflatekernel = None
+
+
+lenCodes = {257: (0,3), 258: (0, 4), 259: (0, 5), 260: (0, 6), 261: (0, 7), 262: (0,8), 263: (0,9),
+            264: (0, 10), 265: (1,11), 266:(1, 13), 267: (1, 15), 268: (1, 17), 269: (2, 19), 270: (2, 23), 271: (2, 27),
+            272: (2,31), 273: (3, 35), 274: (3, 43), 275: (3, 51), 276: (3,59), 277: (4,67), 278: (4, 83), 279: (4,99),
+            280: (4,115), 281: (5,131), 282: (5,163), 283: (5,195), 284: (5,227), 285: (0, 258)}
+
+distCodes = {0: (0,1), 1: (0,2), 2:(0,3), 3: (0,4), 4:(1,5), 5:(1,7), 6:(2,9), 7:(2,13), 8:(3,17), 9:(3,25),
+             10:(4,33), 11:(4,49), 12:(5,65), 13:(5,97), 14:(6,129), 15:(6,193), 16:(7,257), 17:(7,385),
+             18:(8,513), 19:(8,769), 20:(9,1025), 21:(9,1537), 22:(10,2049), 23:(10,3073), 24:(11,4097),
+             25:(11, 6145), 26:(12,8193), 27:(12,12289), 28:(13,16385), 29:(13,24577)}
+
+# lenCodes and distCodes as flat tuples indexed by symbol, for the inner loop of the decoder, built once at import.
+# Distance symbols 30 and 31 do not occur in valid data: their base is beyond any window, so they fail the distance check
+LEN_EXTRA = (0,) * 257 + tuple(lenCodes[s][0] for s in range(257, 286))
+LEN_BASE = (0,) * 257 + tuple(lenCodes[s][1] for s in range(257, 286))
+DIST_EXTRA = tuple(distCodes[s][0] for s in range(30)) + (0, 0)
+DIST_BASE = tuple(distCodes[s][1] for s in range(30)) + (1 << 30, 1 << 30)
+
+# 8 bytes of input loaded at once into the bit accumulator by GZIP.decodeBlockFast
+QWORD = struct.Struct('<Q')
+
+# order in which the code lengths of the code length alphabet are stored (HCLEN)
+ordem = (16, 17, 18, 0, 8, 7, 9, 6, 10, 5, 11, 4, 12, 3, 13, 2, 14, 1, 15)
+
+# CRC-32 of the gzip trailer, computed 8 bytes at a time (slice-by-8) when zlib is not available
+CRC_TABLES = None
+
+def crc32Slice8(data, crc=0):
+    ''' updates crc with the bytes of data, like zlib.crc32 '''
+    
+    global CRC_TABLES
+    if CRC_TABLES is None:
+        T0 = [0] * 256
+        for i in range(256):
+            c = i
+            for _ in range(8):
+                c = (c >> 1) ^ 0xEDB88320 if c & 1 else c >> 1
+            T0[i] = c
+        CRC_TABLES = [T0]
+        for k in range(1, 8):
+            prev = CRC_TABLES[k-1]
+            CRC_TABLES.append([(prev[i] >> 8) ^ T0[prev[i] & 0xFF] for i in range(256)])
+    T0, T1, T2, T3, T4, T5, T6, T7 = CRC_TABLES
+    
+    data = memoryview(data).cast('B')
+    n = len(data) & ~7
+    crc ^= 0xFFFFFFFF
+    for one, two in struct.iter_unpack('<II', data[:n]):
+        one ^= crc
+        crc = (T7[one & 0xFF] ^ T6[(one >> 8) & 0xFF] ^ T5[(one >> 16) & 0xFF] ^ T4[one >> 24] ^
+               T3[two & 0xFF] ^ T2[(two >> 8) & 0xFF] ^ T1[(two >> 16) & 0xFF] ^ T0[two >> 24])
+    for byte in data[n:]:
+        crc = T0[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    return crc ^ 0xFFFFFFFF
+
+if crc32 is None:
+    crc32 = crc32Slice8
+
+
+def copyMatch(buf, pos, distance, length):
+    ''' copies the back-reference (distance, length) to position pos of buf. When it overlaps the bytes it
+        writes (distance < length), its last distance bytes are repeated: distance 1 is a run of one byte '''
+    
+    src = pos - distance
+    if distance >= length:
+        buf[pos:pos+length] = buf[src:src+length]
+    elif distance == 1:
+        buf[pos:pos+length] = buf[src:pos] * length
+    else:
+        buf[pos:pos+length] = (buf[src:pos] * (length // distance + 1))[:length]
+
+
+class GZIPHeader:
+	''' class for reading and storing GZIP header fields '''
+
+	ID1 = ID2 = CM = FLG = XFL = OS = 0
+	MTIME = []
+	lenMTIME = 4
+	mTime = 0
+
+	# bits 0, 1, 2, 3 and 4, respectively (remaining 3 bits: reserved)
+	FLG_FTEXT = FLG_FHCRC = FLG_FEXTRA = FLG_FNAME = FLG_FCOMMENT = 0   
+	
+	# FLG_FTEXT --> ignored (usually 0)
+	# if FLG_FEXTRA == 1
+	XLEN, extraField = [], []
+	lenXLEN = 2
+	
+	# if FLG_FNAME == 1
+	fName = ''  # ends when a byte with value 0 is read
+	
+	# if FLG_FCOMMENT == 1
+	fComment = ''   # ends when a byte with value 0 is read
+		
+	# if FLG_HCRC == 1
+	HCRC = []
+		
+		
+	
+	def read(self, f):
+		''' reads and processes the Huffman header from file. Returns 0 if no error, -1 otherwise '''
+
+		# ID 1 and 2: fixed values
+		self.ID1 = f.read(1)[0]  
+		if self.ID1 != 0x1f: return -1 # error in the header
+			
+		self.ID2 = f.read(1)[0]
+		if self.ID2 != 0x8b: return -1 # error in the header
+		
+		# CM - Compression Method: must be the value 8 for deflate
+		self.CM = f.read(1)[0]
+		if self.CM != 0x08: return -1 # error in the header
+					
+		# Flags
+		self.FLG = f.read(1)[0]
+		
+		# MTIME
+		self.MTIME = [0]*self.lenMTIME
+		self.mTime = 0
+		for i in range(self.lenMTIME):
+			self.MTIME[i] = f.read(1)[0]
+			self.mTime += self.MTIME[i] << (8 * i) 				
+						
+		# XFL (not processed...)
+		self.XFL = f.read(1)[0]
+		
+		# OS (not processed...)
+		self.OS = f.read(1)[0]
+		
+		# --- Check Flags
+		self.FLG_FTEXT = self.FLG & 0x01
+		self.FLG_FHCRC = (self.FLG & 0x02) >> 1
+		self.FLG_FEXTRA = (self.FLG & 0x04) >> 2
+		self.FLG_FNAME = (self.FLG & 0x08) >> 3
+		self.FLG_FCOMMENT = (self.FLG & 0x10) >> 4
+					
+		# FLG_EXTRA
+		if self.FLG_FEXTRA == 1:
+			# read 2 bytes XLEN + XLEN bytes de extra field
+			# 1st byte: LSB, 2nd: MSB
+			self.XLEN = [0]*self.lenXLEN
+			self.XLEN[0] = f.read(1)[0]
+			self.XLEN[1] = f.read(1)[0]
+			self.xlen = (self.XLEN[1] << 8) + self.XLEN[0]
+			
+			# read extraField and ignore its values
+			self.extraField = f.read(self.xlen)
+		
+		def read_str_until_0(f):
+			s = ''
+			while True:
+				c = f.read(1)[0]
+				if c == 0: 
+					return s
+				s += chr(c)
+		
+		# FLG_FNAME
+		if self.FLG_FNAME == 1:
+			self.fName = read_str_until_0(f)
+		
+		# FLG_FCOMMENT
+		if self.FLG_FCOMMENT == 1:
+			self.fComment = read_str_until_0(f)
+		
+		# FLG_FHCRC (not processed...)
+		if self.FLG_FHCRC == 1:
+			self.HCRC = f.read(2)
+			
+		return 0
+			
+
+
+
+class BitReader:
+	''' reads a binary file bit by bit (least significant bit first), as the deflate format requires.
+		The file is read in blocks of blockSize bytes and the bits are kept in an accumulator
+		refilled 8 bytes at a time. If data is given instead (the whole file, in memory or mapped),
+		f is None and reading starts at byte start of data '''
+
+	BLOCKSIZE = 1 << 16
+	MASKS = tuple((1 << n) - 1 for n in range(65))
+	
+	
+	def __init__(self, f, blockSize=BLOCKSIZE, data=b'', start=0):
+		self.f = f
+		self.blockSize = blockSize
+		self.data = data  # last block read from f
+		self.offset = -start  # position of data in the file, counted from where reading started
+		self.index = start  # next byte of data to move to the accumulator
+		self.acc = 0  # bit accumulator
+		self.bits = 0  # number of valid bits in acc
+	
+	
+	def refill(self, n):
+		''' loads bytes into the accumulator until it has at least n bits or the file ends '''
+		
+		while self.bits < n:
+			if self.index >= len(self.data):
+				if self.f is None:
+					return
+				self.offset += len(self.data)
+				self.data = self.f.read(self.blockSize)
+				self.index = 0
+				if not self.data:
+					return
+			chunk = self.data[self.index:self.index+8]
+			self.acc |= int.from_bytes(chunk, 'little') << self.bits
+			self.index += len(chunk)
+			self.bits += 8 * len(chunk)
+	
+	
+	def peek(self, n):
+		''' returns the next n bits without consuming them. Past the end of the file, bits are 0 '''
+		
+		if self.bits < n:
+			self.refill(n)
+		return self.acc & self.MASKS[n]
+	
+	
+	def consume(self, n):
+		''' discards the next n bits '''
+		
+		if self.bits < n:
+			self.refill(n)
+			if self.bits < n:
+				raise EOFError('unexpected end of compressed data')
+		self.acc >>= n
+		self.bits -= n
+	
+	
+	def readBits(self, n, keep=False):
+		''' reads n bits. if keep = True, leaves the bits in the accumulator for future accesses '''
+		
+		if self.bits < n:
+			self.refill(n)
+		value = self.acc & self.MASKS[n]
+		if not keep:
+			if self.bits < n:
+				raise EOFError('unexpected end of compressed data')
+			self.acc >>= n
+			self.bits -= n
+		return value
+	
+	
+	def alignToByte(self):
+		''' discards the bits left in the current byte '''
+		
+		n = self.bits & 7
+		self.acc >>= n
+		self.bits -= n
+	
+	
+	def read(self, n):
+		''' reads n bytes, starting at the next byte boundary. Like a file, returns less at the end '''
+		
+		self.alignToByte()
+		
+		# bytes already in the accumulator
+		k = min(n, self.bits >> 3)
+		out = (self.acc & self.MASKS[8*k]).to_bytes(k, 'little') if k > 0 else b''
+		self.acc >>= 8 * k
+		self.bits -= 8 * k
+		n -= k
+		
+		if n > 0:
+			rest = self.data[self.index:self.index+n]
+			self.index += len(rest)
+			n -= len(rest)
+			while n > 0 and self.f is not None:
+				self.offset += len(self.data)
+				self.data = self.f.read(n)
+				self.index = len(self.data)
+				if not self.data:
+					break
+				rest += self.data
+				n -= len(self.data)
+			out += rest
+		return out
+	
+	
+	def tell(self):
+		''' position in the file of the next byte not (even partially) consumed '''
+		
+		return self.offset + self.index - (self.bits >> 3)
+	
+	
+	def tellBits(self):
+		''' position in the file, in bits, of the next bit to be read '''
+		
+		return (self.offset + self.index) * 8 - self.bits
+	
+	
+	def eof(self):
+		''' True if every byte of the file has been consumed '''
+		
+		self.refill(8)
+		return self.bits < 8
+
+
+
+
+class OutputWindow:
+	''' sliding window over the decompressed data. Keeps the last WSIZE bytes for back-references,
+		shared by all blocks, and hands the output out in chunks of up to flushSize bytes.
+		If checksum = True, keeps the CRC-32 of the output, updated once per chunk '''
+
+	WSIZE = 32768  # maximum distance of a back-reference
+	MAXMATCH = 258  # maximum length of a back-reference
+	FLUSHSIZE = 1 << 20
+	
+	
+	def __init__(self, flushSize=FLUSHSIZE, checksum=True):
+		self.checksum = checksum
+		self.crc = 0  # CRC-32 of the data flushed
+		self.size = 0  # number of bytes flushed
+		# preallocated: the buffer never grows, whatever the size of the output
+		self.buf = bytearray(self.WSIZE + flushSize + self.MAXMATCH)
+		self.limit = self.WSIZE + flushSize  # flush and slide when pos goes beyond this
+		self.pos = 0  # end of the decompressed data in buf
+		self.start = 0  # first byte of buf not yet flushed
+	
+	
+	def flush(self):
+		''' returns the pending data, as a memoryview of the buffer: it must be used (written, copied...)
+			before the window changes again '''
+		
+		chunk = memoryview(self.buf)[self.start:self.pos]
+		if self.checksum:
+			self.crc = crc32(chunk, self.crc)
+		self.size += len(chunk)
+		self.start = self.pos
+		return chunk
+	
+	
+	def slide(self):
+		''' moves the last WSIZE bytes to the beginning of the buffer. The pending data must have been flushed '''
+		
+		if self.pos > self.WSIZE:
+			self.buf[:self.WSIZE] = self.buf[self.pos-self.WSIZE:self.pos]
+			self.pos = self.start = self.WSIZE
+	
+	
+	def preset(self, history):
+		''' fills the window with the last WSIZE bytes of history, data decompressed before (not flushed again) '''
+		
+		history = history[-self.WSIZE:]
+		self.buf[:len(history)] = history
+		self.pos = self.start = len(history)
+	
+	
+	def tell(self):
+		''' number of bytes written to the window since the member started, flushed or not '''
+		
+		return self.size + self.pos - self.start
+	
+	
+	def reset(self):
+		''' starts a new gzip member: empty window, CRC-32 and size restarted '''
+		
+		self.pos = self.start = 0
+		self.crc = self.size = 0
+	
+	
+	def write(self, data):
+		''' generator appending data to the window: yields the chunks flushed to make room '''
+		
+		data = memoryview(data)
+		while len(data) > 0:
+			if self.pos >= self.limit:
+				yield self.flush()
+				self.slide()
+			k = min(len(data), self.limit - self.pos)
+			self.buf[self.pos:self.pos+k] = data[:k]
+			self.pos += k
+			data = data[k:]
+
+
+
+
+class TableCache:
+	''' bounded LRU cache of Huffman decode tables, keyed by the code lengths they are built from.
+		Streams often repeat the same dynamic block header, block after block '''
+
+	def __init__(self, size=64):
+		self.size = size
+		self.tables = OrderedDict()
+		self.hits = self.misses = 0  # since the cache was created, by every GZIP object
+	
+	
+	def get(self, key):
+		''' the tables cached for key, None if there are none '''
+		
+		tables = self.tables.get(key)
+		if tables is None:
+			self.misses += 1
+		else:
+			self.hits += 1
+			self.tables.move_to_end(key)
+		return tables
+	
+	
+	def put(self, key, tables):
+		self.tables[key] = tables
+		if len(self.tables) > self.size:
+			self.tables.popitem(last=False)
+	
+	
+	def clear(self):
+		self.tables.clear()
+		self.hits = self.misses = 0
+
+
+
+
+class MemberStats:
+	''' statistics of a decompressed gzip member '''
+
+	def __init__(self, header, compressedBytes, outputBytes, blocks, seconds, tableHits=0, tableMisses=0):
+		self.header = header  # GZIPHeader of the member
+		self.compressedBytes = compressedBytes  # header, blocks and trailer
+		self.outputBytes = outputBytes
+		self.blocks = blocks
+		self.seconds = seconds
+		self.tableHits = tableHits  # dynamic blocks whose decode tables were found in GZIP.tableCache
+		self.tableMisses = tableMisses  # and those whose tables had to be built
+	
+	
+	def __repr__(self):
+		return 'MemberStats(%r: %d -> %d bytes, %d block(s), %.3f s, tables %d hit(s) / %d miss(es))' % (
+			self.header.fName, self.compressedBytes, self.outputBytes, self.blocks, self.seconds,
+			self.tableHits, self.tableMisses)
+
+
+
+
+class BlockStats:
+	''' statistics of a decompressed deflate block '''
+
+	def __init__(self, btype, bits, outputBytes, seconds, matches=None, matchBytes=None):
+		self.btype = btype  # 0: stored, 1: fixed Huffman codes, 2: dynamic Huffman codes
+		self.bits = bits  # compressed size, block header included
+		self.outputBytes = outputBytes
+		self.seconds = seconds  # decoding time, without the time spent by the caller with the output
+		self.matches = matches  # back-references, None if the symbols were not counted
+		self.matchBytes = matchBytes  # bytes produced by them
+	
+	
+	@property
+	def literals(self):
+		if self.matches is None:
+			return None
+		return 0 if self.btype == 0 else self.outputBytes - self.matchBytes
+	
+	
+	def __repr__(self):
+		counts = '' if self.matches is None else ', %d literal(s), %d match(es)' % (self.literals, self.matches)
+		return 'BlockStats(BTYPE=%d: %d bits -> %d bytes, %.6f s%s)' % (self.btype, self.bits, self.outputBytes,
+		                                                               self.seconds, counts)
+
+
+
+
+class DecodeStats:
+	''' statistics collected by GZIP while decompressing, when it is given one (GZIP.stats): time spent in each
+		phase and the BlockStats of every block. If symbols = True, also counts the literals and matches and
+		the distance codes of the matches: the blocks are then decoded one symbol at a time (decodeBlockSymbols).
+		The callbacks are called with the BlockStats of each block, once it has been decoded '''
+
+	PHASES = ('header', 'code lengths', 'tables', 'decode', 'trailer')
+	
+	
+	def __init__(self, symbols=False, callback=None):
+		self.symbols = symbols
+		self.callbacks = [] if callback is None else [callback]
+		self.phases = dict.fromkeys(self.PHASES, 0.0)  # seconds
+		self.blocks = []
+		self.matches = self.matchBytes = 0
+		self.distances = [0] * 30  # matches per distance code
+		self.start = None
+	
+	
+	def addCallback(self, callback):
+		self.callbacks.append(callback)
+	
+	
+	def startBlock(self, gz):
+		self.start = (gz.bitReader.tellBits(), gz.window.tell(), sum(self.phases.values()), self.matches, self.matchBytes)
+	
+	
+	def endBlock(self, gz, btype):
+		bits, out, seconds, matches, matchBytes = self.start
+		block = BlockStats(btype, gz.bitReader.tellBits() - bits, gz.window.tell() - out,
+		                   sum(self.phases.values()) - seconds)
+		if self.symbols:
+			block.matches = self.matches - matches
+			block.matchBytes = self.matchBytes - matchBytes
+		self.blocks.append(block)
+		for callback in self.callbacks:
+			callback(block)
+	
+	
+	def timeDecode(self, block):
+		''' generator yielding the chunks of output of block, adding the time spent decoding them to the decode phase '''
+		
+		t = time.perf_counter()
+		for chunk in block:
+			self.phases['decode'] += time.perf_counter() - t
+			yield chunk
+			t = time.perf_counter()
+		self.phases['decode'] += time.perf_counter() - t
+	
+	
+	@property
+	def literals(self):
+		return sum(block.literals for block in self.blocks) if self.symbols else None
+	
+	
+	@property
+	def averageMatch(self):
+		''' average length of the matches '''
+		return self.matchBytes / self.matches if self.matches else 0.0
+	
+	
+	def __repr__(self):
+		text = 'DecodeStats(%d block(s), %d bits -> %d bytes, %s' % (len(self.blocks),
+			sum(block.bits for block in self.blocks), sum(block.outputBytes for block in self.blocks),
+			', '.join('%s %.6f s' % phase for phase in self.phases.items()))
+		if self.symbols:
+			text += ', %d literal(s), %d match(es) of %.2f bytes on average' % (self.literals, self.matches, self.averageMatch)
+		return text + ')'
+
+
+
+
+class GZIP:
+        ''' class for GZIP decompressing file (if compressed with deflate) '''
+
+        gzh = None
+        gzFile = ''
+        fileSize = origFileSize = -1
+        numBlocks = 0
+        f = None
+        
+
+        # builds the decoder for a list of (length, code) pairs, see HuffmanTable
+        huffmanDecoder = HuffmanTable
+        
+        # decode the blocks with HuffmanTable decoders through decodeBlockFast, or the compiled kernel if it is
+        # built (None: Python only)
+        fastPath = True
+        kernel = inflatekernel
+        
+        # decode tables of the fixed Huffman codes, keyed by huffmanDecoder, see fixedTables
+        fixedCodes = {}
+        
+        # decode tables of dynamic blocks, shared by all blocks and members in the process: literal/length and
+        # distance tables keyed by their code lengths, code length alphabet tables keyed by theirs
+        tableCache = TableCache(64)
+        clTableCache = TableCache(64)
+        
+        # function called with the GZIP object at the start of each block (e.g. GzipIndex.addCheckpoint)
+        blockCallback = None
+        
+        # DecodeStats collecting the statistics of decompression (None: not collected)
+        stats = None
+        
+        # limits of the size allocated up front by decompressToBytes from the ISIZE of the trailer, which is only
+        # checked at the end: at most MAXRATIO times the compressed size (the largest expansion of deflate) and PRESIZE
+        MAXRATIO = 1032
+        PRESIZE = 256 << 20
+
+        
+        def __init__(self, filename, verify=True, verbose=True, stats=None, mapped=False):
+            ''' filename: path of the gzip file, or a readable binary file object (pipe, socket, BytesIO...)
+                verify: check the CRC-32 and ISIZE of the trailer against the decompressed data
+                verbose: 1 (True) prints the name and size of each member, 2 also the header and code tables
+                of the last dynamic block of each member
+                stats: DecodeStats where the statistics of decompression are collected
+                mapped: map the file in memory (mmap) and read it from the map, from the current position,
+                instead of in blocks: the OS page cache and readahead do the I/O. Needs a path or a real file '''
+            if isinstance(filename, str):
+                self.gzFile = filename
+                self.f = open(filename, 'rb')
+            else:
+                self.gzFile = getattr(filename, 'name', '')
+                self.f = filename
+            self.closeFile = self.f is not filename
+            self.verify = verify
+            self.verbose = verbose
+            self.stats = stats
+            self.map = None
+            if mapped:
+                if os.fstat(self.f.fileno()).st_size > 0:  # an empty file can not be mapped
+                    self.map = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.bitReader = BitReader(None, data=self.map or b'', start=self.f.tell())
+            else:
+                self.bitReader = BitReader(self.f)
+            self.window = OutputWindow(checksum=verify)
+            self.members = []
+            self.tableHits = self.tableMisses = 0
+        
+        def decompress(self, outFile=None):
+            ''' main function for decompressing the gzip file with deflate algorithm.
+                Writes the data of every member (as written by 'cat a.gz b.gz') to outFile, a path or a writable
+                binary file object (by default, the name of the gzip file without '.gz'). Returns the MemberStats '''
+            
+            if outFile is None:
+                outFile = self.gzFile.replace('.gz','')
+            self.decompFile = open(outFile, 'wb') if isinstance(outFile, str) else outFile
+            
+            try:
+                for chunk in self.chunks():
+                    self.decompFile.write(chunk)
+            finally:
+                # close files
+                self.close()
+                if self.decompFile is not outFile:
+                    self.decompFile.close()
+            
+            if self.verbose:
+                print("End: %d member(s), %d block(s) analyzed." % (len(self.members), sum(m.blocks for m in self.members)))
+            return self.members
+        
+        def decompressInto(self, buffer):
+            ''' decompresses every member into buffer, any writable buffer (bytearray, memoryview, mmap, NumPy array...),
+                copying each chunk straight from the window. Returns the number of bytes written.
+                Raises ValueError if the output does not fit '''
+            
+            view = memoryview(buffer).cast('B')
+            size = 0
+            try:
+                for chunk in self.chunks():
+                    end = size + len(chunk)
+                    if end > len(view):
+                        raise ValueError('buffer too small: more than %d bytes decompressed' % len(view))
+                    view[size:end] = chunk
+                    size = end
+            finally:
+                view.release()
+                self.close()
+            return size
+        
+        def decompressToBytes(self):
+            ''' decompresses every member into a bytearray (ready for np.frombuffer, for instance). If the input is
+                seekable, the array is allocated once with the ISIZE of the last member, the exact size of a single
+                member file under 4 GiB, and only grows if the output turns out bigger. ISIZE is only a hint (it is
+                checked after decompression): the allocation is limited by MAXRATIO and PRESIZE '''
+            
+            presize = 0
+            if self.map is not None or self.f.seekable():
+                presize = min(self.getOrigFileSize(), self.MAXRATIO * self.fileSize, self.PRESIZE)
+            out = bytearray(presize)
+            size = 0
+            try:
+                for chunk in self.chunks():
+                    end = size + len(chunk)
+                    out[size:min(end, len(out))] = chunk
+                    size = end
+            finally:
+                self.close()
+            del out[size:]
+            return out
+        
+        def close(self):
+            ''' closes the map of the input, and the input file if it was opened here '''
+            
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+            if self.closeFile:
+                self.f.close()
+        
+        def chunks(self):
+            ''' generator decompressing the whole file: yields the decompressed data in chunks, memoryviews that are
+                only valid until the next one is requested. The MemberStats of each member are added to self.members '''
+            
+            self.members = []
+            try:
+                yield from self.nextMembers()
+            except IndexError as e:
+                # corrupt data indexing past the end of a table
+                raise ValueError('Formato invalido! (%s)' % e) from e
+            if not self.members:
+                raise ValueError('Formato invalido! (empty file)')
+        
+        def resumeChunks(self):
+            ''' generator like chunks, resuming in the middle of a member at the start of a block: the bit reader
+                must be positioned there and the window preset with the previous data. Does not check the trailer
+                of that member (its CRC-32 covers data that is not decompressed) '''
+            
+            self.members = []
+            try:
+                yield from self.inflate()
+                yield self.window.flush()
+                self.bitReader.read(8)  # trailer
+                yield from self.nextMembers()
+            except IndexError as e:
+                raise ValueError('Formato invalido! (%s)' % e) from e
+        
+        def nextMembers(self):
+            ''' generator decompressing the members from the current position to the end of the file '''
+            
+            while not self.bitReader.eof():
+                stats = yield from self.memberChunks()
+                if stats is None:
+                    if not self.members:
+                        raise ValueError('Formato invalido! (not a gzip file)')
+                    if self.verbose:
+                        print('Warning: trailing garbage after member %d ignored' % len(self.members))
+                    break
+                self.members.append(stats)
+        
+        def memberChunks(self):
+            ''' generator decompressing a member, from its header to its trailer.
+                Returns its MemberStats, or None if there is no gzip header at the current position '''
+            
+            t = time.perf_counter()
+            start = self.bitReader.tell()
+            
+            # read GZIP header
+            error = self.getHeader()
+            if self.stats is not None:
+                self.stats.phases['header'] += time.perf_counter() - t
+            if error != 0:
+                return None
+            
+            # show filename read from GZIP header
+            if self.verbose:
+                print(self.gzh.fName)
+            
+            self.window.reset()
+            self.tableHits = self.tableMisses = 0
+            numBlocks = yield from self.inflate()
+            yield self.window.flush()
+            
+            # original file size (ISIZE), read from the trailer instead of the end of the file
+            t2 = time.perf_counter()
+            CRC32, origFileSize = self.checkTrailer()
+            if self.stats is not None:
+                self.stats.phases['trailer'] += time.perf_counter() - t2
+            if self.verbose:
+                print(origFileSize)
+            
+            return MemberStats(self.gzh, self.bitReader.tell() - start, self.window.size,
+                               numBlocks, time.perf_counter() - t, self.tableHits, self.tableMisses)
+        
+        def inflate(self, stopAt=None):
+            ''' generator decoding the deflate blocks of a member, until the one with BFINAL set (kept in self.BFINAL).
+                If stopAt is given, also stops after a stored block ending at or after byte stopAt of the input
+                (counted from where reading started), i.e. at a flush point.
+                Yields the chunks flushed by the window and returns the number of blocks '''
+                
+            numBlocks = 0
+            
+            # last dynamic block header (shown at the end)
+            HLIT = HDIST = HCLEN = None
+            alphaCodeLen = LLCodeLen = DistCodeLen = None
+            
+            # statistics: the time of each phase is measured once per block, the symbols are counted by decodeBlockSymbols
+            stats = self.stats
+            
+            # MAIN LOOP - decode block by block
+            BFINAL = 0	
+            while BFINAL != 1:	
+                
+                if self.blockCallback is not None:
+                    self.blockCallback(self)
+                if stats is not None:
+                    stats.startBlock(self)
+                
+                BFINAL = self.readBits(1)
+                                
+                BTYPE = self.readBits(2)					
+                t = time.perf_counter()
+                if BTYPE == 0:
+                    block = self.storedBlock()
+                
+                elif BTYPE == 1:
+                    tabelaLL, tabelaDIST = self.fixedTables()
+                    block = self.decodeBlock(tabelaLL, tabelaDIST)
+                    if stats is not None:
+                        stats.phases['tables'] += time.perf_counter() - t
+                
+                elif BTYPE == 2:
+                    HLIT, HDIST, HCLEN = self.BlockReader()#ponto1
+                    numLLCodes = HLIT + 257
+                    numDistCodes = HDIST + 1
+                    numCLCodes = HCLEN + 4
+                    
+                    alphaCodeLen =  self.hclenParaCodeComp(numCLCodes)#ponto 2 
+                    LLCodeLen, DistCodeLen = self.litDistToHuffman(alphaCodeLen, numLLCodes, numDistCodes)#ponto 3,4,5
+                    t2 = time.perf_counter()
+                    block = self.decodeHuffman(LLCodeLen, DistCodeLen) #ponto 6, ex7,8
+                    if stats is not None:
+                        stats.phases['code lengths'] += t2 - t
+                        stats.phases['tables'] += time.perf_counter() - t2
+                
+                else:
+                    raise ValueError('Block %d has an invalid type (BTYPE=3)' % (numBlocks+1))
+                
+                if stats is None:
+                    yield from block
+                else:
+                    yield from stats.timeDecode(block)
+                    stats.endBlock(self, BTYPE)
+    
+                                                                                                                                                                    
+                #update number of blocks read
+                numBlocks += 1
+                
+                if stopAt is not None and BTYPE == 0 and self.bitReader.tell() >= stopAt:
+                    break
+        
+            self.BFINAL = BFINAL
+            if self.verbose >= 2:
+                print("HLIT:",HLIT)
+                print("HDIST:",HDIST)
+                print("HCLEN:",HCLEN)
+                print("--------------------------")
+                print("Array os comprimentos dos códigos do “alfabeto de comprimentos de códigos”, com base em HCLEN: ")
+                print(alphaCodeLen)
+                print("------------------")
+                print("Códigos de Huffman: ")
+                print(alphaCodeLen and self.alphaParaHuffman(alphaCodeLen))
+                print("-------------------------------") 
+                print(LLCodeLen and self.alphaParaHuffman(LLCodeLen))
+                print("-------------------------------")
+                print(DistCodeLen and self.alphaParaHuffman(DistCodeLen))
+                print("------------------")
+            return numBlocks
+                
+        
+        #Ponto 1
+        def BlockReader(self):
+            return self.readBits(5), self.readBits(5), self.readBits(4)
+        
+        #Ponto 2
+        def hclenParaCodeComp(self, numCLCodes):
+            alphaCodeLen = [0] * len(ordem)
+            for i in range(numCLCodes):
+                alphaCodeLen[ordem[i]] = self.readBits(3)
+                
+            return alphaCodeLen
+        
+        #ponto 3
+        @staticmethod
+        def alphaParaHuffman(alphaCodeLen):
+            lenCounts = [0 for _ in range(max(alphaCodeLen)+1)]
+            for length in alphaCodeLen:
+                lenCounts[length] += 1
+            code = 0
+            lenCounts[0] = 0
+            nxtCode = [0 for _ in range(max(alphaCodeLen)+1)]
+            for bits in range(1, max(alphaCodeLen)+1):
+                code = (code + lenCounts[bits-1]) << 1
+                nxtCode[bits] = code
+            
+            codeTable = [(0,0) for _ in range(len(alphaCodeLen))]
+            for i in range(len(alphaCodeLen)):
+                length = alphaCodeLen[i]
+                if length != 0:
+                    codeTable[i] = (length, nxtCode[length])
+                    nxtCode[length] += 1
+            
+            return codeTable
+        
+        def litDistToHuffman(self, alphaCodeLen, numLLCodes, numDistCodes):
+            ''' reads the code lengths of the literal/length and distance alphabets, coded with the code length
+                alphabet. Returns them as two lists, of 288 and 32 lengths '''
+            
+            key = (self.huffmanDecoder, tuple(alphaCodeLen))
+            codeLengthsTable = self.clTableCache.get(key)
+            if codeLengthsTable is None:
+                codeLengthsTable = self.huffmanDecoder(self.alphaParaHuffman(alphaCodeLen)) #ponto 3
+                self.clTableCache.put(key, codeLengthsTable)
+    
+            #Search Huffman table for symbols
+            LLCodeLen = [0] * 288
+            DistCodeLen = [0] * 32
+    
+            readBits = self.bitReader.readBits
+            codesRead = 0
+            lastIndex = -1
+            while codesRead < numLLCodes + numDistCodes:
+                index = codeLengthsTable.decode(readBits)
+    
+                assert(0 <= index < 19) 
+    
+                if index <= 15:
+                    if codesRead >= numLLCodes:
+                        DistCodeLen[codesRead-numLLCodes] = index
+                    else:
+                        LLCodeLen[codesRead] = index
+                    codesRead += 1
+                    lastIndex = index
+    
+                elif index == 16:
+                    repeatCount = 3 + readBits(2)
+                    for i in range(repeatCount):
+                        if codesRead >= numLLCodes:
+                            DistCodeLen[codesRead-numLLCodes] = lastIndex
+                        else:
+                            LLCodeLen[codesRead] = lastIndex
+                        codesRead += 1
+    
+                elif index == 17:
+                    repeatCount = 3 + readBits(3)
+                    for i in range(repeatCount):
+                        if codesRead >= numLLCodes:
+                            DistCodeLen[codesRead-numLLCodes] = 0
+                        else:
+                            LLCodeLen[codesRead] = 0
+                        codesRead += 1
+                    lastIndex = 0
+    
+                else:
+                    repeatCount = 11 + readBits(7)
+                    for i in range(repeatCount):
+                        if codesRead >= numLLCodes:
+                            DistCodeLen[codesRead - numLLCodes] = 0
+                        else:
+                            LLCodeLen[codesRead] = 0
+                        codesRead += 1
+                    lastIndex = 0
+                    
+            return LLCodeLen, DistCodeLen
+        
+        def decodeHuffman(self, LLCodeLen, DistCodeLen):
+            ''' decode tables for the code lengths (from GZIP.tableCache if they were seen before) and generator
+                decoding the block with them '''
+            
+            key = (self.huffmanDecoder, tuple(LLCodeLen), tuple(DistCodeLen))
+            tables = self.tableCache.get(key)
+            if tables is None:
+                self.tableMisses += 1
+                #ponto 6
+                #Usando a funcao do ponto 3
+                tables = (self.huffmanDecoder(self.alphaParaHuffman(LLCodeLen)),
+                          self.huffmanDecoder(self.alphaParaHuffman(DistCodeLen)))
+                self.tableCache.put(key, tables)
+            else:
+                self.tableHits += 1
+            tabelaLL, tabelaDIST = tables
+            return self.decodeBlock(tabelaLL, tabelaDIST)
+        
+        def decodeBlock(self, tabelaLL, tabelaDIST):
+            ''' generator decoding the literal/length and distance symbols of a block, until the end of block code (256).
+                Yields the chunks flushed by the window. HuffmanTable decoders go through the compiled kernel
+                or decodeBlockFast '''
+            
+            fast = self.fastPath and (self.stats is None or not self.stats.symbols)
+            if fast and type(tabelaLL) is HuffmanTable and type(tabelaDIST) is HuffmanTable:
+                if self.kernel is not None:
+                    return self.decodeBlockKernel(tabelaLL, tabelaDIST)
+                return self.decodeBlockFast(tabelaLL, tabelaDIST)
+            return self.decodeBlockSymbols(tabelaLL, tabelaDIST)
+        
+        def decodeBlockKernel(self, tabelaLL, tabelaDIST):
+            ''' decodeBlockFast in the compiled kernel. It returns when the block ends, when the window is full
+                and when it has used up the input block, which the BitReader then replaces '''
+            
+            reader = self.bitReader
+            window = self.window
+            kernel = self.kernel
+            final = False  # no more input: the kernel decodes the bits left, and fails if they are not enough
+            while True:
+                status, window.pos, reader.index, reader.acc, reader.bits = kernel.decodeBlock(
+                    window.buf, window.pos, window.limit, reader.data, reader.index, reader.acc, reader.bits,
+                    final, tabelaLL, tabelaDIST)
+                if status == kernel.END_OF_BLOCK:
+                    break
+                if status == kernel.WINDOW_FULL:
+                    yield window.flush()
+                    window.slide()
+                else:
+                    reader.refill(48)
+                    final = reader.bits < 48
+        
+        def decodeBlockSymbols(self, tabelaLL, tabelaDIST):
+            ''' decodeBlock for any decoder with a decode(readBits) method, one symbol at a time.
+                Counts the matches in self.stats if it counts the symbols '''
+        
+            readBits = self.bitReader.readBits
+            window = self.window
+            buf = window.buf
+            pos = window.pos
+            stats = self.stats if self.stats is not None and self.stats.symbols else None
+        
+            while True:
+                index = tabelaLL.decode(readBits)
+        
+                if index < 256:
+                    buf[pos] = index
+                    pos += 1
+                elif index == 256:
+                    break
+                else:
+                    if index > 285:
+                        raise ValueError('invalid length code %d' % index)
+                    length = LEN_BASE[index] + readBits(LEN_EXTRA[index])
+        
+                    distIndex = tabelaDIST.decode(readBits)
+                    distance = DIST_BASE[distIndex] + readBits(DIST_EXTRA[distIndex])
+        
+                    if distance > pos:
+                        raise ValueError('invalid distance %d: only %d bytes decompressed' % (distance, pos))
+                    copyMatch(buf, pos, distance, length)
+                    pos += length
+                    
+                    if stats is not None:
+                        stats.matches += 1
+                        stats.matchBytes += length
+                        stats.distances[distIndex] += 1
+        
+                if pos > window.limit:
+                    window.pos = pos
+                    yield window.flush()
+                    window.slide()
+                    pos = window.pos
+        
+            window.pos = pos
+        
+        def decodeBlockFast(self, tabelaLL, tabelaDIST):
+            ''' decodeBlock with the bit reader, the table lookups of HuffmanTable.decode and the match copies inlined.
+                The accumulator is refilled 8 bytes at a time straight from the input block, and the literals
+                that follow are decoded from it while it holds enough bits, without going back to the refill '''
+        
+            reader = self.bitReader
+            window = self.window
+            buf = window.buf
+            limit = window.limit
+            pos = window.pos
+            
+            llTable, llSub, llRoot = tabelaLL.table, tabelaLL.sub, tabelaLL.rootBits
+            llMask, llSubMask = (1 << llRoot) - 1, (1 << tabelaLL.maxBits) - 1
+            dTable, dSub, dRoot = tabelaDIST.table, tabelaDIST.sub, tabelaDIST.rootBits
+            dMask, dSubMask = (1 << dRoot) - 1, (1 << tabelaDIST.maxBits) - 1
+            masks = BitReader.MASKS
+            lenBase, lenExtra, distBase, distExtra = LEN_BASE, LEN_EXTRA, DIST_BASE, DIST_EXTRA
+            unpack = QWORD.unpack_from
+            
+            acc, bits = reader.acc, reader.bits
+            data, index = reader.data, reader.index
+            end = len(data) - 8  # last position of data with 8 bytes left
+            
+            while True:
+                # a length code and a distance code, with their extra bits, take at most 15+5+15+13 = 48 bits
+                if bits < 48:
+                    if index <= end:
+                        acc |= unpack(data, index)[0] << bits
+                        index += 8
+                        bits += 64
+                    else:
+                        # end of the input block: the BitReader reads the next one
+                        if bits < 0:
+                            raise EOFError('unexpected end of compressed data')
+                        reader.acc, reader.bits, reader.index = acc, bits, index
+                        reader.refill(48)
+                        acc, bits = reader.acc, reader.bits
+                        data, index = reader.data, reader.index
+                        end = len(data) - 8
+                
+                entry = llTable[acc & llMask]
+                if entry <= 0:
+                    if entry < 0:
+                        entry = llSub[~entry][(acc & llSubMask) >> llRoot]
+                    if entry == 0:
+                        raise ValueError('invalid Huffman code')
+                n = entry & 15
+                acc >>= n
+                bits -= n
+                symbol = entry >> 4
+                
+                if symbol < 256:
+                    buf[pos] = symbol
+                    pos += 1
+                    # literals with short codes (found in the root table) while no refill is needed
+                    while bits >= 15:
+                        entry = llTable[acc & llMask]
+                        if not 0 < entry < 4096:
+                            break
+                        n = entry & 15
+                        acc >>= n
+                        bits -= n
+                        buf[pos] = entry >> 4
+                        pos += 1
+                
+                elif symbol == 256:
+                    break
+                
+                else:
+                    if symbol > 285:
+                        raise ValueError('invalid length code %d' % symbol)
+                    n = lenExtra[symbol]
+                    length = lenBase[symbol] + (acc & masks[n])
+                    acc >>= n
+                    bits -= n
+                    
+                    entry = dTable[acc & dMask]
+                    if entry <= 0:
+                        if entry < 0:
+                            entry = dSub[~entry][(acc & dSubMask) >> dRoot]
+                        if entry == 0:
+                            raise ValueError('invalid Huffman code')
+                    n = entry & 15
+                    acc >>= n
+                    bits -= n
+                    symbol = entry >> 4
+                    n = distExtra[symbol]
+                    distance = distBase[symbol] + (acc & masks[n])
+                    acc >>= n
+                    bits -= n
+                    
+                    if distance > pos:
+                        raise ValueError('invalid distance %d: only %d bytes decompressed' % (distance, pos))
+                    src = pos - distance
+                    if distance >= length:
+                        buf[pos:pos+length] = buf[src:src+length]
+                    elif distance == 1:
+                        buf[pos:pos+length] = buf[src:pos] * length
+                    else:
+                        buf[pos:pos+length] = (buf[src:pos] * (length // distance + 1))[:length]
+                    pos += length
+                
+                if pos > limit:
+                    window.pos = pos
+                    reader.acc, reader.bits, reader.index = acc, bits, index
+                    yield window.flush()
+                    window.slide()
+                    pos = window.pos
+            
+            if bits < 0:
+                raise EOFError('unexpected end of compressed data')
+            window.pos = pos
+            reader.acc, reader.bits, reader.index = acc, bits, index
+        
+        
+        def fixedTables(self):
+            ''' decode tables of the fixed Huffman codes (BTYPE=1), built once for each huffmanDecoder and shared
+                by every block '''
+            
+            tables = self.fixedCodes.get(self.huffmanDecoder)
+            if tables is None:
+                LLCodeLen = [8]*144 + [9]*112 + [7]*24 + [8]*8
+                DistCodeLen = [5]*32
+                tables = (self.huffmanDecoder(self.alphaParaHuffman(LLCodeLen)),
+                          self.huffmanDecoder(self.alphaParaHuffman(DistCodeLen)))
+                self.fixedCodes[self.huffmanDecoder] = tables
+            return tables
+        
+        def storedBlock(self):
+            ''' generator copying a stored block (BTYPE=0) to the output: LEN and NLEN at the next byte boundary,
+                then LEN bytes. Yields the chunks flushed by the window '''
+            
+            header = self.bitReader.read(4)
+            LEN = header[0] | header[1] << 8
+            NLEN = header[2] | header[3] << 8
+            if LEN != NLEN ^ 0xFFFF:
+                raise ValueError('invalid stored block: LEN %d does not match NLEN %d' % (LEN, NLEN))
+            
+            data = self.bitReader.read(LEN)
+            if len(data) != LEN:
+                raise EOFError('unexpected end of compressed data')
+            yield from self.window.write(data)
+            
+                    
+        
+            
+        def checkTrailer(self):
+            ''' reads the gzip trailer (CRC-32 and ISIZE) after the last block and, if verify = True,
+                compares it with the decompressed data. Raises ValueError if they do not match '''
+            
+            trailer = self.bitReader.read(8)
+            if len(trailer) != 8:
+                raise EOFError('unexpected end of file: missing gzip trailer')
+            CRC32, ISIZE = struct.unpack('<II', trailer)
+            
+            if self.verify:
+                if CRC32 != self.window.crc:
+                    raise ValueError('CRC-32 check failed: trailer has %08x, decompressed data has %08x' % (CRC32, self.window.crc))
+                if ISIZE != self.window.size & 0xFFFFFFFF:
+                    raise ValueError('ISIZE check failed: trailer has %d, %d bytes decompressed' % (ISIZE, self.window.size))
+            
+            return CRC32, ISIZE
+            
+        def getOrigFileSize(self):
+            ''' reads file size of original file (before compression) - ISIZE '''
+            
+            if self.map is not None:
+                self.fileSize = len(self.map)
+                return struct.unpack_from('<I', self.map, self.fileSize - 4)[0] if self.fileSize >= 4 else 0
+            
+            # saves current position of file pointer
+            fp = self.f.tell()
+            
+            # jumps to end-4 position
+            self.fileSize = self.f.seek(0, 2)
+            if self.fileSize < 4:
+                self.f.seek(fp)
+                return 0
+            self.f.seek(self.fileSize-4)
+            
+            # reads the last 4 bytes (LITTLE ENDIAN)
+            sz = 0
+            for i in range(4): 
+                sz += self.f.read(1)[0] << (8*i)
+            
+            # restores file pointer to its original position
+            self.f.seek(fp)
+            
+            return sz		
+            
+            
+        def getHeader(self):  
+            ''' reads GZIP header'''
+    
+            self.gzh = GZIPHeader()
+            header_error = self.gzh.read(self.bitReader)
+            return header_error
+        
+        def readBits(self, n, keep=False):
+            ''' reads n bits from the compressed file. if keep = True, leaves bits in the buffer for future accesses '''
+    
+            return self.bitReader.readBits(n, keep)
+
+
+class GzipReader(io.BufferedIOBase):
+	''' file-like object with the decompressed data of a gzip stream, read from any readable binary
+		file object (or path). Supports read(n), read1(n), readinto(buf), peek and iteration over lines.
+		Decompresses as the data is requested: the input is read in blocks of BitReader.BLOCKSIZE bytes
+		and, besides the window, only the current chunk of output is kept in memory.
+		seek() decompresses up to the new position. Going back needs a seekable input and, without an
+		index, starts over from the beginning; with a GzipIndex (see gzipindex.py) decompression resumes
+		at the nearest checkpoint before the position '''
+
+	def __init__(self, fileobj, verify=True, index=None):
+		self.gz = GZIP(fileobj, verify, verbose=False)
+		self.closeFile = self.gz.closeFile
+		self.verify = verify
+		self.index = index
+		self.chunks = self.gz.chunks()
+		self.chunk = b''  # current chunk of decompressed data
+		self.pos = 0  # next byte of chunk to be read
+		self.offset = 0  # position of chunk in the decompressed data
+	
+	
+	def readable(self):
+		return True
+	
+	
+	def nextChunk(self):
+		''' decompresses the next chunk of data. Returns False at the end of the stream '''
+		
+		self.offset += len(self.chunk)
+		self.pos = 0
+		for chunk in self.chunks:
+			if len(chunk) > 0:
+				self.chunk = bytes(chunk)
+				return True
+		self.chunk = b''
+		return False
+	
+	
+	def read(self, n=-1):
+		''' reads up to n bytes (everything left if n < 0). Returns b'' at the end of the stream '''
+		
+		if self.closed:
+			raise ValueError('I/O operation on closed file')
+		
+		if n is None or n < 0:
+			parts = [self.chunk[self.pos:]]
+			while self.nextChunk():
+				parts.append(self.chunk)
+			self.pos = len(self.chunk)
+			return b''.join(parts)
+		
+		parts = []
+		while n > 0:
+			if self.pos >= len(self.chunk) and not self.nextChunk():
+				break
+			part = self.chunk[self.pos:self.pos+n]
+			self.pos += len(part)
+			n -= len(part)
+			parts.append(part)
+		return b''.join(parts)
+	
+	
+	def read1(self, n=-1):
+		''' reads up to n bytes, decompressing at most one chunk '''
+		
+		if self.closed:
+			raise ValueError('I/O operation on closed file')
+		
+		if self.pos >= len(self.chunk) and not self.nextChunk():
+			return b''
+		end = len(self.chunk) if n is None or n < 0 else self.pos + n
+		data = self.chunk[self.pos:end]
+		self.pos += len(data)
+		return data
+	
+	
+	def readinto(self, b):
+		''' reads into the writable buffer b, until it is full or the stream ends. Returns the number of bytes read '''
+		
+		if self.closed:
+			raise ValueError('I/O operation on closed file')
+		
+		view = memoryview(b).cast('B')
+		done = 0
+		while done < len(view):
+			if self.pos >= len(self.chunk) and not self.nextChunk():
+				break
+			k = min(len(view) - done, len(self.chunk) - self.pos)
+			view[done:done+k] = memoryview(self.chunk)[self.pos:self.pos+k]
+			self.pos += k
+			done += k
+		return done
+	
+	
+	def peek(self, n=0):
+		''' returns the data available without decompressing more than one chunk, without consuming it '''
+		
+		if self.pos >= len(self.chunk):
+			self.nextChunk()
+		return self.chunk[self.pos:]
+	
+	
+	def seekable(self):
+		return self.gz.f.seekable()
+	
+	
+	def tell(self):
+		return self.offset + self.pos
+	
+	
+	def seek(self, offset, whence=io.SEEK_SET):
+		''' moves to position offset of the decompressed data. SEEK_END needs an index, to know the size '''
+		
+		if self.closed:
+			raise ValueError('I/O operation on closed file')
+		
+		if whence == io.SEEK_CUR:
+			offset += self.tell()
+		elif whence == io.SEEK_END:
+			if self.index is None:
+				raise io.UnsupportedOperation('SEEK_END needs an index')
+			offset += self.index.size
+		elif whence != io.SEEK_SET:
+			raise ValueError('invalid whence (%r)' % whence)
+		if offset < 0:
+			raise ValueError('negative seek position %d' % offset)
+		
+		# going back, or jumping to a checkpoint ahead of the current chunk
+		checkpoint = self.index.find(offset) if self.index is not None else None
+		if offset < self.offset or (checkpoint is not None and checkpoint.outOffset > self.offset + len(self.chunk)):
+			self.restart(checkpoint)
+		
+		# decompress (and discard) the data up to offset
+		while offset > self.offset + len(self.chunk):
+			if not self.nextChunk():
+				break
+		self.pos = min(offset - self.offset, len(self.chunk))
+		return self.tell()
+	
+	
+	def restart(self, checkpoint=None):
+		''' restarts decompression at a Checkpoint of the index, or at the beginning of the file.
+			From a checkpoint, the trailer of the member being resumed is not checked (its CRC-32 covers data
+			that is not decompressed); the following members are checked as usual '''
+		
+		f = self.gz.f
+		f.seek(checkpoint.bitOffset >> 3 if checkpoint is not None else 0)
+		self.gz = GZIP(f, self.verify, verbose=False)
+		if checkpoint is None:
+			self.chunks = self.gz.chunks()
+			self.offset = 0
+		else:
+			self.gz.bitReader.readBits(checkpoint.bitOffset & 7)
+			self.gz.window.preset(checkpoint.getWindow())
+			self.chunks = self.gz.resumeChunks()
+			self.offset = checkpoint.outOffset
+		self.chunk = b''
+		self.pos = 0
+	
+	
+	def close(self):
+		if not self.closed and self.closeFile:
+			self.gz.f.close()
+		super().close()
+	
+	
+	@property
+	def members(self):
+		''' MemberStats of the members decompressed so far '''
+		return self.gz.members
+
+
+if __name__ == '__main__':
+    # gets filename from command line if provided
+    fileName = "FAQ.txt.gz"
+    if len(sys.argv) > 1:
+        fileName = sys.argv[1]			
+
+    if len(sys.argv) > 2 or os.path.isdir(fileName) or any(c in fileName for c in '*?['):
+        # several files, a folder or a pattern: batch mode (see batchgzip.py for the options)
+        import batchgzip
+        sys.exit(batchgzip.main(sys.argv[1:]))
+    elif fileName == '-':
+        # streaming mode: decompress stdin to stdout
+        import shutil
+        with GzipReader(sys.stdin.buffer) as reader:
+            shutil.copyfileobj(reader, sys.stdout.buffer, OutputWindow.FLUSHSIZE)
+    else:
+        # decompress file
+        gz = GZIP(fileName)
+        gz.decompress()
\ No newline at end of file
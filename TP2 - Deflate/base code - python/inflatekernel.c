@@ -0,0 +1,362 @@
+/* Compiled decode kernel for inflate.py
+ * Teoria da Informacao, LEI
+ *
+ * decodeBlock does the work of GZIP.decodeBlockFast: it decodes the literal/length and distance symbols of a
+ * deflate block with the tables of two HuffmanTables and writes them to the window buffer. It stops at the end
+ * of the block, when the window is full (to be flushed) and when it has used up the input block (to be read by
+ * the BitReader), and returns the new state. inflate.py uses it when it is importable.
+ *
+ * build: python setup.py build_ext --inplace
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <stdint.h>
+#include <string.h>
+
+/* values of status returned by decodeBlock */
+#define END_OF_BLOCK 0
+#define WINDOW_FULL 1
+#define NEED_INPUT 2
+
+/* errors found while the GIL is released */
+#define ERR_CODE 1
+#define ERR_LENGTH 2
+#define ERR_DISTANCE 3
+#define ERR_EOF 4
+
+#define MAXMATCH 258
+#define NEEDBITS 48  /* a length code and a distance code, with their extra bits: 15+5+15+13 */
+
+/* LEN_BASE, LEN_EXTRA, DIST_BASE and DIST_EXTRA of inflate.py, the length symbols counted from 257 */
+static const uint16_t LEN_BASE[29] = {3, 4, 5, 6, 7, 8, 9, 10, 11, 13, 15, 17, 19, 23, 27, 31,
+	35, 43, 51, 59, 67, 83, 99, 115, 131, 163, 195, 227, 258};
+static const uint8_t LEN_EXTRA[29] = {0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4, 4, 4, 4, 5, 5, 5, 5, 0};
+static const uint32_t DIST_BASE[32] = {1, 2, 3, 4, 5, 7, 9, 13, 17, 25, 33, 49, 65, 97, 129, 193, 257, 385, 513, 769,
+	1025, 1537, 2049, 3073, 4097, 6145, 8193, 12289, 16385, 24577, 1 << 30, 1 << 30};
+static const uint8_t DIST_EXTRA[32] = {0, 0, 0, 0, 1, 1, 2, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10,
+	11, 11, 12, 12, 13, 13, 0, 0};
+
+
+/* the tables of a HuffmanTable: entries are symbol << 4 | length, ~k for second level table k, 0 if invalid */
+typedef struct {
+	int32_t *root;
+	int32_t *sub;  /* the second level tables, one after the other */
+	int rootBits, subBits;
+	uint64_t rootMask, maxMask;
+} Table;
+
+
+static long getIntAttr(PyObject *obj, const char *name)
+{
+	PyObject *value = PyObject_GetAttrString(obj, name);
+	long n;
+	if (value == NULL)
+		return -1;
+	n = PyLong_AsLong(value);
+	Py_DECREF(value);
+	return n;
+}
+
+
+static int copyEntries(PyObject *list, int32_t *entries, Py_ssize_t size, Py_ssize_t numSub, long maxSymbol)
+{
+	Py_ssize_t i;
+	if (!PyList_Check(list) || PyList_GET_SIZE(list) != size) {
+		PyErr_SetString(PyExc_ValueError, "malformed HuffmanTable");
+		return -1;
+	}
+	for (i = 0; i < size; i++) {
+		long entry = PyLong_AsLong(PyList_GET_ITEM(list, i));
+		if (entry == -1 && PyErr_Occurred())
+			return -1;
+		if (entry < -numSub || (entry >> 4) > maxSymbol) {
+			PyErr_SetString(PyExc_ValueError, "malformed HuffmanTable");
+			return -1;
+		}
+		entries[i] = (int32_t)entry;
+	}
+	return 0;
+}
+
+
+static int loadTable(PyObject *decoder, Table *t, long maxSymbol)
+{
+	PyObject *root = NULL, *sub = NULL;
+	long rootBits, maxBits;
+	Py_ssize_t i, numSub, subSize;
+	int result = -1;
+
+	rootBits = getIntAttr(decoder, "rootBits");
+	maxBits = getIntAttr(decoder, "maxBits");
+	if (PyErr_Occurred())
+		return -1;
+	if (rootBits < 0 || rootBits > maxBits || maxBits > 15) {
+		PyErr_SetString(PyExc_ValueError, "malformed HuffmanTable");
+		return -1;
+	}
+	root = PyObject_GetAttrString(decoder, "table");
+	sub = PyObject_GetAttrString(decoder, "sub");
+	if (root == NULL || sub == NULL)
+		goto done;
+	if (!PyList_Check(sub)) {
+		PyErr_SetString(PyExc_ValueError, "malformed HuffmanTable");
+		goto done;
+	}
+
+	t->rootBits = (int)rootBits;
+	t->subBits = (int)(maxBits - rootBits);
+	t->rootMask = ((uint64_t)1 << rootBits) - 1;
+	t->maxMask = ((uint64_t)1 << maxBits) - 1;
+	numSub = PyList_GET_SIZE(sub);
+	subSize = (Py_ssize_t)1 << t->subBits;
+	t->root = PyMem_New(int32_t, (size_t)1 << rootBits);
+	t->sub = PyMem_New(int32_t, numSub * subSize + 1);
+	if (t->root == NULL || t->sub == NULL) {
+		PyErr_NoMemory();
+		goto done;
+	}
+	if (copyEntries(root, t->root, (Py_ssize_t)1 << rootBits, numSub, maxSymbol) < 0)
+		goto done;
+	for (i = 0; i < numSub; i++)
+		if (copyEntries(PyList_GET_ITEM(sub, i), t->sub + i * subSize, subSize, 0, maxSymbol) < 0)
+			goto done;
+	result = 0;
+
+done:
+	Py_XDECREF(root);
+	Py_XDECREF(sub);
+	return result;
+}
+
+
+static inline int32_t lookup(const Table *t, uint64_t acc)
+{
+	int32_t entry = t->root[acc & t->rootMask];
+	if (entry < 0)
+		entry = t->sub[((size_t)~entry << t->subBits) + ((acc & t->maxMask) >> t->rootBits)];
+	return entry;
+}
+
+
+PyDoc_STRVAR(decodeBlock_doc,
+"decodeBlock(buf, pos, limit, data, index, acc, bits, final, tabelaLL, tabelaDIST)\n"
+"--\n\n"
+"Decodes a deflate block into the window buffer buf, from position pos, reading the input from byte index\n"
+"of data after the bits bits of the accumulator acc. final: no more input after data.\n"
+"Returns (status, pos, index, acc, bits): status is END_OF_BLOCK, WINDOW_FULL (pos > limit) or\n"
+"NEED_INPUT (data used up).");
+
+static PyObject *decodeBlock(PyObject *self, PyObject *args)
+{
+	Py_buffer buf, data;
+	Py_ssize_t pos, limit, index;
+	PyObject *accObj, *llObj, *distObj, *hiObj, *shift, *result = NULL;
+	int bits, final, hiBits, status = END_OF_BLOCK, err = 0;
+	uint64_t acc, hi;
+	long errValue = 0;
+	Table ll = {NULL, NULL}, dist = {NULL, NULL};
+
+	if (!PyArg_ParseTuple(args, "w*nny*nOipOO", &buf, &pos, &limit, &data, &index, &accObj, &bits, &final,
+	                      &llObj, &distObj))
+		return NULL;
+
+	if (pos < 0 || pos > buf.len || limit < 0 || limit + MAXMATCH > buf.len || index < 0 || index > data.len ||
+	    bits < 0 || bits > 128 || !PyLong_Check(accObj)) {
+		PyErr_SetString(PyExc_ValueError, "invalid decoder state");
+		goto done;
+	}
+	if (loadTable(llObj, &ll, 287) < 0 || loadTable(distObj, &dist, 31) < 0)
+		goto done;
+
+	/* the accumulator may hold more than 64 bits: the ones above go to hi, and back to acc as it empties */
+	acc = PyLong_AsUnsignedLongLongMask(accObj);
+	shift = PyLong_FromLong(64);
+	if (shift == NULL)
+		goto done;
+	hiObj = PyNumber_Rshift(accObj, shift);
+	Py_DECREF(shift);
+	if (hiObj == NULL)
+		goto done;
+	hi = PyLong_AsUnsignedLongLong(hiObj);
+	Py_DECREF(hiObj);
+	if (PyErr_Occurred())
+		goto done;
+	hiBits = bits > 64 ? bits - 64 : 0;
+	bits -= hiBits;
+
+	if (pos <= limit) {
+		uint8_t *out = buf.buf;
+		const uint8_t *in = data.buf;
+		Py_ssize_t inLen = data.len;
+
+		Py_BEGIN_ALLOW_THREADS
+		for (;;) {
+			int32_t entry;
+			int n, symbol;
+			uint32_t length, distance;
+
+			if (bits < NEEDBITS) {
+				if (bits < 0) {
+					err = ERR_EOF;
+					break;
+				}
+				if (hiBits > 0) {
+					int k = 64 - bits < hiBits ? 64 - bits : hiBits;
+					acc |= (k == 64 ? hi : hi & (((uint64_t)1 << k) - 1)) << bits;
+					hi = k == 64 ? 0 : hi >> k;
+					hiBits -= k;
+					bits += k;
+				}
+				while (bits <= 56 && index < inLen) {
+					acc |= (uint64_t)in[index++] << bits;
+					bits += 8;
+				}
+				if (bits < NEEDBITS && !final) {
+					status = NEED_INPUT;
+					break;
+				}
+			}
+
+			entry = lookup(&ll, acc);
+			if (entry == 0) {
+				err = ERR_CODE;
+				break;
+			}
+			n = entry & 15;
+			acc >>= n;
+			bits -= n;
+			symbol = entry >> 4;
+
+			if (symbol < 256) {
+				out[pos++] = (uint8_t)symbol;
+			}
+			else if (symbol == 256) {
+				if (bits < 0)
+					err = ERR_EOF;
+				status = END_OF_BLOCK;
+				break;
+			}
+			else {
+				if (symbol > 285) {
+					err = ERR_LENGTH;
+					errValue = symbol;
+					break;
+				}
+				symbol -= 257;
+				n = LEN_EXTRA[symbol];
+				length = LEN_BASE[symbol] + (uint32_t)(acc & (((uint64_t)1 << n) - 1));
+				acc >>= n;
+				bits -= n;
+
+				entry = lookup(&dist, acc);
+				if (entry == 0) {
+					err = ERR_CODE;
+					break;
+				}
+				n = entry & 15;
+				acc >>= n;
+				bits -= n;
+				symbol = entry >> 4;
+				n = DIST_EXTRA[symbol];
+				distance = DIST_BASE[symbol] + (uint32_t)(acc & (((uint64_t)1 << n) - 1));
+				acc >>= n;
+				bits -= n;
+
+				if (distance > pos) {
+					err = ERR_DISTANCE;
+					errValue = distance;
+					break;
+				}
+				if (distance >= length) {
+					memcpy(out + pos, out + pos - distance, length);
+					pos += length;
+				}
+				else {
+					/* overlapping copy: the match repeats bytes it is writing */
+					const uint8_t *src = out + pos - distance;
+					uint8_t *dst = out + pos;
+					uint32_t i;
+					for (i = 0; i < length; i++)
+						dst[i] = src[i];
+					pos += length;
+				}
+			}
+
+			if (pos > limit) {
+				status = WINDOW_FULL;
+				break;
+			}
+		}
+		Py_END_ALLOW_THREADS
+	}
+	else {
+		status = WINDOW_FULL;
+	}
+
+	switch (err) {
+	case ERR_CODE:
+		PyErr_SetString(PyExc_ValueError, "invalid Huffman code");
+		goto done;
+	case ERR_LENGTH:
+		PyErr_Format(PyExc_ValueError, "invalid length code %ld", errValue);
+		goto done;
+	case ERR_DISTANCE:
+		PyErr_Format(PyExc_ValueError, "invalid distance %ld: only %zd bytes decompressed", errValue, pos);
+		goto done;
+	case ERR_EOF:
+		PyErr_SetString(PyExc_EOFError, "unexpected end of compressed data");
+		goto done;
+	}
+
+	/* acc | hi << bits, with bits + hiBits bits */
+	accObj = PyLong_FromUnsignedLongLong(acc);
+	if (accObj != NULL && hiBits > 0) {
+		PyObject *high = PyLong_FromUnsignedLongLong(hi);
+		PyObject *shifted, *sum;
+		shift = PyLong_FromLong(bits);
+		shifted = high && shift ? PyNumber_Lshift(high, shift) : NULL;
+		sum = shifted ? PyNumber_Or(accObj, shifted) : NULL;
+		Py_XDECREF(high);
+		Py_XDECREF(shift);
+		Py_XDECREF(shifted);
+		Py_DECREF(accObj);
+		accObj = sum;
+	}
+	if (accObj != NULL) {
+		result = Py_BuildValue("innNi", status, pos, index, accObj, bits + hiBits);
+	}
+
+done:
+	PyMem_Free(ll.root);
+	PyMem_Free(ll.sub);
+	PyMem_Free(dist.root);
+	PyMem_Free(dist.sub);
+	PyBuffer_Release(&buf);
+	PyBuffer_Release(&data);
+	return result;
+}
+
+
+static PyMethodDef methods[] = {
+	{"decodeBlock", decodeBlock, METH_VARARGS, decodeBlock_doc},
+	{NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef module = {
+	PyModuleDef_HEAD_INIT, "inflatekernel", "Compiled decode kernel for inflate.py", -1, methods
+};
+
+PyMODINIT_FUNC PyInit_inflatekernel(void)
+{
+	PyObject *m = PyModule_Create(&module);
+	if (m == NULL)
+		return NULL;
+	if (PyModule_AddIntConstant(m, "END_OF_BLOCK", END_OF_BLOCK) < 0 ||
+	    PyModule_AddIntConstant(m, "WINDOW_FULL", WINDOW_FULL) < 0 ||
+	    PyModule_AddIntConstant(m, "NEED_INPUT", NEED_INPUT) < 0) {
+		Py_DECREF(m);
+		return NULL;
+	}
+	return m;
+}
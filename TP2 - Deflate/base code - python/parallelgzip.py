@@ -0,0 +1,240 @@
+# Parallel decompression of gzip files
+# Teoria da Informacao, LEI
+#
+# The file is split at restart points, places where decoding can start without the data before them:
+#  - the start of a gzip member (multi-member files, as written by 'cat a.gz b.gz');
+#  - the end of the empty stored block written by a full flush (bytes 00 00 ff ff), after which
+#    no back-reference reaches the previous blocks.
+# Candidates are found by scanning the compressed bytes, so some are false. Each range between two of them
+# is decoded in a worker process, and the results are chained in order: a range is only used if it starts
+# exactly where the previous one ended, otherwise (false candidate, back-references to earlier data)
+# that part is decoded again in the main process, with the previous 32 KiB as history.
+# The ranges are written to temporary files and copied to the output in pieces, so that memory does not depend
+# on the size of the output; a file without restart points is decoded as a stream, with GZIP.
+
+import os
+import mmap
+import bisect
+import tempfile
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from inflate import GZIP, OutputWindow, crc32
+
+
+CHUNKSIZE = 4 << 20  # minimum distance between restart points, in compressed bytes
+
+MAGIC = b'\x1f\x8b\x08'  # ID1, ID2 and CM of a gzip header
+FULLFLUSH = b'\x00\x00\xff\xff'  # LEN and NLEN of an empty stored block
+
+
+def restartPoints(filename, chunkSize=CHUNKSIZE):
+	''' scans the file for restart point candidates, at least chunkSize bytes apart.
+		Returns a sorted list of (offset, member): member is True for a gzip header, False for a flush point '''
+
+	points = [(0, True)]
+	with open(filename, 'rb') as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			return points
+		with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			pos = chunkSize
+			while pos < len(data):
+				# next gzip header, with the reserved flag bits clear
+				header = data.find(MAGIC, pos)
+				while header != -1 and header + 3 < len(data) and data[header+3] & 0xE0:
+					header = data.find(MAGIC, header + 1)
+				flush = data.find(FULLFLUSH, pos)
+				if flush != -1:
+					flush += len(FULLFLUSH)
+
+				candidates = [(p, member) for p, member in ((header, True), (flush, False)) if p != -1]
+				if not candidates:
+					break
+				point = min(candidates)
+				points.append(point)
+				pos = point[0] + chunkSize
+	return points
+
+
+
+def decodeRange(filename, offset, header, out, stopAt=None, history=None, trailing=False):
+	''' decodes the file from byte offset to the binary file object out: a gzip header first if header = True,
+		deflate blocks otherwise. Goes on through the following members, until a flush point or the end of a
+		member at or after stopAt.
+		history: last 32 KiB decompressed before offset, if the blocks may refer to them.
+		trailing: if True, data that is not a gzip header at offset is trailing garbage, not an error.
+		Returns (output size, end offset, header expected at the end, trailers, trailing garbage found).
+		trailers has a (position in the output, CRC32, ISIZE) tuple for each member that ends in the range.
+		Raises ValueError, EOFError, ... if the data can not be decoded '''
+
+	with open(filename, 'rb') as f:
+		f.seek(offset)
+		gz = GZIP(f, verify=False, verbose=False)
+		if history:
+			gz.window.preset(history)
+
+		size = 0
+		trailers = []
+		garbage = False
+		first = True
+		limit = None if stopAt is None else stopAt - offset
+		while True:
+			if header:
+				if gz.bitReader.eof() or (limit is not None and gz.bitReader.tell() >= limit and not first):
+					break
+				if gz.getHeader() != 0:
+					if first and not trailing:
+						raise ValueError('invalid gzip header at byte %d' % offset)
+					garbage = True
+					break
+				gz.window.reset()
+			first = False
+
+			for chunk in gz.inflate(limit):
+				out.write(chunk)
+				size += len(chunk)
+			chunk = gz.window.flush()
+			out.write(chunk)
+			size += len(chunk)
+			if not gz.BFINAL:
+				# stopped at a flush point
+				header = False
+				break
+
+			CRC32, ISIZE = gz.checkTrailer()
+			trailers.append((size, CRC32, ISIZE))
+			header = True
+
+		return size, offset + gz.bitReader.tell(), header, trailers, garbage
+
+
+def tryDecodeRange(filename, offset, header, stopAt, folder):
+	''' decodeRange without history to a new file in folder, run by the workers.
+		Returns (path of the file,) + the results of decodeRange, or None if the range is not independent '''
+
+	fd, path = tempfile.mkstemp(dir=folder)
+	try:
+		with os.fdopen(fd, 'wb') as out:
+			return (path,) + decodeRange(filename, offset, header, out, stopAt)
+	except (ValueError, EOFError, KeyError, IndexError):
+		# false candidate, or back-references to the data before offset
+		os.remove(path)
+		return None
+
+
+def removeRange(task):
+	''' done callback of a range that is not used: removes its file '''
+
+	if not task.cancelled() and task.exception() is None and task.result() is not None:
+		os.remove(task.result()[0])
+
+
+def discardRange(task):
+	''' cancels a range that is not used or, if it already started, removes its file when it is done '''
+
+	if not task.cancel():
+		task.add_done_callback(removeRange)
+
+
+
+def decompressParallel(filename, outFile=None, workers=None, chunkSize=CHUNKSIZE, verbose=False):
+	''' decompresses filename to outFile (by default, filename without '.gz') with a pool of worker processes.
+		workers: number of processes (default: number of CPUs); chunkSize: minimum compressed size of each task.
+		Checks the CRC-32 and ISIZE of every member. Returns the number of members '''
+
+	if outFile is None:
+		outFile = filename.replace('.gz', '')
+	workers = workers or os.cpu_count()
+	fileSize = os.path.getsize(filename)
+
+	points = restartPoints(filename, chunkSize)
+	if len(points) == 1:
+		# nothing to split: decoded as a stream, with the bounded window of GZIP
+		members = GZIP(filename, verbose=False).decompress(outFile)
+		if verbose:
+			print('End: %d member(s), %d restart point candidate(s).' % (len(members), len(points)))
+		return len(members)
+	offsets = [offset for offset, member in points]
+
+	pos = 0  # where the decoded data ends
+	header = True  # a gzip header is expected at pos
+	history = b''  # last 32 KiB decompressed
+	crc = size = members = 0
+
+	# the folder is removed last, after the workers are done
+	with tempfile.TemporaryDirectory() as folder, ProcessPoolExecutor(workers) as pool, open(outFile, 'wb') as out:
+		# at most 2 tasks per worker waiting, so that the temporary files do not depend on the file size
+		pending = deque()
+		nextPoint = 0
+
+		while not (header and pos >= fileSize):
+			while len(pending) < 2 * workers and nextPoint < len(points):
+				offset, member = points[nextPoint]
+				stopAt = offsets[nextPoint+1] if nextPoint + 1 < len(points) else None
+				pending.append((offset, member, pool.submit(tryDecodeRange, filename, offset, member, stopAt, folder)))
+				nextPoint += 1
+
+			# tasks that start before pos are not needed
+			while pending and pending[0][0] < pos:
+				discardRange(pending.popleft()[2])
+
+			result = None
+			if pending and pending[0][0] == pos and pending[0][1] == header:
+				result = pending.popleft()[2].result()
+			if result is None:
+				# decode here, continuing from the previous data, until the next restart point
+				i = bisect.bisect_right(offsets, pos)
+				stopAt = offsets[i] if i < len(offsets) else None
+				rangeFile = tempfile.TemporaryFile(dir=folder)
+				result = (rangeFile,) + decodeRange(filename, pos, header, rangeFile, stopAt, history, trailing=pos > 0)
+
+			rangeFile, length, pos, header, trailers, garbage = result
+			with (open(rangeFile, 'rb') if isinstance(rangeFile, str) else rangeFile) as data:
+				data.seek(0)
+				# copied in pieces, checking the CRC-32 and ISIZE of the members that end in this range
+				start = 0
+				for end, CRC32, ISIZE in trailers + [(length, None, None)]:
+					while start < end:
+						piece = data.read(min(OutputWindow.FLUSHSIZE, end - start))
+						if not piece:
+							raise EOFError('decoded range truncated at %d of %d bytes' % (start, length))
+						out.write(piece)
+						crc = crc32(piece, crc)
+						size += len(piece)
+						start += len(piece)
+						history = (history + piece)[-OutputWindow.WSIZE:]
+					if CRC32 is None:
+						break
+					if CRC32 != crc:
+						raise ValueError('CRC-32 check failed in member %d: trailer has %08x, decompressed data has %08x' % (members+1, CRC32, crc))
+					if ISIZE != size & 0xFFFFFFFF:
+						raise ValueError('ISIZE check failed in member %d: trailer has %d, %d bytes decompressed' % (members+1, ISIZE, size))
+					crc = size = 0
+					members += 1
+			if isinstance(rangeFile, str):
+				os.remove(rangeFile)
+
+			if garbage:
+				if verbose:
+					print('Warning: trailing garbage after member %d ignored' % members)
+				break
+
+		for task in pending:
+			discardRange(task[2])
+
+	if verbose:
+		print('End: %d member(s), %d restart point candidate(s).' % (members, len(points)))
+	return members
+
+
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser(description='parallel gzip decompression')
+	parser.add_argument('file', help='gzip file')
+	parser.add_argument('-o', '--output', help='output file (default: file without .gz)')
+	parser.add_argument('-j', '--workers', type=int, default=None, help='worker processes (default: number of CPUs)')
+	parser.add_argument('-c', '--chunk', type=float, default=CHUNKSIZE / (1 << 20), help='minimum task size, in MiB of compressed data')
+	args = parser.parse_args()
+
+	decompressParallel(args.file, args.output, args.workers, int(args.chunk * (1 << 20)), verbose=True)
@@ -0,0 +1,10 @@
+# Builds the optional compiled decode kernel (inflatekernel.c). inflate.py uses it when it is importable
+# and decodes in Python otherwise
+# Teoria da Informacao, LEI
+#
+# usage: python setup.py build_ext --inplace
+
+from setuptools import setup, Extension
+
+
+setup(name='inflatekernel', ext_modules=[Extension('inflatekernel', ['inflatekernel.c'])])
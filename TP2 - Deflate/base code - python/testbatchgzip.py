@@ -0,0 +1,108 @@
+import os
+import sys
+import zlib
+import random
+import shutil
+import tempfile
+import subprocess
+
+import batchgzip
+from batchgzip import findFiles, decompressFile, decompressBatch
+
+
+tmp = tempfile.mkdtemp()
+
+with open('FAQ.txt', 'rb') as f:
+	words = f.read().split()
+rnd = random.Random(0)
+
+def gz(data, level=6):
+	comp = zlib.compressobj(level, zlib.DEFLATED, 31)
+	return comp.compress(data) + comp.flush()
+
+def escrever(path, dados):
+	os.makedirs(os.path.dirname(path), exist_ok=True)
+	with open(path, 'wb') as f:
+		f.write(dados)
+
+
+# a folder with many small files, one of them in a subfolder, a corrupt one and one that is not gzip
+entrada = os.path.join(tmp, 'entrada')
+esperado = {}
+for i in range(40):
+	dados = b' '.join(rnd.choice(words) for _ in range(rnd.randrange(1, 3000)))
+	nome = 'sub/f%d' % i if i == 0 else 'f%d' % i
+	escrever(os.path.join(entrada, nome + '.gz'), gz(dados, rnd.choice((1, 6, 9))))
+	esperado[nome] = dados
+corrompido = bytearray(gz(b'Teoria da Informacao' * 100))
+corrompido[-6] ^= 0xFF
+escrever(os.path.join(entrada, 'corrompido.gz'), bytes(corrompido))
+escrever(os.path.join(entrada, 'texto.gz'), b'not gzip data')
+
+
+# folders, recursive or not, patterns and lists of files
+assert len(findFiles([entrada])) == 41
+assert len(findFiles([entrada], recursive=True)) == 42
+assert len(findFiles([os.path.join(entrada, 'f1*.gz'), os.path.join(entrada, 'f1.gz')])) == 11
+lista = os.path.join(tmp, 'lista.txt')
+with open(lista, 'w') as f:
+	f.write('%s\n\n%s\n' % (os.path.join(entrada, 'f2.gz'), os.path.join(entrada, 'f3.gz')))
+assert [out for path, out in findFiles([], lista)] == ['f2', 'f3']
+print('files found in folders, patterns and lists')
+
+
+# the corrupt files fail without stopping the batch, and leave no output
+saida = os.path.join(tmp, 'saida')
+resultados = decompressBatch(findFiles([entrada], recursive=True), saida, workers=2, verbose=False)
+falhas = [os.path.basename(path) for path, resultado in resultados if resultado[4] is not None]
+assert sorted(falhas) == ['corrompido.gz', 'texto.gz'], falhas
+for nome, dados in esperado.items():
+	with open(os.path.join(saida, nome), 'rb') as f:
+		assert f.read() == dados, nome
+assert not os.path.exists(os.path.join(saida, 'corrompido'))
+print('%d files decompressed, %d failed' % (len(resultados) - len(falhas), len(falhas)))
+
+# any exception in a file is reported in its result, not raised
+class Falha(Exception):
+	pass
+def gzipFalha(path, verbose=True):
+	raise Falha('erro inesperado')
+gzipOriginal, batchgzip.GZIP = batchgzip.GZIP, gzipFalha
+try:
+	resultado = decompressFile(os.path.join(entrada, 'f1.gz'), os.path.join(tmp, 'falha'))
+finally:
+	batchgzip.GZIP = gzipOriginal
+assert resultado[4] == 'Falha: erro inesperado' and not os.path.exists(os.path.join(tmp, 'falha')), resultado
+print('unexpected exceptions reported per file')
+
+
+# files of different folders with the same name: fine next to each file, rejected with an output folder
+outra = os.path.join(tmp, 'outra')
+escrever(os.path.join(outra, 'f1.gz'), gz(b'outro f1'))
+repetidos = findFiles([os.path.join(entrada, 'f1.gz'), os.path.join(outra, 'f1.gz')])
+assert len(decompressBatch(repetidos, workers=2, verbose=False)) == 2
+try:
+	decompressBatch(repetidos, os.path.join(tmp, 'repetidos'), workers=2, verbose=False)
+	assert False, 'same output accepted'
+except ValueError as e:
+	assert 'same output' in str(e), e
+assert not os.path.exists(os.path.join(tmp, 'repetidos'))
+print('files with the same output rejected')
+
+
+# command line, through inflate.py: a status line per file, a summary and exit status 1
+r = subprocess.run([sys.executable, 'inflate.py', os.path.join(entrada, 'f*.gz'), '-o', os.path.join(tmp, 'cli'), '-j', '2'],
+                   capture_output=True, text=True)
+assert r.returncode == 0, r.stderr
+linhas = r.stdout.splitlines()
+assert len(linhas) == 40 and linhas[-1].startswith('39 file(s) decompressed, 0 failed'), r.stdout
+r = subprocess.run([sys.executable, 'inflate.py', entrada, '-o', os.path.join(tmp, 'cli')], capture_output=True, text=True)
+assert r.returncode == 1 and 'FAILED' in r.stdout, r.stdout
+linhas = r.stdout.splitlines()
+assert linhas[-3].startswith('39 file(s) decompressed, 2 failed') and 'failed: ' in linhas[-1], r.stdout
+print('command line: %s' % linhas[-3])
+r = subprocess.run([sys.executable, 'inflate.py', os.path.join(entrada, 'f1.gz'), os.path.join(outra, 'f1.gz'), entrada,
+                    '-o', os.path.join(tmp, 'cli')], capture_output=True, text=True)
+assert r.returncode == 2 and 'same output' in r.stderr, r.stderr
+
+shutil.rmtree(tmp)
@@ -0,0 +1,133 @@
+import os
+import io
+import zlib
+import random
+import shutil
+import tempfile
+import subprocess
+import contextlib
+import tracemalloc
+
+import deflate
+from deflate import compress, compressFile, huffmanLengths
+from inflate import GZIP
+
+
+tmp = tempfile.mkdtemp()
+
+
+def descomprimir(dados):
+	''' decompresses a gzip member with GZIP and with zlib, checking that both give the same result '''
+	gz = GZIP(io.BytesIO(dados), verbose=False)
+	out = b''.join(bytes(chunk) for chunk in gz.chunks())
+	assert out == zlib.decompress(dados, 31)
+	return out
+
+
+def verificar(nome, data, levels=range(10)):
+	for level in levels:
+		comp = compress(data, level)
+		assert descomprimir(comp) == data, '%s: level %d' % (nome, level)
+	print("'%s' (%d bytes) successfully compressed at levels %s" % (nome, len(data), ','.join(map(str, levels))))
+
+
+
+with open('FAQ.txt', 'rb') as f:
+	faq = f.read()
+
+rnd = random.Random(0)
+words = faq.split()
+texto = b' '.join(rnd.choice(words) for _ in range(30000))
+
+
+# empty and tiny inputs
+verificar('vazio', b'')
+verificar('um byte', b'a')
+
+# text, runs (overlapping matches), incompressible data (stored blocks), matches up to 32 KiB back
+verificar('faq', faq)
+verificar('texto', texto)
+verificar('runs', b'a' * 70000 + texto[:3000] + b'b' * 1000)
+verificar('aleatorio', rnd.randbytes(70000), (0, 1, 6))
+bloco = rnd.randbytes(deflate.WSIZE - 10)
+verificar('distancia maxima', bloco * 3, (1, 9))
+
+# input split in several segments: the window continues across them
+segment = deflate.SEGMENT
+deflate.SEGMENT = 50000
+try:
+	out = io.BytesIO()
+	with deflate.GzipWriter(out, 6, 'texto.txt') as writer:
+		for i in range(0, len(texto), 30000):
+			writer.write(texto[i:i+30000])
+	assert descomprimir(out.getvalue()) == texto
+	assert len(out.getvalue()) < len(compress(texto, 1))
+finally:
+	deflate.SEGMENT = segment
+print('input in segments successfully compressed')
+
+# input without matches (a de Bruijn sequence: every 3 bytes occur once) ends blocks at the same size at every level
+def deBruijn(k, n):
+	a = [0] * k * n
+	seq = []
+	def db(t, p):
+		if t > n:
+			if n % p == 0:
+				seq.extend(a[1:p+1])
+		else:
+			a[t] = a[t-p]
+			db(t + 1, p)
+			for j in range(a[t-p] + 1, k):
+				a[t] = j
+				db(t + 1, t)
+	db(1, 1)
+	return bytes(seq)
+semMatches = deBruijn(40, 3)
+blocos = []
+for level in (1, 6, 9):
+	deflater = deflate.Deflater(level)
+	deflater.compress(semMatches)
+	assert len(deflater.symbols) < deflate.BLOCKSYMBOLS, (level, len(deflater.symbols))
+	blocos.append(deflater.blocks)
+assert blocos[0] > 0 and blocos[0] == blocos[1] == blocos[2], blocos
+verificar('sem matches', semMatches, (1, 6, 9))
+
+# the hash chains have a fixed size: memory does not grow with the input (random data: every 3 bytes are new)
+tracemalloc.start()
+deflate.Deflater(6).compress(rnd.randbytes(1 << 20))
+pico = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+assert pico < 16 << 20, 'peak of %d bytes compressing 1 MiB' % pico
+print('1 MiB of random data compressed with a peak of %.1f MiB' % (pico / (1 << 20)))
+
+# level ordering: more effort, smaller output
+tamanhos = [len(compress(texto, level)) for level in (1, 6, 9)]
+assert tamanhos[0] > tamanhos[1] >= tamanhos[2], tamanhos
+print('compressed sizes at levels 1, 6, 9: %s' % tamanhos)
+
+# code lengths are limited: Fibonacci frequencies make the optimal code 29 bits deep
+fib = [1, 1]
+while len(fib) < 30:
+	fib.append(fib[-1] + fib[-2])
+lengths = huffmanLengths(fib, 15)
+assert max(lengths) == 15 and sum(2 ** -l for l in lengths) <= 1, lengths
+assert max(huffmanLengths(fib[:19], 7)) <= 7
+verificar('fibonacci', b''.join(bytes([i]) * f for i, f in enumerate(fib[:22])), (1, 6))
+
+# file with name and modification time, read by gunzip and by GZIP
+path = os.path.join(tmp, 'faq.txt')
+with open(path, 'wb') as f:
+	f.write(faq)
+compressFile(path)
+if shutil.which('gzip'):
+	assert subprocess.run(['gzip', '-dc', path + '.gz'], stdout=subprocess.PIPE, check=True).stdout == faq
+os.remove(path)
+with contextlib.redirect_stdout(io.StringIO()):
+	membros = GZIP(path + '.gz').decompress()
+with open(path, 'rb') as f:
+	assert f.read() == faq
+assert membros[0].header.fName == 'faq.txt'
+print("'faq.txt.gz' successfully compressed and decompressed")
+
+
+shutil.rmtree(tmp)
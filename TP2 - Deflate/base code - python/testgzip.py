@@ -0,0 +1,288 @@
+import os
+import io
+import mmap
+import zlib
+import random
+import subprocess
+import sys
+import struct
+import shutil
+import tempfile
+import contextlib
+import tracemalloc
+
+from inflate import GZIP, GzipReader, DecodeStats
+from huffmantree import HuffmanTable
+
+
+tmp = tempfile.mkdtemp()
+
+
+def comprimir(nome, data, level=6):
+	''' writes data as a gzip file in the temporary folder and returns its path '''
+	comp = zlib.compressobj(level, zlib.DEFLATED, 31)
+	path = os.path.join(tmp, nome)
+	with open(path, 'wb') as f:
+		f.write(comp.compress(data) + comp.flush())
+	return path
+
+
+def descomprimir(path):
+	''' decompresses path with GZIP and returns the contents of the output file '''
+	with contextlib.redirect_stdout(io.StringIO()):
+		GZIP(path).decompress()
+	with open(path.replace('.gz', ''), 'rb') as f:
+		return f.read()
+
+
+def verificar(nome, data, level=6):
+	out = descomprimir(comprimir(nome, data, level))
+	assert out == data, '%s: %d bytes decompressed, %d expected' % (nome, len(out), len(data))
+	print("'%s' (%d bytes) successfully decompressed" % (nome, len(data)))
+
+
+
+with open('FAQ.txt', 'rb') as f:
+	faq = f.read()
+
+rnd = random.Random(0)
+words = faq.split()
+texto = b' '.join(rnd.choice(words) for _ in range(200000))
+
+
+# small file
+verificar('faq.gz', faq)
+
+# output bigger than the window, back-references crossing blocks and flushes
+verificar('texto.gz', texto)
+
+# long runs: overlapping copies with distance 1
+verificar('runs.gz', b'a' * 100000 + texto[:5000] + b'b' * 70000)
+
+# stored blocks: incompressible data and level 0
+aleatorio = rnd.randbytes(150000)
+verificar('aleatorio.gz', aleatorio)
+verificar('nivel0.gz', texto[:200000], 0)
+
+# fixed Huffman blocks: small inputs
+verificar('fixo.gz', b'Teoria da Informacao, LEI')
+verificar('fixo2.gz', faq[:300] * 3, 1)
+
+# the fixed tables are built for each decoder: another decoder first does not take HuffmanTable off the fast path
+class OutroDecoder(HuffmanTable):
+	''' any other decoder, used one symbol at a time '''
+GZIP.fixedCodes.clear()
+path = comprimir('fixo3.gz', b'Teoria da Informacao, LEI')
+gz = GZIP(path, verbose=False)
+gz.huffmanDecoder = OutroDecoder
+gz.decompress(io.BytesIO())
+assert all(type(tabela) is OutroDecoder for tabela in gz.fixedTables())
+assert all(type(tabela) is HuffmanTable for tabela in GZIP(path, verbose=False).fixedTables())
+print('fixed tables cached for each decoder')
+
+# blocks of every type in one stream
+comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+partes = [texto[:50000], aleatorio[:20000], b'abc' * 10, texto[50000:90000], aleatorio[20000:90000]]
+dados = b''
+for parte in partes:
+	dados += comp.compress(parte) + comp.flush(zlib.Z_FULL_FLUSH)
+with open(os.path.join(tmp, 'misto.gz'), 'wb') as f:
+	f.write(dados + comp.flush())
+assert descomprimir(os.path.join(tmp, 'misto.gz')) == b''.join(partes)
+print("'misto.gz' successfully decompressed")
+
+# short periods: overlapping copies repeating 1 to 16 bytes, with the fast path and one symbol at a time
+periodos = b''.join(texto[i:i+p] * (5000 // p) for i, p in enumerate(range(1, 17)))
+for fastPath in (False, True):
+	GZIP.fastPath = fastPath
+	verificar('periodos.gz', periodos)
+
+# several members, as written by 'cat a.gz b.gz'; the last one has FEXTRA, FNAME and FCOMMENT fields
+def membro(data, level=6):
+	comp = zlib.compressobj(level, zlib.DEFLATED, 31)
+	return comp.compress(data) + comp.flush()
+
+def membroComCampos(data):
+	comp = zlib.compressobj(6, zlib.DEFLATED, -15)
+	extra = b'xy' * 150
+	header = bytes([0x1f, 0x8b, 8, 0x1c, 0, 0, 0, 0, 0, 3]) + struct.pack('<H', len(extra)) + extra
+	header += b'faq.txt\0comentario\0'
+	return header + comp.compress(data) + comp.flush() + struct.pack('<II', zlib.crc32(data), len(data))
+
+path = os.path.join(tmp, 'membros.gz')
+with open(path, 'wb') as f:
+	f.write(membro(texto[:300000]) + membro(b'') + membro(aleatorio) + membroComCampos(faq))
+with contextlib.redirect_stdout(io.StringIO()):
+	membros = GZIP(path).decompress()
+with open(path.replace('.gz', ''), 'rb') as f:
+	assert f.read() == texto[:300000] + aleatorio + faq
+assert [m.outputBytes for m in membros] == [300000, 0, len(aleatorio), len(faq)]
+assert sum(m.compressedBytes for m in membros) == os.path.getsize(path)
+assert membros[3].header.fName == 'faq.txt' and membros[3].header.fComment == 'comentario'
+print("'membros.gz' (%d members) successfully decompressed" % len(membros))
+
+# the same dynamic block header repeated: the decode tables are built once and found in the cache afterwards
+comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+linhas = faq[:1000]
+repetido = os.path.join(tmp, 'repetido.gz')
+with open(repetido, 'wb') as f:
+	f.write(b''.join(comp.compress(linhas) + comp.flush(zlib.Z_FULL_FLUSH) for _ in range(20)) + comp.flush())
+GZIP.tableCache.clear()
+with contextlib.redirect_stdout(io.StringIO()):
+	membros = GZIP(repetido).decompress()
+assert (membros[0].tableMisses, membros[0].tableHits) == (1, 19), membros
+assert GZIP.tableCache.hits == 19 and GZIP.clTableCache.hits >= 19
+print("'repetido.gz' successfully decompressed, %d decode table cache hit(s)" % membros[0].tableHits)
+
+# statistics: time per phase, every block reported to the callback, literals and matches when the symbols are counted
+blocos = []
+for symbols in (False, True):
+	stats = DecodeStats(symbols, blocos.append)
+	membros = GZIP(os.path.join(tmp, 'misto.gz'), verbose=False, stats=stats).decompress()
+	assert stats.blocks == blocos[-membros[0].blocks:] and len(stats.blocks) == membros[0].blocks
+	assert sum(b.outputBytes for b in stats.blocks) == membros[0].outputBytes
+	assert sum(b.bits for b in stats.blocks) <= 8 * membros[0].compressedBytes
+	assert {0, 2} <= {b.btype for b in stats.blocks} and all(t >= 0 for t in stats.phases.values())
+assert stats.matches == sum(stats.distances) > 0 and 3 <= stats.averageMatch <= 258
+assert stats.literals + stats.matchBytes == sum(b.outputBytes for b in stats.blocks if b.btype != 0)
+saida = io.StringIO()
+with contextlib.redirect_stdout(saida):
+	GZIP(comprimir('verbose.gz', faq)).decompress()
+assert 'HLIT' not in saida.getvalue()
+with contextlib.redirect_stdout(saida):
+	GZIP(comprimir('verbose.gz', faq), verbose=2).decompress()
+assert 'HLIT' in saida.getvalue()
+print('statistics of %d blocks collected: %r' % (len(stats.blocks), stats))
+
+
+# streaming reader over a file object: reads of random sizes, readinto, lines
+with open(path, 'rb') as f:
+	dados = f.read()
+esperado = texto[:300000] + aleatorio + faq
+leitor = GzipReader(io.BytesIO(dados))
+partes = []
+while True:
+	parte = leitor.read(rnd.randint(1, 100000))
+	if not parte:
+		break
+	partes.append(parte)
+assert b''.join(partes) == esperado and len(leitor.members) == 4
+buf = bytearray(len(esperado) + 10)
+assert GzipReader(io.BytesIO(dados)).readinto(buf) == len(esperado) and buf[:len(esperado)] == esperado
+with GzipReader(comprimir('linhas.gz', faq)) as leitor:
+	linhas = list(leitor)
+assert linhas == io.BytesIO(faq).readlines()
+print('GzipReader successfully decompressed %d bytes' % len(esperado))
+
+# into caller buffers: exactly sized, a larger memoryview, an mmap, one too small
+assert GZIP(io.BytesIO(dados), verbose=False).decompressInto(bytearray(len(esperado))) == len(esperado)
+buf = bytearray(len(esperado) + 100)
+assert GZIP(io.BytesIO(dados), verbose=False).decompressInto(memoryview(buf)[50:]) == len(esperado)
+assert buf[50:-50] == esperado and buf[:50] == buf[-50:] == bytes(50)
+mapa = mmap.mmap(-1, len(esperado))
+assert GZIP(io.BytesIO(dados), verbose=False).decompressInto(mapa) == len(esperado) and mapa[:] == esperado
+try:
+	GZIP(io.BytesIO(dados), verbose=False).decompressInto(bytearray(len(esperado) - 1))
+	assert False, 'buffer overflow not detected'
+except ValueError as e:
+	assert 'too small' in str(e), e
+# to a bytearray: sized by ISIZE for a single member, grown for several members and for unseekable input
+assert GZIP(comprimir('bytes.gz', texto), verbose=False).decompressToBytes() == texto
+assert GZIP(io.BytesIO(dados), verbose=False).decompressToBytes() == esperado
+class Tubo(io.RawIOBase):
+	''' unseekable input, as a pipe '''
+	def __init__(self, data):
+		self.data = io.BytesIO(data)
+	def readable(self):
+		return True
+	def readinto(self, b):
+		return self.data.readinto(b)
+assert GZIP(Tubo(dados), verbose=False).decompressToBytes() == esperado
+print('decompressInto and decompressToBytes successfully decompressed %d bytes' % len(esperado))
+
+# a corrupt ISIZE is only a hint: the array allocated up front is limited by the compressed size
+falso = bytearray(membro(faq))
+falso[-4:] = struct.pack('<I', 0x7fffffff)
+tracemalloc.start()
+try:
+	GZIP(io.BytesIO(bytes(falso)), verbose=False).decompressToBytes()
+	assert False, 'ISIZE error not detected'
+except ValueError as e:
+	assert 'ISIZE' in str(e), e
+pico = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+assert pico < GZIP.MAXRATIO * len(falso) + (4 << 20), 'allocated %d bytes for a %d byte file' % (pico, len(falso))
+
+# corrupt data raises ValueError or EOFError, never other exceptions, and does not allocate the ISIZE read
+rnd = random.Random(2)
+base = membro(faq)
+for _ in range(300):
+	corrompido = bytearray(base)
+	for _ in range(rnd.randint(1, 4)):
+		i = rnd.randrange(len(corrompido))
+		corrompido[i] ^= 1 << rnd.randrange(8)
+	try:
+		GZIP(io.BytesIO(bytes(corrompido)), verbose=False).decompressToBytes()
+	except (ValueError, EOFError):
+		pass
+print('corrupt ISIZE and corrupt data rejected')
+
+# mapped input: the whole file, from the current position of a file object, an empty file
+assert GZIP(path, verbose=False, mapped=True).decompressToBytes() == esperado
+with open(path, 'rb') as f:
+	f.seek(len(membro(texto[:300000])))
+	assert GZIP(f, verbose=False, mapped=True).decompressToBytes() == esperado[300000:]
+	assert not f.closed
+vazio = os.path.join(tmp, 'vazio.gz')
+open(vazio, 'wb').close()
+try:
+	GZIP(vazio, verbose=False, mapped=True).decompressToBytes()
+	assert False, 'empty file decompressed'
+except ValueError:
+	pass
+print('mapped input successfully decompressed')
+
+# command line: stdin to stdout
+saida = subprocess.run([sys.executable, 'inflate.py', '-'], input=dados, stdout=subprocess.PIPE, check=True).stdout
+assert saida == esperado
+# no module of this folder shadows the standard library's gzip
+import gzip
+assert gzip.decompress(dados) == esperado
+print('stdin successfully decompressed to stdout')
+
+
+# corrupted trailer: CRC-32 and ISIZE are checked unless verify = False
+for posicao, campo in ((-8, 'CRC-32'), (-1, 'ISIZE')):
+	path = comprimir('corrompido.gz', faq)
+	with open(path, 'r+b') as f:
+		f.seek(posicao, 2)
+		byte = f.read(1)[0]
+		f.seek(posicao, 2)
+		f.write(bytes([byte ^ 0xFF]))
+	try:
+		descomprimir(path)
+		assert False, '%s error not detected' % campo
+	except ValueError as e:
+		assert campo in str(e), e
+	with contextlib.redirect_stdout(io.StringIO()):
+		GZIP(path, verify=False).decompress()
+	print('%s error detected' % campo)
+
+
+# startup: importing the decoder must not load NumPy and must fit the budget, with the bytecode cached
+# (in tmp, the first run writes it). Best of 5 runs, from the cumulative time of 'python -X importtime'
+STARTUP = 30  # ms
+env = dict(os.environ, PYTHONPYCACHEPREFIX=os.path.join(tmp, 'pycache'))
+env.pop('PYTHONDONTWRITEBYTECODE', None)
+tempos = []
+for _ in range(6):
+	r = subprocess.run([sys.executable, '-X', 'importtime', '-c', "import inflate, sys; print('numpy' in sys.modules)"],
+	                   env=env, capture_output=True, text=True, check=True)
+	assert r.stdout.strip() == 'False', 'NumPy imported by inflate.py'
+	linha = [l for l in r.stderr.splitlines() if l.split('|')[-1].strip() == 'inflate'][0]
+	tempos.append(int(linha.split('|')[1]) / 1000)
+assert min(tempos[1:]) < STARTUP, 'import inflate took %.1f ms (budget %d ms)' % (min(tempos[1:]), STARTUP)
+print('import inflate in %.1f ms, without NumPy' % min(tempos[1:]))
+
+
+shutil.rmtree(tmp)
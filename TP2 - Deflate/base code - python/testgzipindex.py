@@ -0,0 +1,78 @@
+import os
+import io
+import zlib
+import random
+import shutil
+import tempfile
+
+from inflate import GzipReader
+from gzipindex import GzipIndex, buildIndex, openIndexed
+
+
+tmp = tempfile.mkdtemp()
+
+with open('FAQ.txt', 'rb') as f:
+	words = f.read().split()
+rnd = random.Random(0)
+texto = b' '.join(rnd.choice(words) for _ in range(300000))
+aleatorio = rnd.randbytes(300000)
+
+# two members, with dynamic and stored blocks
+path = os.path.join(tmp, 'dados.gz')
+with open(path, 'wb') as f:
+	for parte in (texto, aleatorio + texto[:100000]):
+		comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+		f.write(comp.compress(parte) + comp.flush())
+esperado = texto + aleatorio + texto[:100000]
+
+
+# index built while decompressing, with a checkpoint every 64 KiB
+saida = io.BytesIO()
+indice = buildIndex(path, 1 << 16, saida)
+assert saida.getvalue() == esperado and indice.size == len(esperado)
+assert len(indice.checkpoints) > 10
+print('index with %d checkpoints' % len(indice.checkpoints))
+
+# sidecar file: saved, loaded, and rebuilt when the gzip file changes
+leitor = openIndexed(path, 1 << 16)
+assert os.path.exists(path + '.gzidx')
+assert len(GzipIndex.load(path + '.gzidx').checkpoints) == len(indice.checkpoints)
+
+# random reads, forwards and backwards
+for _ in range(200):
+	offset = rnd.randrange(len(esperado) + 100)
+	n = rnd.randrange(1, 100000)
+	assert leitor.seek(offset) == min(offset, len(esperado))
+	assert leitor.read(n) == esperado[offset:offset+n], (offset, n)
+assert leitor.seek(-10, io.SEEK_END) == len(esperado) - 10 and leitor.read() == esperado[-10:]
+leitor.close()
+print('random reads successfully decompressed')
+
+# from a checkpoint of the first member, the members after it are still checked
+corrompido = os.path.join(tmp, 'corrompido.gz')
+with open(path, 'rb') as f:
+	dados = bytearray(f.read())
+dados[-8] ^= 0xFF  # CRC-32 of the second member
+with open(corrompido, 'wb') as f:
+	f.write(dados)
+with GzipReader(corrompido, index=indice) as leitor:
+	leitor.seek(len(texto) // 2)
+	assert leitor.read(1000) == esperado[len(texto)//2:len(texto)//2+1000]
+	try:
+		leitor.read()
+		assert False, 'CRC-32 error not detected after a checkpoint'
+	except ValueError as e:
+		assert 'CRC-32' in str(e), e
+print('CRC-32 of the following members checked after a checkpoint')
+
+with open(path, 'ab') as f:
+	comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+	f.write(comp.compress(b'mais dados') + comp.flush())
+with openIndexed(path, 1 << 16) as leitor:
+	assert leitor.index.size == len(esperado) + 10
+	leitor.seek(len(esperado))
+	assert leitor.read() == b'mais dados'
+print('index rebuilt after the gzip file changed')
+
+
+shutil.rmtree(tmp)
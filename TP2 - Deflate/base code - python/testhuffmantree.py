@@ -1,84 +1,123 @@
-from huffmantree import HuffmanTree
-
-
-hft = HuffmanTree()
-
-verbose = True
-
-# insert new code
-code = "000"		
-erro = hft.addNode(code, 0, verbose)
-
-# insert code already present
-code = "000"
-erro = hft.addNode(code, 1, verbose)
-
-# try add child to leaf
-code = "00001"
-erro = hft.addNode(code, 1, verbose)
-
-
-# insert new code
-code = "11100"
-erro = hft.addNode(code, 3, verbose)
-
-# insert code already present
-code = "11100"
-erro = hft.addNode(code, 3, verbose)
-
-# try add child to leaf
-code = "111001"
-erro = hft.addNode(code, 3, verbose)
-
-
-# ------------------- Search
-
-code = "000"
-pos = hft.findNode(code, None, verbose)
-
-code = "11100"
-pos = hft.findNode(code, None, verbose)
-
-code = "111"
-pos = hft.findNode(code, None, verbose)
-
-
-# search code bit by bit
-def search_bit_by_bit(buffer, verbose=False):
-
-	lv = 0
-	l = len(buffer)
-	terminate = False
-	code = ""
-
-
-	while not terminate and lv < l:
-		
-		nextBit = buffer[lv]
-		code = code + nextBit
-		
-		pos = hft.nextNode(nextBit)
-					
-		if pos != -2:
-			terminate = True
-		else:
-			lv = lv + 1
-
-	if verbose:
-		if pos == -1:
-			print("Code '" + buffer + "' not found!!!")
-		elif pos == -2:
-			print("Code '" + buffer + "': not found but prefix!!!")
-		else:
-			print("Code '" + buffer + "' found, alphabet position: " + str(pos) )
-
-	return pos	
-
-
-
-code = "111000100"
-pos = search_bit_by_bit(code, True)
-
-
-code = "1110"
-pos = search_bit_by_bit(code, True)
+from huffmantree import HuffmanTree
+
+
+hft = HuffmanTree()
+
+verbose = True
+
+# insert new code
+code = "000"		
+erro = hft.addNode(code, 0, verbose)
+
+# insert code already present
+code = "000"
+erro = hft.addNode(code, 1, verbose)
+
+# try add child to leaf
+code = "00001"
+erro = hft.addNode(code, 1, verbose)
+
+
+# insert new code
+code = "11100"
+erro = hft.addNode(code, 3, verbose)
+
+# insert code already present
+code = "11100"
+erro = hft.addNode(code, 3, verbose)
+
+# try add child to leaf
+code = "111001"
+erro = hft.addNode(code, 3, verbose)
+
+
+# ------------------- Search
+
+code = "000"
+pos = hft.findNode(code, None, verbose)
+
+code = "11100"
+pos = hft.findNode(code, None, verbose)
+
+code = "111"
+pos = hft.findNode(code, None, verbose)
+
+
+# search code bit by bit
+def search_bit_by_bit(buffer, verbose=False):
+
+	lv = 0
+	l = len(buffer)
+	terminate = False
+	code = ""
+
+
+	while not terminate and lv < l:
+		
+		nextBit = buffer[lv]
+		code = code + nextBit
+		
+		pos = hft.nextNode(nextBit)
+					
+		if pos != -2:
+			terminate = True
+		else:
+			lv = lv + 1
+
+	if verbose:
+		if pos == -1:
+			print("Code '" + buffer + "' not found!!!")
+		elif pos == -2:
+			print("Code '" + buffer + "': not found but prefix!!!")
+		else:
+			print("Code '" + buffer + "' found, alphabet position: " + str(pos) )
+
+	return pos	
+
+
+
+code = "111000100"
+pos = search_bit_by_bit(code, True)
+
+
+code = "1110"
+pos = search_bit_by_bit(code, True)
+
+
+# ------------------- array-backed tree: same results as HuffmanTree
+
+from huffmantree import ArrayHuffmanTree
+import random
+
+rnd = random.Random(0)
+codes = ["000", "000", "00001", "11100", "11100", "111001", "01", "010", "0", "1101", "", "1"]
+codes += [''.join(rnd.choice('01') for _ in range(rnd.randint(1, 9))) for _ in range(300)]
+
+tree, arrayTree = HuffmanTree(), ArrayHuffmanTree()
+for i, code in enumerate(codes):
+	assert tree.addNode(code, i) == arrayTree.addNode(code, i), code
+for code in codes + ["111", "0000", "11111111111"]:
+	assert tree.findNode(code) == arrayTree.findNode(code), code
+
+for buffer in ["111000100", "1110", "0101", "1111111111", "0"]:
+	tree.resetCurNode()
+	arrayTree.resetCurNode()
+	for bit in buffer:
+		assert tree.nextNode(bit) == arrayTree.nextNode(bit), buffer
+print('ArrayHuffmanTree: same results as HuffmanTree')
+
+
+# canonical construction from code lengths: the codes of GZIP.alphaParaHuffman
+from inflate import GZIP
+
+lengths = [8]*144 + [9]*112 + [7]*24 + [8]*8
+arrayTree = ArrayHuffmanTree.fromLengths(lengths)
+for symbol, (length, code) in enumerate(GZIP.alphaParaHuffman(lengths)):
+	assert arrayTree.findNode(format(code, '0%db' % length)) == symbol
+assert len(arrayTree.index) == 2 * len(lengths) - 1
+try:
+	ArrayHuffmanTree.fromLengths([1, 1, 1])
+	assert False, 'invalid code lengths accepted'
+except ValueError:
+	pass
+print('ArrayHuffmanTree.fromLengths: fixed literal/length code successfully built')
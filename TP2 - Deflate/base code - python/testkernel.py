@@ -0,0 +1,82 @@
+import io
+import zlib
+import random
+
+from inflate import GZIP
+
+
+# the decoding paths compared: each one must give the same output, byte for byte
+caminhos = [('decodeBlockSymbols', {'fastPath': False}), ('decodeBlockFast', {'kernel': None})]
+if GZIP.kernel is not None:
+	caminhos.append(('inflatekernel', {}))
+else:
+	print('inflatekernel not built (python setup.py build_ext --inplace): comparing the Python paths only')
+
+
+def descomprimir(dados, attrs):
+	''' decompresses the gzip data with the GZIP attributes overridden. Returns the output, or the exception raised '''
+	gz = GZIP(io.BytesIO(dados), verbose=False)
+	for name, value in attrs.items():
+		setattr(gz, name, value)
+	out = io.BytesIO()
+	try:
+		gz.decompress(out)
+	except (ValueError, EOFError) as e:
+		return e
+	return out.getvalue()
+
+
+def comparar(nome, dados, esperado=None):
+	resultados = [descomprimir(dados, attrs) for caminho, attrs in caminhos]
+	for (caminho, attrs), resultado in zip(caminhos, resultados):
+		if esperado is None:
+			assert isinstance(resultado, Exception), '%s: %s decompressed corrupted data' % (nome, caminho)
+		else:
+			assert resultado == esperado, '%s: %s output differs (%r)' % (nome, caminho, resultado if isinstance(resultado, Exception) else len(resultado))
+	print("'%s': %s agree" % (nome, ', '.join(caminho for caminho, attrs in caminhos)))
+
+
+def gz(data, level=6, flush=None):
+	comp = zlib.compressobj(level, zlib.DEFLATED, 31)
+	if flush is None:
+		return comp.compress(data) + comp.flush()
+	# a flush every len(data) // 8 bytes: more blocks, of every type when the data is mixed
+	step = len(data) // 8 + 1
+	return b''.join(comp.compress(data[i:i+step]) + comp.flush(flush) for i in range(0, len(data), step)) + comp.flush()
+
+
+
+with open('FAQ.txt', 'rb') as f:
+	faq = f.read()
+
+rnd = random.Random(0)
+words = faq.split()
+texto = b' '.join(rnd.choice(words) for _ in range(400000))
+aleatorio = rnd.randbytes(100000)
+periodos = b''.join(texto[i:i+p] * (5000 // p) for i, p in enumerate(range(1, 20)))
+
+entradas = [('faq', faq, 6), ('texto, nivel 1', texto, 1), ('texto, nivel 9', texto, 9), ('vazio', b'', 6),
+            ('aleatorio', aleatorio, 6), ('nivel 0', texto[:100000], 0), ('fixo', b'Teoria da Informacao', 6),
+            ('runs', b'a' * 300000 + b'b' * 258 + b'c', 6), ('periodos', periodos, 6)]
+for nome, data, level in entradas:
+	comparar(nome, gz(data, level), data)
+
+# output bigger than the window buffer, input spanning many BitReader blocks
+comparar('texto', gz(texto), texto)
+
+# blocks of every type, with flushes in the middle of the stream
+misto = texto[:200000] + aleatorio + periodos
+comparar('misto', gz(misto, 6, zlib.Z_FULL_FLUSH), misto)
+comparar('sync', gz(misto, 1, zlib.Z_SYNC_FLUSH), misto)
+
+# several members
+comparar('membros', gz(faq) + gz(aleatorio) + gz(texto[:50000], 9), faq + aleatorio + texto[:50000])
+
+
+# corrupted data: truncated streams and flipped bits must fail in every path
+dados = gz(texto[:300000])
+for corte in (20, len(dados) // 3, len(dados) - 20, len(dados) - 9):
+	comparar('cortado em %d' % corte, dados[:corte])
+for _ in range(20):
+	i = rnd.randrange(20, len(dados) - 8)
+	comparar('bit trocado em %d' % i, dados[:i] + bytes([dados[i] ^ (1 << rnd.randrange(8))]) + dados[i+1:])
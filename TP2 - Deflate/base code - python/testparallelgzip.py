@@ -0,0 +1,98 @@
+import os
+import sys
+import zlib
+import random
+import shutil
+import tempfile
+import subprocess
+
+from parallelgzip import decompressParallel, restartPoints
+
+
+tmp = tempfile.mkdtemp()
+
+with open('FAQ.txt', 'rb') as f:
+	words = f.read().split()
+rnd = random.Random(0)
+
+def texto(n):
+	return b' '.join(rnd.choice(words) for _ in range(n))
+
+
+def verificar(nome, dados, esperado, chunkSize):
+	path = os.path.join(tmp, nome)
+	with open(path, 'wb') as f:
+		f.write(dados)
+	pontos = restartPoints(path, chunkSize)
+	decompressParallel(path, workers=2, chunkSize=chunkSize)
+	with open(path.replace('.gz', ''), 'rb') as f:
+		assert f.read() == esperado, nome
+	print("'%s' (%d restart points) successfully decompressed" % (nome, len(pontos)))
+
+
+partes = [texto(30000) for _ in range(6)] + [rnd.randbytes(80000)]
+
+# several members, followed by trailing garbage
+dados = b''
+for parte in partes:
+	comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+	dados += comp.compress(parte) + comp.flush()
+verificar('membros.gz', dados + b'\0\0\0', b''.join(partes), 30000)
+
+# one member with full flushes: the blocks after each flush are independent
+# one member with sync flushes: the blocks after each flush refer to the previous ones
+for nome, modo in (('fullflush.gz', zlib.Z_FULL_FLUSH), ('syncflush.gz', zlib.Z_SYNC_FLUSH)):
+	comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+	dados = b''
+	for parte in partes:
+		dados += comp.compress(parte) + comp.flush(modo)
+	verificar(nome, dados + comp.flush(), b''.join(partes), 30000)
+
+# corrupted member: the CRC-32 is checked
+comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+dados = bytearray(comp.compress(partes[0]) + comp.flush())
+dados[-6] ^= 0xFF
+try:
+	verificar('corrompido.gz', bytes(dados) * 2, partes[0] * 2, 30000)
+	assert False, 'CRC-32 error not detected'
+except ValueError as e:
+	assert 'CRC-32' in str(e), e
+	print('CRC-32 error detected')
+
+
+# memory: peak RSS of the main process and of the workers, with an output much larger than the window, less
+# than with a small output plus a margin. In a new process, so that the data of this script is not counted
+# (VmHWM for the main process: ru_maxrss keeps the peak of the process before exec)
+MEDIR = '''
+import sys, resource
+from parallelgzip import decompressParallel
+decompressParallel(sys.argv[1], workers=2, chunkSize=1000)
+with open('/proc/self/status') as f:
+	pico = [int(linha.split()[1]) for linha in f if linha.startswith('VmHWM:')][0]
+print(pico, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+'''
+def picoRSS(nome, parte, modo):
+	# two halves of parte, after a flush point (modo = Z_FULL_FLUSH) or without restart points
+	path = os.path.join(tmp, nome)
+	comp = zlib.compressobj(6, zlib.DEFLATED, 31)
+	with open(path, 'wb') as f:
+		f.write(comp.compress(parte) + comp.flush(modo) + comp.compress(parte) + comp.flush())
+	r = subprocess.run([sys.executable, '-c', MEDIR, path], capture_output=True, text=True, check=True)
+	with open(path.replace('.gz', ''), 'rb') as f:
+		assert f.read(len(parte)) == parte and os.path.getsize(path.replace('.gz', '')) == 2 * len(parte), nome
+	os.remove(path.replace('.gz', ''))
+	return [int(kb) >> 10 for kb in r.stdout.split()]  # MiB (both in KiB on Linux)
+
+try:
+	import resource
+except ImportError:
+	resource = None
+if resource is not None and sys.platform.startswith('linux'):
+	bloco = texto(2000)
+	for modo, nome in ((zlib.Z_FULL_FLUSH, 'flush points'), (zlib.Z_NO_FLUSH, 'no restart points')):
+		base = picoRSS('pequeno.gz', bloco, modo)
+		grande = picoRSS('grande.gz', bloco * ((64 << 20) // len(bloco)), modo)
+		assert all(g < b + 32 for g, b in zip(grande, base)), (nome, grande, base)
+		print('128 MiB output (%s): peak RSS %d MiB (main) and %d MiB (workers), %d and %d MiB for a small file' % (nome, *grande, *base))
+
+shutil.rmtree(tmp)
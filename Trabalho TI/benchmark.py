@@ -0,0 +1,50 @@
+import sys
+import time
+import numpy as np
+from trabalho import informacao_mutua_mpg, matriz_informacao_mutua, avaliar_modelos, MODELOS
+
+# tempos das funcoes do trabalho (informacao mutua, avaliacao dos modelos do MPG) com dados sinteticos com as colunas do CarDataset (a ultima e o MPG), de 10 mil a 10 milhoes de linhas
+# uso: python benchmark.py [numero maximo de linhas]
+
+def gerar_dados(n, seed=0):
+    rng = np.random.default_rng(seed)
+    colunas = [rng.integers(3, 9, n), rng.integers(68, 455, n), rng.integers(46, 230, n),
+               rng.integers(1613, 5140, n), rng.integers(8, 25, n), rng.integers(70, 82, n), rng.integers(9, 47, n)]
+    return np.column_stack(colunas).astype('uint16')
+
+def medir(funcao, *args):
+    inicio = time.perf_counter()
+    funcao(*args)
+    return time.perf_counter() - inicio
+
+def benchmark_informacao_mutua(maximo):
+    print("linhas / MI com o MPG (s) / matriz de MI (s) / linhas por segundo")
+    n = 10000
+    while n <= maximo:
+        dados = gerar_dados(n)
+        t_mpg = medir(informacao_mutua_mpg, dados)
+        t_matriz = medir(matriz_informacao_mutua, dados)
+        print(f"{n} / {t_mpg:.3f} / {t_matriz:.3f} / {n / t_mpg:.0f}")
+        n *= 10
+
+def benchmark_modelos(maximo, n_modelos=100, bloco=1 << 16):
+    # n_modelos modelos candidatos (os do trabalho e variacoes aleatorias deles) avaliados numa so passagem, bloco a bloco
+    rng = np.random.default_rng(0)
+    nome, termo, coeficientes = MODELOS[0]
+    modelos = MODELOS + [(f"candidato {i}", termo, np.array(coeficientes) * rng.uniform(0.5, 1.5, len(coeficientes)))
+                         for i in range(n_modelos - len(MODELOS))]
+    print(f"linhas / MAE de {len(modelos)} modelos (s) / linhas por segundo")
+    n = 10000
+    while n <= maximo:
+        dados = gerar_dados(n)
+        blocos = (dados[i:i+bloco] for i in range(0, n, bloco))
+        t = medir(avaliar_modelos, blocos, modelos)
+        print(f"{n} / {t:.3f} / {n / t:.0f}")
+        n *= 10
+
+
+
+if __name__ == "__main__":
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 10**7
+    benchmark_informacao_mutua(maximo)
+    benchmark_modelos(maximo)
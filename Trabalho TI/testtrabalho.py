@@ -0,0 +1,226 @@
+import io
+import os
+import shutil
+import tempfile
+import contextlib
+import numpy as np
+import pandas as pd
+import huffmancodec as huffc
+
+from trabalho import carregar_colunas, carregar_dados, contar_ocorrencias, calcular_ocorrencias
+from trabalho import EstatisticasColunas, calcular_entropia, calcular_entropia_geral, huffman, divide_intervalos, indice_mais_frequente
+from trabalho import MODELOS, prever_mpg, avaliar_modelos, estimar_mpg
+from trabalho import calcular_informaçao_mutua, informacao_mutua_mpg, matriz_informacao_mutua
+
+
+rng = np.random.default_rng(0)
+nomes_variaveis = ['Acceleration', 'Cylinders', 'Displacement', 'Horsepower', 'ModelYear', 'Weight']
+
+def gerar_dados(n):
+    # dados sinteticos com as colunas do CarDataset (a ultima e o MPG), com Acceleration decimal
+    colunas = [rng.normal(15, 3, n).round(1), rng.integers(3, 9, n), rng.integers(68, 455, n), rng.integers(46, 230, n),
+               rng.integers(70, 82, n), rng.integers(1613, 5140, n), rng.integers(9, 47, n)]
+    return np.column_stack(colunas).astype(float)
+
+dados = gerar_dados(3000)
+tmp = tempfile.mkdtemp()
+
+
+#Ponto 1: a cache binaria (uma coluna tipada por ficheiro, mapeada em memoria, so de leitura) e usada enquanto o Excel
+# nao muda, e refeita quando muda
+excel = os.path.join(tmp, 'dados.xlsx')
+def escrever_excel(matriz):
+    pd.DataFrame(matriz, columns=nomes_variaveis + ['MPG']).to_excel(excel, index=False)
+
+escrever_excel(dados[:50])
+matriz, varNames, da_cache = carregar_dados(excel)
+assert not da_cache and varNames == nomes_variaveis + ['MPG'] and np.allclose(matriz, dados[:50])
+assert not matriz.flags.writeable
+matriz, varNames, da_cache = carregar_dados(excel)
+assert da_cache and np.allclose(matriz, dados[:50])
+escrever_excel(dados[50:80])
+estado = os.stat(excel)
+os.utime(excel, ns=(estado.st_atime_ns, estado.st_mtime_ns + 10**9)) # data de modificacao diferente mesmo com pouca resolucao
+matriz, varNames, da_cache = carregar_dados(excel)
+assert not da_cache and np.allclose(matriz, dados[50:80])
+assert carregar_dados(excel)[2]
+del matriz
+
+# cada coluna com o seu tipo (inteiros e decimais), na cache e depois dela; a matriz partilhada num tipo comum
+mistas = os.path.join(tmp, 'mistas.xlsx')
+pd.DataFrame({'Cylinders': np.array([4, 6, 8], dtype='int64'), 'MPG': np.array([30.5, 21.0, 14.5])}).to_excel(mistas, index=False)
+for cache in (False, True):
+    colunas, varNames, da_cache = carregar_colunas(mistas)
+    assert da_cache == cache and varNames == ['Cylinders', 'MPG']
+    assert [coluna.dtype.kind for coluna in colunas] == ['i', 'f'] and (colunas[0] == [4, 6, 8]).all()
+    assert all(isinstance(coluna, np.memmap) and not coluna.flags.writeable for coluna in colunas)
+    del colunas
+matriz = carregar_dados(mistas)[0]
+assert matriz.dtype == np.float64 and np.allclose(matriz, [[4, 30.5], [6, 21.0], [8, 14.5]])
+del matriz
+
+# colunas nao numericas (texto) sao rejeitadas com uma mensagem clara, sem cache, em todos os arranques
+texto = os.path.join(tmp, 'texto.xlsx')
+pd.DataFrame({'Cylinders': np.array([4, 6]), 'Name': np.array(['ford', 'fiat'], dtype=object)}).to_excel(texto, index=False)
+for _ in range(2):
+    try:
+        carregar_dados(texto)
+        assert False, 'coluna de texto aceite'
+    except ValueError as e:
+        assert 'nao numericas (Name)' in str(e), e
+assert not os.path.exists(texto + '.json') and not os.path.exists(texto + '.0.npy')
+print('cache usada enquanto o Excel não muda e refeita quando muda, com colunas tipadas; colunas de texto rejeitadas')
+
+
+#Ponto 4: as contagens com bincount sao as do ciclo original, tambem acumuladas bloco a bloco
+def calcular_ocorrencias_antigo(matriz_valores, nomes_variaveis):
+    contagens = {}
+    for i, var in enumerate(nomes_variaveis):
+        ocorrencias = {}
+        for valor in matriz_valores[:, i]:
+            if valor in ocorrencias:
+                ocorrencias[valor] += 1
+            else:
+                ocorrencias[valor] = 1
+        contagens[var] = {k: v for k, v in ocorrencias.items() if v > 0}
+    return contagens
+
+matriz_valores = dados.astype('uint16')
+contagens = calcular_ocorrencias(matriz_valores, nomes_variaveis)
+antigas = calcular_ocorrencias_antigo(matriz_valores, nomes_variaveis)
+tabela = None
+for inicio in range(0, len(matriz_valores), 777):
+    tabela = contar_ocorrencias(matriz_valores[inicio:inicio+777, :len(nomes_variaveis)], tabela)
+por_blocos = calcular_ocorrencias(matriz_valores, nomes_variaveis, tabela)
+for var in nomes_variaveis:
+    valores, n = contagens[var]
+    assert dict(zip(valores.tolist(), n.tolist())) == {int(k): v for k, v in antigas[var].items()}, var
+    assert (por_blocos[var][0] == valores).all() and (por_blocos[var][1] == n).all(), var
+print('ocorrências iguais às do ciclo original, também por blocos')
+
+
+#Ponto 10: a informacao mutua da tabela de contingencia e a da funcao quadratica original, com colunas inteiras
+# (sem sinal e com sinal, com amplitude maior que o maximo do tipo), decimais e mistas
+def calcular_informaçao_mutua_antigo(matriz_valores,indice):
+    total = matriz_valores.shape[0]
+    pares = np.column_stack((matriz_valores[:,-1], matriz_valores[:,indice]))
+    mpg, contagensMpg = np.unique(matriz_valores[:,-1], return_counts = True)
+    variavel, contagensPar = np.unique(matriz_valores[:,indice], return_counts = True)
+    im = 0
+    for i in range(total):
+        if np.where((pares == pares[i]).all(axis = 1))[0][0] < i:
+            continue 
+        valmpg = pares[i][0]
+        valvar = pares[i][1]
+        indiceMpg = np.where(mpg == valmpg)[0][0]
+        indice_variavel = np.where(variavel == valvar)[0][0]
+        probabilidade_valmpg = contagensMpg[indiceMpg] / total
+        probabilidade_valvar = contagensPar[indice_variavel] / total
+        probabilidade_conjunta = sum(np.all(pares == pares[i], axis = 1))/total
+        im +=  probabilidade_conjunta * np.log2( probabilidade_conjunta/(probabilidade_valmpg * probabilidade_valvar))
+    return im
+
+amostra = dados[:400]
+com_sinal = np.column_stack([rng.integers(-20000, 20000, 400), rng.integers(-100, 100, 400), amostra[:, -1]])
+matrizes = {'decimais': amostra, 'uint16': amostra.astype('uint16'), 'int16': com_sinal.astype('int16'),
+            'int8': np.column_stack([rng.integers(-128, 128, 400), rng.integers(-3, 3, 400), rng.integers(0, 9, 400)]).astype('int8')}
+for nome, matriz in matrizes.items():
+    esperado = [calcular_informaçao_mutua_antigo(matriz, i) for i in range(matriz.shape[1] - 1)]
+    assert np.allclose([calcular_informaçao_mutua(matriz, i) for i in range(matriz.shape[1] - 1)], esperado, atol=1e-9), nome
+    assert np.allclose(informacao_mutua_mpg(matriz), esperado, atol=1e-9), nome
+    assert np.allclose(matriz_informacao_mutua(matriz)[-1, :-1], esperado, atol=1e-9), nome
+print('informação mútua igual à da função original (decimais, uint16, int16, int8)')
+
+
+#Pontos 7 e 8: entropias e comprimentos de Huffman das estatisticas partilhadas iguais aos das funcoes originais
+def calcular_entropia_antigo(indice,matriz_entropia):
+    matriz_entropia = matriz_entropia.T
+    valores,contagens = np.unique(matriz_entropia[indice],return_counts=True)
+    numero_ocorrencias = np.sum(contagens)
+    prob = contagens / numero_ocorrencias
+    entropia = -np.sum(prob * np.log2(prob))
+    return entropia
+
+def calcular_entropia_geral_antigo(matriz_entropia,varNames):
+    matriz_entropia = matriz_entropia.T
+    entropias = []
+    for i,variavel in enumerate(varNames):
+        entropias.append(matriz_entropia[i])
+    valores,contagens = np.unique(entropias,return_counts=True)
+    numero_ocorrencias = np.sum(contagens)
+    prob = contagens/numero_ocorrencias
+    entropia = -np.sum(prob * np.log2(prob))
+    return entropia
+
+def huffman_antigo(indice,matriz_huffman,variavel):
+    # o codec e construido a partir dos dados, como antes; os comprimentos sao associados aos valores pelo simbolo
+    S = matriz_huffman.T[indice]
+    codec = huffc.HuffmanCodec.from_data(S)
+    symbols, lengths = codec.get_code_len()
+    comprimentos = dict(zip(symbols, lengths))
+    valores, contagens = np.unique(S, return_counts=True)
+    prob = contagens / len(S)
+    lengths = [comprimentos[v] for v in valores]
+    media_ponderada = sum(p * l for p, l in zip(prob, lengths))
+    variancia = sum((l - media_ponderada)**2 * p for l, p in zip(lengths, prob))
+    return media_ponderada, variancia
+
+for nome, matriz in matrizes.items():
+    estatisticas = EstatisticasColunas(matriz)
+    nomes = [f"v{i}" for i in range(matriz.shape[1])]
+    for i in range(matriz.shape[1]):
+        assert abs(calcular_entropia(i, matriz, estatisticas) - calcular_entropia_antigo(i, matriz)) < 1e-12, (nome, i)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert np.allclose(huffman(i, matriz, nomes[i], estatisticas), huffman_antigo(i, matriz, nomes[i]), atol=1e-12), (nome, i)
+    assert abs(calcular_entropia_geral(matriz, nomes, estatisticas) - calcular_entropia_geral_antigo(matriz, nomes)) < 1e-12, nome
+    assert len(estatisticas.cache) == matriz.shape[1] # cada coluna contada uma so vez
+print('entropias e Huffman iguais aos das funções originais (decimais, uint16, int16, int8)')
+
+# substituir_coluna (por exemplo com o binning do Ponto 6) descarta so as estatisticas dessa coluna
+estatisticas = EstatisticasColunas(dados)
+antes = calcular_entropia(5, dados, estatisticas)
+outras = {i: estatisticas.codificacao(i) for i in range(dados.shape[1]) if i != 5}
+binning = indice_mais_frequente(divide_intervalos(dados, 'Weight', 40, 5))
+coluna = np.concatenate(binning['Weight'])
+estatisticas.substituir_coluna(5, coluna)
+assert 5 not in estatisticas.cache
+depois = calcular_entropia(5, dados, estatisticas)
+assert depois < antes and abs(depois - calcular_entropia_antigo(0, coluna[:, None])) < 1e-12
+assert all(estatisticas.codificacao(i) is codificacao for i, codificacao in outras.items())
+# a informacao mutua tambem passa a usar a coluna substituida
+estatisticas = EstatisticasColunas(dados[:400])
+calcular_informaçao_mutua(dados[:400], 5, estatisticas)
+estatisticas.substituir_coluna(5, coluna[:400])
+esperada = calcular_informaçao_mutua_antigo(np.column_stack((coluna[:400], dados[:400, -1])), 0)
+assert abs(calcular_informaçao_mutua(dados[:400], 5, estatisticas) - esperada) < 1e-9
+print('substituir_coluna invalida as estatísticas da coluna substituída')
+
+
+#Ponto 11: o MAE do produto de matrizes, bloco a bloco, e o do ciclo original, linha a linha (a menos de 1e-4: algumas
+# previsoes no limite do arredondamento podem diferir de 0.1)
+def estimar_mpg_antigo(matriz_estimar):
+    a, b, c, d, e, f, g = -5.241, -0.146, -0.4909, 0.0026, -0.0045, 0.6725, -0.0059
+    diff = np.zeros((matriz_estimar.shape[0], 3))
+    for i in range(np.shape(matriz_estimar)[0]):
+        x = matriz_estimar[i]
+        predict1 = round(a + b * x[0] + c * x[1] + d * x[2] + e * x[3] + f * x[4] + g * x[5], 1)
+        predict2 = round(a + (c * x[1]) + (d * x[2]) + (e * x[3]) + (f * x[4]) + (g * x[5]), 1)
+        predict3 = round(a + b * x[0] + c * x[1] + d * x[2] + e * x[3] + f * x[4], 1)
+        diff[i] = x[6] - predict1, x[6] - predict2, x[6] - predict3
+    return np.mean(np.abs(diff), axis=0)
+
+esperado = estimar_mpg_antigo(dados)
+with contextlib.redirect_stdout(io.StringIO()) as texto:
+    mae = estimar_mpg(dados, bloco=777)
+assert list(mae) == [nome for nome, termo, coeficientes in MODELOS]
+assert np.allclose(list(mae.values()), esperado, atol=1e-4), (mae, esperado)
+linhas = texto.getvalue().splitlines()
+assert "MAE para MPG_estimado_sem _aceleracao(menor MI): " in texto.getvalue() and "(maior MI)" in texto.getvalue()
+assert len([linha for linha in linhas if linha[:1].isdigit()]) == 20 # so a previsualizacao
+nomes, mae_blocos, amostra = avaliar_modelos((dados[i:i+100] for i in range(0, len(dados), 100)), MODELOS, 5)
+assert np.allclose(mae_blocos, esperado, atol=1e-4) and amostra.shape == (5, 4)
+assert (amostra[:, 1:] == prever_mpg(dados[:5])).all()
+print('MAE dos modelos igual ao do ciclo original (a menos de 1e-4)')
+
+
+shutil.rmtree(tmp)
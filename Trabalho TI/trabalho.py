@@ -1,252 +1,422 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import numpy as np
-import huffmancodec as huffc
-
-def main():
-    
-    # Ponto 1
-    data = pd.read_excel('CarDataset.xlsx') #usar o panda para ler o excel
-    matriz_valores = data.to_numpy() # Construir a matriz
-    varNames = data.columns.values.tolist() # nomes das variaveis q estao nas colunas
-    nomes_variaveis = [var for var in varNames if var != 'MPG'] #agrupar as variaveis menos o mpg
-    
-    # Ponto 2
-    for i,var in enumerate(nomes_variaveis,1): #enumerate associa um indice para cada imagem 
-        plt.subplot(3, 2, i)  
-        plt.scatter(data[var], data['MPG'],1.5,"m")
-        plt.title(f'Relação entre {var} e MPG')
-        plt.xlabel(var)
-        plt.ylabel('MPG')
-        
-    plt.tight_layout()
-    plt.show()
-    
-
-    # Ponto 3
-    matriz_valores = matriz_valores.astype('uint16') #passar a variavel data para a unidade de inteiros sem sinal de 16 bits
-    alfabeto = np.arange(matriz_valores.itemsize)
-    
-    #Ponto 4
-    contagens = calcular_ocorrencias(matriz_valores, nomes_variaveis)
-    
-    #Ponto 5
-    for var in nomes_variaveis:
-        plot_resultados(var, contagens)
-
-    #Ponto 6
-    matriz_binning = data.to_numpy()
-    for variavel in nomes_variaveis:
-        if variavel == "Weight":
-            indice = 5
-            novas_contagens1 = divide_intervalos(matriz_binning, variavel, 40, indice)
-            print("Weight: \n")
-            a = indice_mais_frequente(novas_contagens1)
-            print(a)
-            
-        elif  variavel == "Horsepower":
-            indice = 3
-            novas_contagens2 = divide_intervalos(matriz_binning, variavel, 5, indice)
-            print("Horsepower: \n")
-            b = indice_mais_frequente(novas_contagens2)
-            print(b)
-            
-        elif variavel == "Displacement":
-            indice = 2
-            novas_contagens3 = divide_intervalos(matriz_binning, variavel, 5, indice)
-            print("Displacement: \n")
-            c = indice_mais_frequente(novas_contagens3)
-            print(c)
-    print("--------------------------")        
-    #Ponto 7
-    matriz_entropia = data.to_numpy()
-    for i,var in enumerate(varNames):
-        entrops = calcular_entropia(i, matriz_entropia)
-        print(f"{var}: {entrops:.2f} bits por símbolo")
-        
-    entrops_geral = calcular_entropia_geral(matriz_entropia,varNames)
-    print(f"Dados Totais: {entrops_geral:.2f} bits por símbolo")
-        
-    print("--------------------------") 
-    
-    #Ponto 8
-    matriz_huffman = data.to_numpy()
-    for i,variavel in enumerate(varNames):
-        huffman(i, matriz_huffman,variavel)
-        
-    print("--------------------------") 
-    
-    #Ponto 9
-    matriz_corr = data.to_numpy()
-    for i in range(6): 
-        print(f"Coeficiente de correlação (MPG / {varNames[i]}): {np.corrcoef(matriz_corr[:, i], matriz_corr[:, 6], rowvar=True)[0, 1]}")
-   
-    print("--------------------------")
-    
-    #Ponto 10
-    matriz_im = data.to_numpy()
-    for i in range (len(nomes_variaveis)):
-        valor = calcular_informaçao_mutua(matriz_im, i)
-        indice = nomes_variaveis[i]
-        print(f"Informação mútua entre MPG e {indice} : {valor}" )
-        
-    print("--------------------------")  
-        
-    #Ponto11
-    matriz_estimar = data.to_numpy()
-    estimar_mpg(matriz_estimar)
-  
-    
-    
-#Ponto 4   
-def calcular_ocorrencias(matriz_valores, nomes_variaveis):
-    contagens = {}
-    for i, var in enumerate(nomes_variaveis):  
-        ocorrencias = {}
-        for valor in matriz_valores[:, i]:
-            if valor in ocorrencias:
-                ocorrencias[valor] += 1
-            else:
-                ocorrencias[valor] = 1
-        contagens[var] = {k: v for k, v in ocorrencias.items() if v > 0}
-    return contagens
-
-
-
-#Ponto 5
-def plot_resultados(variavel, contagens):
-    eixo_x = list(contagens[variavel].keys())
-    eixo_y = list(contagens[variavel].values())        
-    plt.figure()
-    plt.bar(eixo_x, eixo_y, color='red')  # Define a cor das barras como vermelho
-    plt.title(f'Ocorrências de {variavel}')
-    plt.xlabel(variavel)
-    plt.ylabel('Ocorrências')
-    plt.tight_layout()
-    plt.show()
-    
-#Ponto 6
-def divide_intervalos(matriz_binning, variavel, n , indice):
-    novas_contagens = {}
-    matriz_binning = matriz_binning.T
-    novas_contagens[variavel] = [matriz_binning[indice][i:i+n] for i in range(0, len(matriz_binning[indice]), n)]
-    return novas_contagens
-
-def indice_mais_frequente(novas_contagens):
-    for variavel, valores in novas_contagens.items():
-        if variavel in ["Weight", "Displacement", "Horsepower"]:
-            for i, vals in enumerate(valores):
-                valores_unicos, contagens = np.unique(vals, return_counts=True)
-                indice_mais_frequente = np.argmax(contagens)
-                aux = np.where(vals!=valores_unicos[indice_mais_frequente], valores_unicos[indice_mais_frequente], vals)
-                novas_contagens[variavel][i] = aux.tolist()
-
-    return novas_contagens
-
-#Ponto 7
-def calcular_entropia(indice,matriz_entropia):
-    matriz_entropia = matriz_entropia.T
-    valores,contagens = np.unique(matriz_entropia[indice],return_counts=True)
-    numero_ocorrencias = np.sum(contagens)
-    prob = contagens / numero_ocorrencias
-    entropia = -np.sum(prob * np.log2(prob))
-    return entropia
-
-def calcular_entropia_geral(matriz_entropia,varNames):
-    matriz_entropia = matriz_entropia.T
-    entropias = []
-    for i,variavel in enumerate(varNames):
-        entropias.append(matriz_entropia[i])
-    valores,contagens = np.unique(entropias,return_counts=True)
-    numero_ocorrencias = np.sum(contagens)
-    prob = contagens/numero_ocorrencias
-    entropia = -np.sum(prob * np.log2(prob))
-    return entropia
-
-#Ponto 8
-def huffman(indice,matriz_huffman,variavel):
-    matriz_huffman = matriz_huffman.T
-    S = matriz_huffman[indice]
-    codec = huffc.HuffmanCodec.from_data(S)
-    symbols, lengths = codec.get_code_len()
-    
-    # Calcular a média ponderada
-    valores, contagens = np.unique(S, return_counts=True)
-    prob = contagens / len(S)  # Probabilidade de ocorrência
-    media_ponderada = sum(p * l for p, l in zip(prob, lengths))
-    
-    # Calcular a variância
-    variancia = sum((l - media_ponderada)**2 * p for l, p in zip(lengths, prob))
-    
-    print(f"Número médio de bits por símbolo da {variavel} (Huffman): {media_ponderada:.2f}")
-    print(f"Variância dos comprimentos (Huffman): {variancia:.2f}")
-
-#Ponto 10
-def calcular_informaçao_mutua(matriz_valores,indice):
-    total = matriz_valores.shape[0] #numero de linhas e numero de colunas por ordem
-    pares = np.column_stack((matriz_valores[:,-1], matriz_valores[:,indice])) #matrix mpg variavel
-    mpg, contagensMpg = np.unique(matriz_valores[:,-1], return_counts = True) #valores unicos e contagens do mpg
-    variavel, contagensPar = np.unique(matriz_valores[:,indice], return_counts = True) #contagens dos valores unicos da variavel
-    im = 0
-    for i in range(total):
-        if np.where((pares == pares[i]).all(axis = 1))[0][0] < i: # axis ao longo da coluna
-            continue 
-        valmpg = pares[i][0]
-        valvar = pares[i][1]
-
-        indiceMpg = np.where(mpg == valmpg)[0][0] #tuplo
-        indice_variavel = np.where(variavel == valvar)[0][0]
-
-        probabilidade_valmpg = contagensMpg[indiceMpg] / total
-        probabilidade_valvar = contagensPar[indice_variavel] / total
-
-        probabilidade_conjunta = sum(np.all(pares == pares[i], axis = 1))/total
-
-        im +=  probabilidade_conjunta * np.log2( probabilidade_conjunta/(probabilidade_valmpg * probabilidade_valvar))
-    return im
-
-#Ponto 11 
-
-def estimar_mpg(matriz_estimar):
-    a = -5.241
-    b = -0.146
-    c = -0.4909
-    d = 0.0026
-    e = -0.0045
-    f = 0.6725
-    g = -0.0059
-    
-    predict1 = np.zeros_like(matriz_estimar[:, 6], dtype=float)  # Criar array para previsão 1
-    predict2 = np.zeros_like(matriz_estimar[:, 6], dtype=float)  # Criar array para previsão 2
-    predict3 = np.zeros_like(matriz_estimar[:, 6], dtype=float)  # Criar array para previsão 3
-    diff1 = np.zeros_like(matriz_estimar[:, 6], dtype=float)
-    diff2 = np.zeros_like(matriz_estimar[:, 6], dtype=float)
-    diff3 = np.zeros_like(matriz_estimar[:, 6], dtype=float)
-    
-    for i in range(np.shape(matriz_estimar)[0]):
-        predict1[i] = round(a + b * matriz_estimar[i, 0] + c * matriz_estimar[i, 1] + d * matriz_estimar[i, 2] + e * matriz_estimar[i, 3] + f * matriz_estimar[i, 4] + g * matriz_estimar[i, 5], 1)
-        predict2[i] = round(a + (c * matriz_estimar[i, 1]) + (d * matriz_estimar[i, 2]) + (e * matriz_estimar[i, 3]) + (f * matriz_estimar[i, 4]) + (g * matriz_estimar[i, 5]), 1)
-        predict3[i] = round(a + b * matriz_estimar[i, 0] + c * matriz_estimar[i, 1] + d * matriz_estimar[i, 2] + e * matriz_estimar[i, 3] + f * matriz_estimar[i, 4], 1)
-        diff1[i] = matriz_estimar[i, 6] - predict1[i]
-        diff2[i] = matriz_estimar[i, 6] - predict2[i]
-        diff3[i] = matriz_estimar[i, 6] - predict3[i]
-    
-    print("MPG_real / MPG_estimado / MPG_estimado_sem _aceleracao / MPG_estimado_sem _peso")
-    for i in range(np.shape(matriz_estimar)[0]):
-        print(f"{matriz_estimar[i, 6]:.1f} / {predict1[i]:.1f} / {predict2[i]:.1f} / {predict3[i]:.1f}")
-    
-    # Calcular MAE para cada previsão
-    mae1 = np.mean(np.abs(diff1))
-    mae2 = np.mean(np.abs(diff2))
-    mae3 = np.mean(np.abs(diff3))
-    
-    print("\nMAE para MPG_estimado:", mae1)
-    print("MAE para MPG_estimado_sem _aceleracao(menor MI):", mae2)
-    print("MAE para MPG_estimado_sem _peso(maior MI):", mae3)
-
-
-
-if __name__ == "__main__":
-    main()   
-          
-    
+import os
+import sys
+import json
+import time
+import matplotlib.pyplot as plt
+import numpy as np
+import huffmancodec as huffc
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def main():
+    
+    # Ponto 1
+    inicio = time.perf_counter()
+    matriz, varNames, da_cache = carregar_dados('CarDataset.xlsx') # matriz (so de leitura) partilhada por todos os pontos
+    print(f"Dados lidos {'da cache' if da_cache else 'do Excel'} em {time.perf_counter() - inicio:.3f} s (pico de memória: {pico_memoria()})")
+    nomes_variaveis = [var for var in varNames if var != 'MPG'] #agrupar as variaveis menos o mpg
+    
+    # Ponto 2
+    for i,var in enumerate(nomes_variaveis,1): #enumerate associa um indice para cada imagem 
+        plt.subplot(3, 2, i)  
+        plt.scatter(matriz[:, varNames.index(var)], matriz[:, varNames.index('MPG')],1.5,"m")
+        plt.title(f'Relação entre {var} e MPG')
+        plt.xlabel(var)
+        plt.ylabel('MPG')
+        
+    plt.tight_layout()
+    plt.show()
+    
+
+    # Ponto 3
+    matriz_valores = matriz.astype('uint16') #passar a variavel data para a unidade de inteiros sem sinal de 16 bits
+    alfabeto = np.arange(matriz_valores.itemsize)
+    
+    #Ponto 4
+    contagens = calcular_ocorrencias(matriz_valores, nomes_variaveis)
+    
+    #Ponto 5
+    for var in nomes_variaveis:
+        plot_resultados(var, contagens)
+
+    #Ponto 6
+    matriz_binning = matriz
+    for variavel in nomes_variaveis:
+        if variavel == "Weight":
+            indice = 5
+            novas_contagens1 = divide_intervalos(matriz_binning, variavel, 40, indice)
+            print("Weight: \n")
+            a = indice_mais_frequente(novas_contagens1)
+            print(a)
+            
+        elif  variavel == "Horsepower":
+            indice = 3
+            novas_contagens2 = divide_intervalos(matriz_binning, variavel, 5, indice)
+            print("Horsepower: \n")
+            b = indice_mais_frequente(novas_contagens2)
+            print(b)
+            
+        elif variavel == "Displacement":
+            indice = 2
+            novas_contagens3 = divide_intervalos(matriz_binning, variavel, 5, indice)
+            print("Displacement: \n")
+            c = indice_mais_frequente(novas_contagens3)
+            print(c)
+    print("--------------------------")        
+    #Ponto 7
+    matriz_entropia = matriz
+    estatisticas = EstatisticasColunas(matriz) # valores e contagens de cada coluna, partilhados pelos Pontos 7, 8 e 10
+    for i,var in enumerate(varNames):
+        entrops = calcular_entropia(i, matriz_entropia, estatisticas)
+        print(f"{var}: {entrops:.2f} bits por símbolo")
+        
+    entrops_geral = calcular_entropia_geral(matriz_entropia,varNames,estatisticas)
+    print(f"Dados Totais: {entrops_geral:.2f} bits por símbolo")
+        
+    print("--------------------------") 
+    
+    #Ponto 8
+    matriz_huffman = matriz
+    for i,variavel in enumerate(varNames):
+        huffman(i, matriz_huffman,variavel,estatisticas)
+        
+    print("--------------------------") 
+    
+    #Ponto 9
+    matriz_corr = matriz
+    for i in range(6): 
+        print(f"Coeficiente de correlação (MPG / {varNames[i]}): {np.corrcoef(matriz_corr[:, i], matriz_corr[:, 6], rowvar=True)[0, 1]}")
+   
+    print("--------------------------")
+    
+    #Ponto 10
+    matriz_im = matriz
+    for indice, valor in zip(nomes_variaveis, informacao_mutua_mpg(matriz_im, estatisticas)):
+        print(f"Informação mútua entre MPG e {indice} : {valor}" )
+        
+    print("--------------------------")  
+        
+    #Ponto11
+    matriz_estimar = matriz
+    estimar_mpg(matriz_estimar)
+  
+    
+    
+#Ponto 1
+def carregar_colunas(ficheiro):
+    # le o Excel uma so vez: cada coluna, com o seu tipo (inteiros, decimais...), fica num .npy ao lado dele (ficheiro.0.npy,
+    # ficheiro.1.npy, ...) e os nomes e tipos das colunas em ficheiro.json, validos enquanto o Excel nao mudar (data de
+    # modificacao e tamanho). Devolve as colunas so de leitura, mapeadas em memoria a partir da cache, os nomes das colunas
+    # e se os dados vieram da cache. Colunas nao numericas (texto, por exemplo) nao podem ser mapeadas em memoria nem
+    # analisadas: dao ValueError
+    estado = os.stat(ficheiro)
+    fonte = {'mtime': estado.st_mtime_ns, 'tamanho': estado.st_size}
+    cache_json = ficheiro + '.json'
+    try:
+        with open(cache_json, encoding='utf-8') as f:
+            info = json.load(f)
+        if info['fonte'] == fonte:
+            colunas = [np.load(f"{ficheiro}.{i}.npy", mmap_mode='r') for i in range(len(info['colunas']))]
+            if [str(coluna.dtype) for coluna in colunas] == info['tipos']:
+                return colunas, info['colunas'], True
+    except (OSError, ValueError, KeyError):
+        pass # sem cache, ou cache estragada
+    
+    import pandas as pd # so e preciso quando a cache nao serve
+    data = pd.read_excel(ficheiro) #usar o panda para ler o excel
+    varNames = data.columns.values.tolist() # nomes das variaveis q estao nas colunas
+    colunas = [data[var].to_numpy() for var in varNames] # cada coluna com o seu tipo
+    nao_numericas = [str(var) for var, coluna in zip(varNames, colunas) if coluna.dtype.kind not in 'biuf']
+    if nao_numericas:
+        raise ValueError(f"{ficheiro}: colunas nao numericas ({', '.join(nao_numericas)}): so podem ser usadas colunas numericas")
+    try:
+        # os .npy sao escritos antes do .json, que os valida; cada um e escrito num ficheiro temporario e depois renomeado
+        for i, coluna in enumerate(colunas):
+            with open(f"{ficheiro}.{i}.npy.tmp", 'wb') as f:
+                np.save(f, coluna)
+            os.replace(f"{ficheiro}.{i}.npy.tmp", f"{ficheiro}.{i}.npy")
+        with open(cache_json + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'fonte': fonte, 'colunas': varNames, 'tipos': [str(coluna.dtype) for coluna in colunas]}, f)
+        os.replace(cache_json + '.tmp', cache_json)
+    except OSError:
+        for coluna in colunas:
+            coluna.setflags(write=False) # sem cache (pasta so de leitura, por exemplo): as colunas lidas
+        return colunas, varNames, False
+    return [np.load(f"{ficheiro}.{i}.npy", mmap_mode='r') for i in range(len(colunas))], varNames, False
+
+def carregar_dados(ficheiro):
+    # a matriz so de leitura partilhada por todos os pontos: as colunas da cache (carregar_colunas) num tipo comum a todas
+    # (decimais se alguma coluna for decimal), os nomes das colunas e se os dados vieram da cache
+    colunas, varNames, da_cache = carregar_colunas(ficheiro)
+    matriz = np.column_stack(colunas)
+    matriz.setflags(write=False)
+    return matriz, varNames, da_cache
+
+def pico_memoria():
+    # pico de memoria (RSS) do processo, em texto
+    if resource is None:
+        return 'desconhecido'
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    pico *= 1 if sys.platform == 'darwin' else 1024 # bytes no macOS, KiB no Linux
+    return f"{pico / (1 << 20):.1f} MiB"
+
+#Ponto 4   
+ALFABETO = 1 << 16 # numero de valores possiveis de um uint16
+
+def contar_ocorrencias(matriz_valores, tabela=None, bloco=1 << 20):
+    # conta os valores de todas as colunas de uma so vez: o valor v da coluna j e contado na posicao j*ALFABETO+v de um unico bincount
+    # tabela: contagens de blocos anteriores, a que estas sao somadas (para dados que nao cabem em memoria)
+    # as linhas sao tratadas em blocos, para que as chaves temporarias (int64) ocupem pouca memoria
+    n_colunas = matriz_valores.shape[1]
+    if tabela is None:
+        tabela = np.zeros((n_colunas, ALFABETO), dtype=np.int64)
+    deslocamentos = np.arange(n_colunas, dtype=np.int64) * ALFABETO
+    for inicio in range(0, matriz_valores.shape[0], bloco):
+        chaves = matriz_valores[inicio:inicio+bloco].astype(np.int64) + deslocamentos
+        tabela += np.bincount(chaves.ravel(), minlength=n_colunas * ALFABETO).reshape(n_colunas, ALFABETO)
+    return tabela
+
+def calcular_ocorrencias(matriz_valores, nomes_variaveis, tabela=None):
+    # devolve, para cada variavel, os valores que ocorrem e as suas contagens (arrays)
+    # tabela: contagens ja acumuladas com contar_ocorrencias (por exemplo, bloco a bloco)
+    if tabela is None:
+        tabela = contar_ocorrencias(matriz_valores[:, :len(nomes_variaveis)])
+    contagens = {}
+    for i, var in enumerate(nomes_variaveis):
+        valores = np.flatnonzero(tabela[i]) # so os valores com ocorrencias
+        contagens[var] = (valores.astype(np.uint16), tabela[i][valores])
+    return contagens
+
+
+
+#Ponto 5
+def plot_resultados(variavel, contagens):
+    eixo_x, eixo_y = contagens[variavel]
+    plt.figure()
+    plt.bar(eixo_x, eixo_y, color='red')  # Define a cor das barras como vermelho
+    plt.title(f'Ocorrências de {variavel}')
+    plt.xlabel(variavel)
+    plt.ylabel('Ocorrências')
+    plt.tight_layout()
+    plt.show()
+    
+#Ponto 6
+def divide_intervalos(matriz_binning, variavel, n , indice):
+    novas_contagens = {}
+    matriz_binning = matriz_binning.T
+    novas_contagens[variavel] = [matriz_binning[indice][i:i+n] for i in range(0, len(matriz_binning[indice]), n)]
+    return novas_contagens
+
+def indice_mais_frequente(novas_contagens):
+    for variavel, valores in novas_contagens.items():
+        if variavel in ["Weight", "Displacement", "Horsepower"]:
+            for i, vals in enumerate(valores):
+                valores_unicos, contagens = np.unique(vals, return_counts=True)
+                indice_mais_frequente = np.argmax(contagens)
+                aux = np.where(vals!=valores_unicos[indice_mais_frequente], valores_unicos[indice_mais_frequente], vals)
+                novas_contagens[variavel][i] = aux.tolist()
+
+    return novas_contagens
+
+#Ponto 7
+class EstatisticasColunas:
+    # valores unicos e contagens de cada coluna da matriz, calculados uma so vez, quando sao pedidos,
+    # e partilhados pela entropia (Ponto 7), pelo Huffman (Ponto 8) e pela informacao mutua (Ponto 10)
+    def __init__(self, matriz):
+        self.matriz = matriz
+        self.substitutas = {} # colunas alteradas, por exemplo pelo binning do Ponto 6 (a matriz e so de leitura)
+        self.cache = {}
+
+    def indice(self, i):
+        return i % self.matriz.shape[1] # -1 e a ultima coluna (MPG) tambem na cache
+
+    def coluna(self, i):
+        i = self.indice(i)
+        return self.substitutas[i] if i in self.substitutas else self.matriz[:, i]
+
+    def substituir_coluna(self, i, coluna):
+        # passa a usar coluna em vez da coluna i da matriz, descartando as estatisticas calculadas para ela
+        i = self.indice(i)
+        self.substitutas[i] = np.asarray(coluna).ravel()
+        self.cache.pop(i, None)
+
+    def codificacao(self, i):
+        # (valores, codigos, contagens) da coluna i, com codificar_coluna
+        i = self.indice(i)
+        if i not in self.cache:
+            self.cache[i] = codificar_coluna(self.coluna(i))
+        return self.cache[i]
+
+    def valores_contagens(self, i):
+        # valores que ocorrem na coluna i, por ordem crescente, e as suas contagens
+        valores, codigos, contagens = self.codificacao(i)
+        ocorrem = contagens > 0
+        return valores[ocorrem], contagens[ocorrem]
+
+    def probabilidades(self, i):
+        valores, contagens = self.valores_contagens(i)
+        return valores, contagens / np.sum(contagens)
+
+    def entropia(self, i):
+        valores, prob = self.probabilidades(i)
+        return -np.sum(prob * np.log2(prob))
+
+def calcular_entropia(indice,matriz_entropia,estatisticas=None):
+    if estatisticas is None:
+        estatisticas = EstatisticasColunas(matriz_entropia)
+    return estatisticas.entropia(indice)
+
+def calcular_entropia_geral(matriz_entropia,varNames,estatisticas=None):
+    # as contagens de todas as colunas juntas: somam-se as contagens dos mesmos valores em colunas diferentes
+    if estatisticas is None:
+        estatisticas = EstatisticasColunas(matriz_entropia)
+    colunas = [estatisticas.valores_contagens(i) for i in range(len(varNames))]
+    valores, inverso = np.unique(np.concatenate([valores for valores, contagens in colunas]), return_inverse=True)
+    contagens = np.bincount(inverso.ravel(), weights=np.concatenate([contagens for valores, contagens in colunas]))
+    prob = contagens/np.sum(contagens)
+    entropia = -np.sum(prob * np.log2(prob))
+    return entropia
+
+#Ponto 8
+def huffman(indice,matriz_huffman,variavel,estatisticas=None):
+    if estatisticas is None:
+        estatisticas = EstatisticasColunas(matriz_huffman)
+    valores, contagens = estatisticas.valores_contagens(indice)
+    codec = huffc.HuffmanCodec.from_frequencies(dict(zip(valores.tolist(), contagens.tolist())))
+    symbols, lengths = codec.get_code_len()
+    comprimentos = dict(zip(symbols, lengths))
+    lengths = np.array([comprimentos[v] for v in valores.tolist()]) # pela ordem dos valores
+    
+    # Calcular a média ponderada
+    prob = contagens / np.sum(contagens)  # Probabilidade de ocorrência
+    media_ponderada = np.sum(prob * lengths)
+    
+    # Calcular a variância
+    variancia = np.sum((lengths - media_ponderada)**2 * prob)
+    
+    print(f"Número médio de bits por símbolo da {variavel} (Huffman): {media_ponderada:.2f}")
+    print(f"Variância dos comprimentos (Huffman): {variancia:.2f}")
+    return media_ponderada, variancia
+
+#Ponto 10
+def codificar_coluna(coluna):
+    # substitui cada valor por um indice de 0 a k-1: devolve (valores, codigos, contagens), com valores[codigos] igual a coluna
+    # e as contagens de cada indice (que podem ser 0 para valores que nao ocorrem)
+    if coluna.dtype.kind in 'iu' and len(coluna):
+        # inteiros com poucos valores possiveis (como os uint16 do Ponto 3): o indice e o valor menos o minimo, sem ordenar
+        # (a subtracao e feita em intp: no tipo da coluna, int8 ou int16, daria a volta)
+        minimo = int(coluna.min())
+        if int(coluna.max()) - minimo < ALFABETO:
+            codigos = coluna.astype(np.intp) - minimo
+            contagens = np.bincount(codigos)
+            return np.arange(minimo, minimo + len(contagens)).astype(coluna.dtype), codigos, contagens
+    valores, codigos, contagens = np.unique(coluna, return_inverse=True, return_counts=True)
+    return valores, codigos.ravel(), contagens
+
+def informacao_mutua_codigos(codigos_x, contagens_x, codigos_y, contagens_y):
+    # informacao mutua entre duas colunas codificadas: cada par (x, y) passa a uma unica chave inteira x*ky+y,
+    # contada com um bincount (tabela de contingencia) ou, se a tabela for muito maior que os dados, com np.unique
+    total = len(codigos_x)
+    ky = len(contagens_y)
+    chaves = codigos_x.astype(np.int64) * ky + codigos_y
+    if len(contagens_x) * ky <= 4 * total + ALFABETO:
+        conjunta = np.bincount(chaves, minlength=len(contagens_x) * ky)
+        chaves = np.flatnonzero(conjunta) # so os pares que ocorrem
+        conjunta = conjunta[chaves]
+    else:
+        chaves, conjunta = np.unique(chaves, return_counts=True)
+    px = contagens_x[chaves // ky] # contagens marginais de cada par
+    py = contagens_y[chaves % ky]
+    return np.sum(conjunta / total * np.log2(conjunta * float(total) / (px * py)))
+
+def calcular_informaçao_mutua(matriz_valores, indice, estatisticas=None):
+    # informacao mutua entre o MPG (ultima coluna) e a variavel da coluna indice
+    if estatisticas is None:
+        estatisticas = EstatisticasColunas(matriz_valores)
+    return informacao_mutua_codigos(*estatisticas.codificacao(-1)[1:], *estatisticas.codificacao(indice)[1:])
+
+def informacao_mutua_mpg(matriz_valores, estatisticas=None):
+    # informacao mutua entre o MPG (ultima coluna) e cada uma das outras variaveis
+    if estatisticas is None:
+        estatisticas = EstatisticasColunas(matriz_valores)
+    return np.array([calcular_informaçao_mutua(matriz_valores, i, estatisticas) for i in range(matriz_valores.shape[1] - 1)])
+
+def matriz_informacao_mutua(matriz_valores, estatisticas=None):
+    # informacao mutua entre todos os pares de colunas (matriz simetrica; na diagonal fica a entropia de cada coluna)
+    if estatisticas is None:
+        estatisticas = EstatisticasColunas(matriz_valores)
+    n = matriz_valores.shape[1]
+    im = np.zeros((n, n))
+    for i in range(n):
+        for j in range(i, n):
+            im[i, j] = im[j, i] = informacao_mutua_codigos(*estatisticas.codificacao(i)[1:], *estatisticas.codificacao(j)[1:])
+    return im
+
+#Ponto 11 
+# modelos lineares do MPG: (nome, termo independente, coeficientes das colunas 0 a 5: Acceleration, Cylinders,
+# Displacement, Horsepower, ModelYear e Weight). Podem ser dados outros modelos, para os avaliar todos de uma vez
+MODELOS = [
+    ("MPG_estimado", -5.241, [-0.146, -0.4909, 0.0026, -0.0045, 0.6725, -0.0059]),
+    ("MPG_estimado_sem _aceleracao(menor MI)", -5.241, [0, -0.4909, 0.0026, -0.0045, 0.6725, -0.0059]),
+    ("MPG_estimado_sem _peso(maior MI)", -5.241, [-0.146, -0.4909, 0.0026, -0.0045, 0.6725, 0]),
+]
+
+def matriz_coeficientes(modelos):
+    # nomes, termos independentes (um por modelo) e matriz dos coeficientes (variaveis x modelos)
+    nomes = [nome for nome, termo, coeficientes in modelos]
+    termos = np.array([termo for nome, termo, coeficientes in modelos], dtype=float)
+    coeficientes = np.array([coeficientes for nome, termo, coeficientes in modelos], dtype=float).T
+    return nomes, termos, coeficientes
+
+def prever_mpg(matriz_estimar, modelos=MODELOS):
+    # previsoes de todos os modelos para todas as linhas (linhas x modelos), com um so produto de matrizes
+    nomes, termos, coeficientes = matriz_coeficientes(modelos)
+    variaveis = np.asarray(matriz_estimar[:, :coeficientes.shape[0]], dtype=float)
+    previsoes = variaveis @ coeficientes
+    previsoes += termos
+    return np.round(previsoes, 1, out=previsoes)
+
+def avaliar_modelos(blocos, modelos=MODELOS, previsualizar=0):
+    # avalia os modelos sobre blocos de linhas (o MPG na ultima coluna), sem ter todos os dados em memoria.
+    # Devolve os nomes dos modelos, o MAE de cada um e as primeiras previsualizar linhas (MPG real e previsoes)
+    nomes = [nome for nome, termo, coeficientes in modelos]
+    soma_erros = np.zeros(len(modelos))
+    linhas = 0
+    amostra = []
+    for bloco in blocos:
+        previsoes = prever_mpg(bloco, modelos)
+        mpg = np.asarray(bloco[:, -1], dtype=float)
+        falta = previsualizar - sum(len(a) for a in amostra)
+        if falta > 0:
+            amostra.append(np.column_stack((mpg[:falta], previsoes[:falta])))
+        erros = np.subtract(mpg[:, None], previsoes, out=previsoes) # sem mais matrizes temporarias do tamanho do bloco
+        soma_erros += np.sum(np.abs(erros, out=erros), axis=0)
+        linhas += len(mpg)
+    amostra = np.concatenate(amostra) if amostra else np.zeros((0, len(modelos) + 1))
+    return nomes, soma_erros / max(linhas, 1), amostra
+
+def estimar_mpg(matriz_estimar, modelos=MODELOS, previsualizar=20, bloco=1 << 16):
+    # MAE de cada modelo, calculado bloco a bloco; so as primeiras previsualizar linhas sao escritas
+    blocos = (matriz_estimar[i:i+bloco] for i in range(0, matriz_estimar.shape[0], bloco))
+    nomes, mae, amostra = avaliar_modelos(blocos, modelos, previsualizar)
+    
+    if previsualizar:
+        print("MPG_real / " + " / ".join(nomes))
+        for linha in amostra:
+            print(" / ".join(f"{valor:.1f}" for valor in linha))
+        if len(amostra) < matriz_estimar.shape[0]:
+            print(f"... ({matriz_estimar.shape[0] - len(amostra)} linhas não mostradas)")
+    
+    print()
+    for nome, erro in zip(nomes, mae):
+        print(f"MAE para {nome}: {erro}")
+    return dict(zip(nomes, mae))
+
+
+if __name__ == "__main__":
+    main()   
+          
+    